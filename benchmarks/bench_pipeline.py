@@ -0,0 +1,185 @@
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import multiprocessing
+from pathlib import Path
+from collections import defaultdict
+
+# 📁 Make the src/ modules importable
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / "src"))
+
+import pypdfium2
+import pandas as pd
+
+import driver
+import schedule_engine
+import word_cache
+import word_sources
+import pdf_input
+from regions import page_regions, column_bands
+from row_builder import build_rows
+
+input_pdf_path = project_root / "reports" / "Hospital Cost Reports.pdf"
+baseline_path = Path(__file__).resolve().parent / "baseline.json"
+
+stages = ["open", "extract_words", "detect_headers", "parse_rows", "merge", "to_csv"]
+
+# 📄 Synthetic scaled-up report: the source PDF repeated `copies` times back to back
+def make_scaled_pdf(copies, out_dir):
+    path = os.path.join(out_dir, f"scaled_x{copies}.pdf")
+    if not os.path.exists(path):
+        source = pypdfium2.PdfDocument(str(input_pdf_path))
+        scaled = pypdfium2.PdfDocument.new()
+        for _ in range(copies):
+            scaled.import_pages(source)
+        scaled.save(path)
+    return path
+
+# ⏱ Time DataFrame.to_csv calls made inside write_outputs, so merge and write split cleanly
+class CsvTimer:
+    def __init__(self):
+        self.seconds = 0.0
+
+    def __enter__(self):
+        self.original = pd.DataFrame.to_csv
+        timer = self
+
+        def timed_to_csv(df, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return timer.original(df, *args, **kwargs)
+            finally:
+                timer.seconds += time.perf_counter() - started
+
+        pd.DataFrame.to_csv = timed_to_csv
+        return self
+
+    def __exit__(self, *exc):
+        pd.DataFrame.to_csv = self.original
+
+# 🔁 One scenario, run in its own process so peak RSS is per scenario. Pages get the
+# word backends the driver assigns and the header/body regions run_page reads.
+def run_scenario(pdf_path, copies, source_pages, queue):
+    word_cache.configure()
+    timings = dict.fromkeys(stages, 0.0)
+    dispatch = driver.build_dispatch_table()
+    word_sources.assign_backends([(copy * source_pages + i, targets)
+                                  for copy in range(copies) for i, targets in dispatch.items()])
+    started_all = time.perf_counter()
+
+    started = time.perf_counter()
+    pdf = pdf_input.open_pdf(pdf_path)
+    timings["open"] += time.perf_counter() - started
+
+    pages_done = 0
+    with pdf, tempfile.TemporaryDirectory() as out_dir:
+        for copy in range(copies):
+            page_results = {module.__name__: defaultdict(dict) for module in driver.schedule_modules}
+            for i, targets in dispatch.items():
+                page = pdf.pages[copy * source_pages + i]
+
+                started = time.perf_counter()
+                header, words = page_regions(page)
+                timings["extract_words"] += time.perf_counter() - started
+
+                # The engine parses each page once for all of its labels
+                started = time.perf_counter()
+                edges = column_bands(page, header, words)
+                schedule_engine.heading_labels(header, edges, 2)
+                timings["detect_headers"] += time.perf_counter() - started
+
+                started = time.perf_counter()
+                build_rows(words, edges)
+                timings["parse_rows"] += time.perf_counter() - started
+
+                # Words are cached by now, so this only reshapes results for write_outputs
+                for module, label, result in schedule_engine.run_page(page, targets):
+                    page_results[module.__name__][label][i] = result
+                page.close()
+                pages_done += 1
+
+            with CsvTimer() as csv_timer:
+                started = time.perf_counter()
+                with open(os.devnull, "w") as devnull:
+                    stdout, sys.stdout = sys.stdout, devnull
+                    try:
+                        driver.write_all(page_results, out_dir)
+                    finally:
+                        sys.stdout = stdout
+                elapsed = time.perf_counter() - started
+            timings["to_csv"] += csv_timer.seconds
+            timings["merge"] += elapsed - csv_timer.seconds
+
+    total = time.perf_counter() - started_all
+    queue.put({
+        "copies": copies,
+        "pages": pages_done,
+        "seconds": total,
+        "pages_per_sec": pages_done / total,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "stages": timings,
+    })
+
+def measure(pdf_path, copies, source_pages):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=run_scenario, args=(pdf_path, copies, source_pages, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def delta(current, previous):
+    if not previous:
+        return ""
+    change = (current - previous) / previous * 100
+    return f" ({change:+.1f}%)"
+
+def report(results, baseline):
+    for result in results:
+        key = f"x{result['copies']}"
+        base = baseline.get(key, {})
+        base_stages = base.get("stages", {})
+        print(f"\n📊 {key}: {result['pages']} pages in {result['seconds']:.2f}s{delta(result['seconds'], base.get('seconds'))}")
+        print(f"   pages/sec : {result['pages_per_sec']:.2f}{delta(result['pages_per_sec'], base.get('pages_per_sec'))}")
+        print(f"   peak RSS  : {result['peak_rss_mb']:.0f} MB{delta(result['peak_rss_mb'], base.get('peak_rss_mb'))}")
+        for stage in stages:
+            seconds = result["stages"][stage]
+            print(f"   {stage:<15}{seconds:9.4f}s{delta(seconds, base_stages.get(stage))}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage benchmark of the schedule extraction pipeline.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 4],
+                        help="number of back-to-back copies of the report to benchmark (default: %(default)s)")
+    parser.add_argument("--baseline", default=str(baseline_path), help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    args = parser.parse_args()
+
+    with pdf_input.open_pdf(input_pdf_path) as pdf:
+        source_pages = len(pdf.pages)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for copies in args.scales:
+            pdf_path = str(input_pdf_path) if copies == 1 else make_scaled_pdf(copies, scratch)
+            results.append(measure(pdf_path, copies, source_pages))
+
+    report(results, baseline)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({f"x{r['copies']}": r for r in results}, f, indent=2)
+        print(f"\n💾 Baseline saved to: {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+from collections import defaultdict
+
+# 📁 Make the src/ modules importable
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / "src"))
+
+import pdfplumber
+from row_builder import build_rows
+
+input_pdf_path = project_root / "reports" / "Hospital Cost Reports.pdf"
+
+# 📊 Dense Schedule VI part pages (0-based), the worst case for row assembly
+dense_pages = list(range(35, 49))
+
+# 🐢 The per-word loop extract_rows used before row_builder, kept as the reference
+def legacy_rows(words):
+    lines_by_y = defaultdict(list)
+    for word in words:
+        y_key = round(word["top"], 1)
+        lines_by_y[y_key].append((word["x0"], word["text"]))
+
+    rows = []
+    for y, line_words in sorted(lines_by_y.items()):
+        sorted_line = [text for x, text in sorted(line_words)]
+        if not sorted_line:
+            continue
+        if sorted_line[0].replace(".", "", 1).isdigit():
+            line_no = sorted_line[0]
+            description_words = []
+            rest_values = []
+            for token in sorted_line[1:]:
+                if re.match(r"^\d[\d,]*\.?\d*$", token):
+                    rest_values.append(token)
+                elif not rest_values:
+                    description_words.append(token)
+                else:
+                    rest_values.append(token)
+            rows.append([line_no, " ".join(description_words)] + rest_values)
+    return rows
+
+def time_per_page(fn, pages_words, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for words in pages_words:
+            fn(words)
+        best = min(best, time.perf_counter() - started)
+    return best / len(pages_words)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare legacy and vectorized row assembly per page.")
+    parser.add_argument("--repeat", type=int, default=20, help="timing rounds, best is reported")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="stack each page N times to simulate denser pages; 1 is the report as printed")
+    args = parser.parse_args()
+
+    with pdfplumber.open(input_pdf_path) as pdf:
+        report_words = [pdf.pages[i].extract_words(use_text_flow=True) for i in dense_pages]
+
+    # 📈 The arrays cost a fixed amount per page, so the gain depends on page density
+    for scale in args.scales:
+        # Stack copies of a page below each other, keeping line structure intact
+        pages_words = [
+            [{**word, "top": word["top"] + copy * 1000} for copy in range(scale) for word in words]
+            for words in report_words
+        ]
+        for words in pages_words:
+            assert build_rows(words) == legacy_rows(words), "vectorized rows differ from the legacy loop"
+
+        word_count = sum(len(words) for words in pages_words) / len(pages_words)
+        legacy = time_per_page(legacy_rows, pages_words, args.repeat)
+        vectorized = time_per_page(build_rows, pages_words, args.repeat)
+        print(f"📄 x{scale}: {len(pages_words)} pages, {word_count:.0f} words/page")
+        print(f"   🐢 legacy loop : {legacy * 1000:.3f} ms/page")
+        print(f"   ⚡ build_rows  : {vectorized * 1000:.3f} ms/page ({legacy / vectorized:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import os
+import sys
+import time
+import argparse
+import resource
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+# 📁 Make the src/ modules importable
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / "src"))
+
+import pypdfium2
+import pandas as pd
+
+import batch
+import synth_reports
+
+# 📈 Throughput, memory and correctness at scale in one run: generate N synthetic
+# reports with synth_reports, extract them with the batch runner, then check every
+# table against the generator's ground truth.
+
+# 🔁 The batch in its own process, so peak RSS covers it and its workers only
+def run_extraction(source, output_root, workers, queue):
+    # Batch workers inherit stdout; this process only runs the batch, so silence fd 1
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    started = time.perf_counter()
+    statuses = batch.run_batch(source, output_root, workers)
+    seconds = time.perf_counter() - started
+    peak_kb = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                  resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    queue.put({"seconds": seconds, "peak_rss_mb": peak_kb / 1024,
+               "failed": sum(1 for status in statuses.values() if status["status"] != "ok")})
+
+def measure(source, output_root, workers):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=run_extraction, args=(source, output_root, workers, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+# ✅ Compare each report's output tables with its truth/ CSVs: (tables checked, mismatches)
+def check(source, output_root):
+    truth_root = os.path.join(source, "truth")
+    checked, mismatches = 0, []
+    for report in sorted(os.listdir(truth_root)):
+        out_dir = os.path.join(output_root, batch.report_id(report))
+        for name in sorted(os.listdir(os.path.join(truth_root, report))):
+            checked += 1
+            out_path = os.path.join(out_dir, name)
+            if not os.path.exists(out_path):
+                mismatches.append((report, name, "missing"))
+                continue
+            expected = pd.read_csv(os.path.join(truth_root, report, name), dtype=str, keep_default_na=False)
+            found = pd.read_csv(out_path, dtype=str, keep_default_na=False)
+            if list(expected.columns) != list(found.columns) or expected.shape != found.shape:
+                mismatches.append((report, name, f"shape {found.shape} != {expected.shape}"))
+            elif not expected.equals(found):
+                cells = int((expected.values != found.values).sum())
+                mismatches.append((report, name, f"{cells} cell(s) differ"))
+    return checked, mismatches
+
+def page_count(source):
+    total = 0
+    for pdf_path in batch.find_reports(source):
+        document = pypdfium2.PdfDocument(pdf_path)
+        total += len(document)
+        document.close()
+    return total
+
+def scenario(count, scratch, args):
+    source = os.path.join(scratch, f"reports_{count}")
+    output_root = os.path.join(scratch, f"out_{count}")
+    started = time.perf_counter()
+    synth_reports.generate(count, source, args.seed, args.workers, drop_rows=args.drop_rows,
+                           add_rows=args.add_rows, blank_cells=args.blank_cells, extra_pages=args.extra_pages,
+                           filler=args.filler)
+    generate_seconds = time.perf_counter() - started
+
+    result = measure(source, output_root, args.workers)
+    checked, mismatches = check(source, output_root)
+    pages = page_count(source)
+    return {"count": count, "pages": pages, "generate_seconds": generate_seconds, **result,
+            "pages_per_sec": pages / result["seconds"], "checked": checked, "mismatches": mismatches}
+
+def report(result, examples=5):
+    print(f"\n📊 {result['count']} report(s), {result['pages']} pages "
+          f"(generated in {result['generate_seconds']:.1f}s)")
+    print(f"   extract   : {result['seconds']:.2f}s, {result['pages_per_sec']:.1f} pages/sec, "
+          f"{result['count'] / result['seconds']:.2f} reports/sec")
+    print(f"   peak RSS  : {result['peak_rss_mb']:.0f} MB")
+    print(f"   failed    : {result['failed']} report(s)")
+    matched = result["checked"] - len(result["mismatches"])
+    print(f"   correct   : {matched}/{result['checked']} tables match the ground truth")
+    for report_name, name, problem in result["mismatches"][:examples]:
+        print(f"   ❌ {report_name}/{name}: {problem}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput, memory and correctness on synthetic reports.")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 10],
+                        help="number of reports per scenario, 1 to 10,000 (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=0, help="generator and batch processes, 0 = one per CPU")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the generator (default: %(default)s)")
+    parser.add_argument("--drop-rows", type=float, default=0.1, help="share of numbered rows left out")
+    parser.add_argument("--add-rows", type=float, default=0.05, help="share of rows that get a new row below them")
+    parser.add_argument("--blank-cells", type=float, default=0.1, help="share of value cells left blank")
+    parser.add_argument("--extra-pages", type=int, default=2, help="up to this many extra III/IIIA/IIIB pages")
+    parser.add_argument("--filler", type=int, default=0, help="extra copies of pages no extractor reads")
+    parser.add_argument("--keep", default=None, help="keep reports and outputs in this folder (default: temporary)")
+    args = parser.parse_args()
+    args.workers = args.workers or os.cpu_count() or 1
+    if any(not 1 <= count <= 10_000 for count in args.counts):
+        parser.error("--counts must be between 1 and 10,000")
+
+    failed = False
+    with tempfile.TemporaryDirectory() as scratch:
+        for count in args.counts:
+            result = scenario(count, args.keep or scratch, args)
+            report(result)
+            failed = failed or bool(result["mismatches"] or result["failed"])
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,561 @@
+import io
+import os
+import re
+import sys
+import bisect
+import random
+import contextlib
+import statistics
+import argparse
+from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+# 📁 Make the src/ modules importable
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / "src"))
+
+import pypdfium2
+
+import driver
+import metrics
+import page_locator
+import pdf_input
+import word_sources
+
+input_pdf_path = project_root / "reports" / "Hospital Cost Reports.pdf"
+
+# 🏭 Synthetic cost reports for scale and load testing.
+# Every page of the real report is a layout template: its words are redrawn at the same
+# boxes in Courier, so schedule titles, heading blocks, column numbers and row
+# geometry match the real form. Per document the generator varies:
+#   amounts         every value cell gets a new amount of similar size and format
+#   blank cells     on pages with value columns some values are left out
+#   row counts      some numbered rows are left out, others get a new row below them
+#                   ("12.1", "12.2", ...); III/IIIA/IIIB (located by title, every page
+#                   read) get extra continuation pages
+#   page counts     pages the extractors don't read are repeated as filler
+#   report stamp    provider number and name, period and page numbers
+# Next to each <report>.pdf, truth/<report>/ holds the CSVs the driver should write.
+# They hold the cells the generator decided for each row before laying it out (see
+# form_of below), never cells read back off the placed words, so an extraction run
+# can be checked file by file. Layouts the extractors misread, such as blank cells on
+# forms their column bands don't cover, show up as mismatches.
+
+repeatable_schedules = {"III", "IIIA", "IIIB"}
+
+hospital_words = ["Saint", "Mercy", "General", "Valley", "Harbor", "Memorial", "County", "Regional",
+                  "Community", "North", "Shore", "Medical", "Center", "Hospital", "Lakes", "Union"]
+
+# 🔤 The real report is set in Courier: every glyph has the same width, plus a little
+# extra character spacing. Redrawn words use the same metrics, measured from the
+# templates, so they keep their template boxes without any stretching.
+glyph_width = 600.0  # 1/1000 em
+char_spacing = 0.0   # points between glyphs
+
+def encode(text):
+    return text.encode("cp1252", "replace")
+
+def text_width(text, size):
+    n = len(encode(text))
+    return n * glyph_width * size / 1000 + max(n - 1, 0) * char_spacing
+
+# 📏 Glyph width from one-letter words, spacing from longer ones
+def measure_metrics(words):
+    global glyph_width, char_spacing
+    singles = [(w["x1"] - w["x0"]) * 1000 / w["size"] for w in words if len(w["text"]) == 1]
+    glyph_width = statistics.median(singles) if singles else 600.0
+    gaps = [((w["x1"] - w["x0"]) - len(w["text"]) * glyph_width * w["size"] / 1000) / (len(w["text"]) - 1)
+            for w in words if len(w["text"]) > 1]
+    char_spacing = statistics.median(gaps) if gaps else 0.0
+
+def pdf_string(text):
+    return b"(" + encode(text).replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+# 📄 Minimal PDF writer: one shared Courier font, one content stream per page.
+# The descriptor carries the real report's ascent and descent, which both word
+# backends use for char tops and bottoms.
+def write_pdf(path, pages):
+    font = (b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding "
+            b"/FirstChar 32 /LastChar 255 /Widths [" + b" ".join([b"%.4f" % glyph_width] * 224) + b"] "
+            b"/FontDescriptor 4 0 R >>")
+    descriptor = (b"<< /Type /FontDescriptor /FontName /Courier /Flags 35 /FontBBox [-12 -186 612 668] "
+                  b"/ItalicAngle 0 /Ascent 668 /Descent -186 /CapHeight 576 /StemV 148 >>")
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, font, descriptor]
+    kids = []
+    for width, height, content in pages:
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] /Resources << /Font << /F1 3 0 R >> >> "
+                       b"/Contents %d 0 R >>" % (width, height, len(objects)))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % len(kids)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.7\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    out.write(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    with open(path, "wb") as f:
+        f.write(out.getvalue())
+
+# 📏 Word tops as the extractors see them are height - baseline - descent * size;
+# measured once from a one-word PDF so redrawn words land on their template tops
+_descent = None
+
+def descent():
+    global _descent
+    if _descent is None:
+        content = b"BT /F1 10 Tf 1 0 0 1 100 400 Tm (Hg) Tj ET"
+        path = os.path.join(os.environ.get("TMPDIR", "/tmp"), f"synth_probe_{os.getpid()}.pdf")
+        write_pdf(path, [(612, 792, content)])
+        try:
+            document = pypdfium2.PdfDocument(path)
+            page = document[0]
+            textpage = page.get_textpage()
+            rect = pypdfium2.raw.FS_RECTF()
+            pypdfium2.raw.FPDFText_GetLooseCharBox(textpage.raw, 0, rect)
+            _descent = (400 - rect.bottom) / 10
+            textpage.close()
+            page.close()
+            document.close()
+        finally:
+            os.remove(path)
+    return _descent
+
+# ✏️ One word as a text object at its template x0 and top
+def draw_word(word, height):
+    size = word["size"]
+    baseline = height - word["top"] - size + descent() * size
+    return b"BT /F1 %.3f Tf %.5f Tc 1 0 0 1 %.4f %.4f Tm %s Tj ET\n" % (
+        size, char_spacing, word["x0"], baseline, pdf_string(word["text"]))
+
+# 🧩 Template pages from the real report: words (with font size), the schedule and
+# page-group keys each page is filed under and, for pages the extractors read, the
+# page's form (below). Glyph metrics are measured first; the forms use them.
+def load_templates(pdf_path=input_pdf_path):
+    templates = []
+    with pdf_input.open_pdf(pdf_path) as pdf:
+        index = page_locator.build_index(pdf)
+        page_locator.use_index(index)
+        keys_of = {}
+        for key, pages in index.items():
+            for i in pages:
+                keys_of.setdefault(i, []).append(key)
+        plan = driver.build_dispatch_table()
+        for i, page in enumerate(pdf.pages):
+            # A PDFium word's top is one font size above its bottom
+            words = [dict(word, size=word["bottom"] - word["top"])
+                     for word in word_sources.pdfium_words(page, use_text_flow=True)]
+            templates.append({
+                "width": float(page.width),
+                "height": float(page.height),
+                "schedule": page_locator.page_schedules.get(i),
+                "keys": keys_of.get(i, []),
+                "read": i in plan,
+                "words": words,
+                "bottom": max((word["bottom"] for word in words), default=0.0),
+            })
+            page.close()
+    measure_metrics([word for template in templates for word in template["words"]])
+    for template in templates:
+        if template["read"]:
+            template.update(form_of(lines_of(template["words"])))
+    return templates
+
+# 📐 The form behind a page, read once off the real template. A synthetic report
+# decides every cell against the form first and only then lays the cells out, so the
+# ground truth is the generator's own decisions, never a reading of the placed words.
+#   heading    lines under the "SCHEDULE ..." title (or the "PERIOD FROM" stamp), down
+#              to the first row with a description
+#   columns    the heading's line of column numbers, "(2) (3) ..." or "2 3 4": one value
+#              column per number, spanning halfway to its neighbours; a number whose
+#              span takes in where descriptions start heads the description instead.
+#              A column's label is the heading words under its number, top to bottom
+#              (the number itself when there are none). Forms without such a line
+#              have no columns, only values in order.
+#   rows       numbered lines below the heading: the line number, the description
+#              (the phrase after it, plus entries left of the columns), the entry in
+#              each column (an amount ends in its column, text starts in it), the text
+#              right of the columns and the line number repeated in the margin. A line
+#              one pitch below a described row that starts right of its description
+#              wraps it.
+# A form's items are its fixed lines and rows in reading order.
+column_number_re = re.compile(r"^\(?\d+\)?$")
+amount_re = re.compile(r"^\d[\d,]*\.?\d*$")
+
+def is_line_number(text):
+    return text.replace(".", "", 1).isdigit()
+
+def is_amount(word):
+    return bool(amount_re.match(word["text"])) and not word["text"].endswith(",")
+
+def center(words):
+    return (words[0]["x0"] + words[-1]["x1"]) / 2
+
+def line_top(line):
+    return round(line[0]["top"], 1)
+
+def texts(words):
+    return [word["text"] for word in words]
+
+# 🔗 Runs of words at most a space apart: a multi-word entry is one cell
+def phrases(words):
+    runs = []
+    for word in words:
+        if runs and word["x0"] - runs[-1][-1]["x1"] < 1.5 * text_width(" ", word["size"]):
+            runs[-1].append(word)
+        else:
+            runs.append([word])
+    return runs
+
+# ✂️ (description words, value words) of a numbered line: the description is the
+# phrase after the line number, unless that starts with an amount
+def split_description(line):
+    if len(line) < 2 or amount_re.match(line[1]["text"]):
+        return [], line[1:]
+    description = phrases(line[1:])[0]
+    return description, line[1 + len(description):]
+
+# 📊 (columns, column labels) of a heading, or (None, None) without column numbers.
+# Columns are {"bounds": span edges, "ends": right end of each column's number}.
+def columns_of(heading, description_x):
+    k = next((k for k, line in enumerate(heading)
+              if len(line) >= 2 and all(column_number_re.match(word["text"]) for word in line)), None)
+    if k is None:
+        return None, None
+    numbers = heading[k]
+    centers = [center([word]) for word in numbers]
+    bounds = [centers[0] - (centers[1] - centers[0]) / 2] + [(a + b) / 2 for a, b in zip(centers, centers[1:])] + \
+             [centers[-1] + (centers[-1] - centers[-2]) / 2]
+    while description_x is not None and len(bounds) > 2 and bounds[0] <= description_x:
+        bounds.pop(0)
+        numbers = numbers[1:]
+    labels = [[] for _ in numbers]
+    for line in heading[k + 1:]:
+        for phrase in phrases([word for word in line if word["text"].strip("-")]):
+            column = bisect.bisect_right(bounds, center(phrase)) - 1
+            if 0 <= column < len(labels):
+                labels[column] += texts(phrase)
+    columns = {"bounds": bounds, "ends": [word["x1"] for word in numbers]}
+    return columns, [" ".join(words) or number["text"] for words, number in zip(labels, numbers)]
+
+# 📍 Column of an entry (-1 left of the columns, n right of them): text starts in its
+# column; an amount is right-aligned just past its column's number
+def column_of(columns, phrase):
+    bounds = columns["bounds"]
+    if not (len(phrase) == 1 and is_amount(phrase[0])):
+        return bisect.bisect_right(bounds, phrase[0]["x0"]) - 1
+    x1 = phrase[0]["x1"]
+    if not bounds[0] < x1 <= bounds[-1]:
+        return -1 if x1 <= bounds[0] else len(bounds) - 1
+    return min(range(len(columns["ends"])), key=lambda k: abs(x1 - columns["ends"][k]))
+
+# 🧩 Sort a row line's (or its wrap's) entries into description, columns and the text
+# right of the columns
+def sort_entries(row, words, columns):
+    for phrase in phrases(words):
+        column = column_of(columns, phrase)
+        if column < 0:
+            row["description"] += phrase
+        elif column >= len(row["cells"]):
+            row["right"] += phrase
+        else:
+            row["cells"][column] += phrase
+
+def row_of(line, columns):
+    description, values = split_description(line)
+    row = {"number": line[0], "description": list(description), "values": values, "wraps": [],
+           "cells": None, "right": [], "margin": []}
+    if columns is None:
+        return row
+    row["margin"] = values[-1:] if values and values[-1]["text"] == line[0]["text"] else []
+    row["cells"] = [[] for _ in columns["ends"]]
+    sort_entries(row, values[:len(values) - len(row["margin"])], columns)
+    return row
+
+def form_of(lines):
+    tops = [line_top(line) for line in lines]
+    pitch = min((b - a for a, b in zip(tops, tops[1:]) if b - a > 1), default=0.0)
+
+    def described(line):
+        return is_line_number(line[0]["text"]) and bool(split_description(line)[0])
+
+    body = next((k for k, line in enumerate(lines) if described(line)), len(lines))
+    title = max((k for k in range(body) if lines[k][0]["text"] in ("SCHEDULE", "PERIOD") and
+                 lines[k][0]["top"] < page_locator.top_band), default=None)
+    heading = [] if title is None else [line for line in lines[title + 1:body] if line[0]["top"] < page_locator.top_band]
+    starts = [split_description(line)[0][0]["x0"] for line in lines[body:] if described(line)]
+    columns, labels = columns_of(heading, statistics.median(starts) if starts else None)
+
+    items, row = [{"fixed": line} for line in lines[:body]], None
+    for k in range(body, len(lines)):
+        line = lines[k]
+        if is_line_number(line[0]["text"]):
+            row = row_of(line, columns)
+            items.append({"row": row})
+        elif row is not None and row["description"] and tops[k] - tops[k - 1] <= 1.5 * pitch and \
+                line[0]["x0"] > row["description"][0]["x0"] + 1:
+            # A wrap continues the description and, on forms with columns, the entries it sits under
+            row["wraps"].append(line)
+            if columns is None:
+                row["description"] += line
+            else:
+                sort_entries(row, line, columns)
+        else:
+            row = None
+            items.append({"fixed": line})
+    return {"pitch": pitch, "columns": columns, "labels": labels, "heading": heading, "items": items}
+
+# 🔢 A new amount shaped like the old one: same decimals, same grouping, similar size
+def vary_amount(text, rng):
+    digits = text.replace(",", "")
+    decimals = len(digits.split(".")[1]) if "." in digits else 0
+    value = float(digits) * rng.uniform(0.5, 1.5) if float(digits) else rng.uniform(0, 100)
+    if decimals:
+        new = f"{value:,.{decimals}f}" if "," in text else f"{value:.{decimals}f}"
+    else:
+        new = f"{round(value):,}" if "," in text else str(round(value))
+    return new
+
+def replaced(word, text, align="left"):
+    new, width = dict(word, text=text), text_width(text, word["size"])
+    if align == "right":
+        new["x0"] = word["x1"] - width
+    else:
+        new["x1"] = word["x0"] + width
+    return new
+
+# 🏷 Provider number, hospital name, period and page number in the report stamp
+def stamp_words(line, report, page_number):
+    first = line[0]["text"]
+    words = list(line)
+    if first == "PROVIDER" and len(words) > 3:
+        words[2] = replaced(words[2], report["provider_no"])
+        end = next((k for k, w in enumerate(words) if w["text"] == "KPMG"), len(words))
+        for k in range(3, end):
+            words[k] = replaced(words[k], report["name"][(k - 3) % len(report["name"])])
+    elif first == "PERIOD":
+        for k, word in enumerate(words):
+            if re.fullmatch(r"\d\d/\d\d/\d{4}", word["text"]):
+                words[k] = replaced(word, word["text"][:6] + str(int(word["text"][6:]) + report["year_shift"]))
+            elif k and words[k - 1]["text"] == "Page":
+                words[k] = replaced(word, str(page_number), "right")
+    return words
+
+# 🧾 One row of a synthetic page: (words to place, the row's cells). The cells are
+# decided first: in each column a lone amount gets a new amount of its shape or, on
+# described rows, is left blank; other entries stay. The words follow from them, new
+# amounts right-aligned where the old ones ended. A new line number replaces the one
+# repeated in the margin too. Without columns, values keep their order and the
+# last one (the margin's line number) stays.
+def synth_row(row, rng, options, number=None, description=None):
+    template_number = row["number"]["text"]
+    number = number or template_number
+    description = row["description"] if description is None else description
+    described = bool(description)
+    placed = [replaced(row["number"], number, "right") if number != template_number else row["number"]]
+    placed += description
+
+    def margin(words):
+        if number != template_number and texts(words) == [template_number]:
+            return [replaced(words[0], number)]
+        return words
+
+    if row["cells"] is None:
+        values = []
+        for word in row["values"]:
+            if word is row["values"][-1]:
+                word = margin([word])[0]
+            elif described and is_amount(word):
+                word = replaced(word, vary_amount(word["text"], rng), "right")
+            values.append(word)
+        placed += values
+        return placed, [number, " ".join(texts(description))] + texts(values)
+
+    cells = []
+    for words in row["cells"]:
+        if described and len(words) == 1 and is_amount(words[0]):
+            words = [] if rng.random() < options["blank_cells"] else \
+                [replaced(words[0], vary_amount(words[0]["text"], rng), "right")]
+        placed += words
+        cells.append(" ".join(texts(words)) if words else None)
+    trailing = [words for words in (row["right"], margin(row["margin"])) if words]
+    placed += [word for words in trailing for word in words]
+    return placed, [number, " ".join(texts(description))] + cells + [" ".join(texts(words)) for words in trailing]
+
+cost_center_words = ["Clinic", "Services", "Therapy", "Imaging", "Outreach", "Dialysis", "Hospice", "Wellness",
+                     "Respite", "Infusion", "Sleep", "Wound", "Care", "Unit", "Program", "Support"]
+
+# ➕ A new row under an unwrapped row: its number is the row's plus ".1", ".2", ...,
+# its description is new words at the row's description column, clear of its first
+# value, and its cells are decided like the row's own
+def added_row(row, number, rng, options):
+    first, size = row["description"][0], row["description"][0]["size"]
+    values = row["values"]
+    limit = (values[0]["x0"] if values else first["x0"] + 200) - text_width("  ", size)
+    description, x = [], first["x0"]
+    for text in rng.sample(cost_center_words, rng.randint(1, 3)):
+        width = text_width(text, size)
+        if x + width > limit:
+            break
+        description.append(dict(first, text=text, x0=x, x1=x + width))
+        x += width + text_width(" ", size)
+    return synth_row(row, rng, options, number, description)
+
+def lines_of(words):
+    lines = {}
+    for word in words:
+        lines.setdefault(round(word["top"], 1), []).append(word)
+    return [sorted(line, key=lambda w: (w["x0"], w["text"])) for _, line in sorted(lines.items())]
+
+def moved(words, shift):
+    return [dict(word, top=word["top"] + shift, bottom=word["bottom"] + shift) for word in words] if shift else words
+
+# 📄 One synthetic page: (placed words, its rows' cells). Described rows are varied,
+# left out or get new rows below them; new rows push the rest of the page down, as
+# long as it stays clear of the page foot.
+def synth_page(template, report, page_number, rng, options):
+    if not template["read"]:
+        return [word for line in lines_of(template["words"]) for word in
+                (stamp_words(line, report, page_number) if line[0]["text"] in ("PROVIDER", "PERIOD") else line)], []
+
+    placed, rows, shift = [], [], 0.0
+    pitch = template["pitch"]
+    for item in template["items"]:
+        if "fixed" in item:
+            line = item["fixed"]
+            placed += moved(stamp_words(line, report, page_number) if line[0]["text"] in ("PROVIDER", "PERIOD")
+                            else line, shift)
+            continue
+        row = item["row"]
+        described = bool(row["description"])
+        if described and rng.random() < options["drop_rows"]:
+            continue
+        words, cells = synth_row(row, rng, options)
+        placed += moved(words, shift)
+        rows.append(cells)
+
+        added = 0
+        while described and not row["wraps"] and "." not in row["number"]["text"] and added < 9 and \
+                rng.random() < options["add_rows"] and \
+                template["bottom"] + shift + pitch < template["height"] - 2 * pitch:
+            added += 1
+            words, cells = added_row(row, f"{row['number']['text']}.{added}", rng, options)
+            placed += moved(words, shift + pitch)
+            rows.append(cells)
+            shift += pitch
+    return placed, rows
+
+# 🗂 Page order of one document: every template page, extra III continuation pages
+# and filler copies of pages the extractors don't read
+def page_sequence(templates, rng, options):
+    sequence = []
+    for template in templates:
+        sequence.append(template)
+        if template["schedule"] in repeatable_schedules and template["read"]:
+            sequence += [template] * rng.randint(0, options["extra_pages"])
+        elif not template["read"]:
+            sequence += [template] * options["filler"]
+    return sequence
+
+def make_report(templates, report_id, out_dir, seed, options):
+    rng = random.Random(seed)
+    report = {
+        "provider_no": str(rng.randint(1000, 9999)),
+        "name": rng.sample(hospital_words, 3),
+        "year_shift": rng.randint(-5, 5),
+    }
+    pages, index, truth = [], {}, {}
+    for n, template in enumerate(page_sequence(templates, rng, options)):
+        placed, rows = synth_page(template, report, n + 1, rng, options)
+        content = b"".join(draw_word(word, template["height"]) for word in placed)
+        pages.append((template["width"], template["height"], content))
+        for key in template["keys"]:
+            index.setdefault(key, []).append(n)
+        if template["read"]:
+            truth[n] = (template, rows)
+    pdf_path = os.path.join(out_dir, f"{report_id}.pdf")
+    write_pdf(pdf_path, pages)
+    write_truth(index, truth, os.path.join(out_dir, "truth", report_id))
+    return pdf_path
+
+# 🏷 Headers of a label's page: the key columns and the form's column labels (forms
+# without column numbers name their columns with their longest heading line, past
+# the key columns), or a fixed-header table's own columns
+def truth_headers(spec, label, template):
+    if spec["header"] == "fixed":
+        return list(spec["tables"][label]["columns"])
+    labels = template["labels"]
+    if labels is None and template["heading"]:
+        labels = texts(max(template["heading"], key=len)[len(spec["key_columns"]):])
+    return list(spec["key_columns"]) + labels if labels else []
+
+# ✅ Expected CSVs: every page's decided rows as the page results an extraction would
+# hand over, written by each schedule's own write_outputs. The join and output stage
+# is shared with the driver (and has its own tests); what a run is checked on is
+# whether it read the same cells off the pages.
+def write_truth(index, truth, truth_dir):
+    os.makedirs(truth_dir, exist_ok=True)
+    page_locator.use_index(index)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for module in driver.schedule_modules:
+            page_results = defaultdict(dict)
+            for label, pages in module.pages_by_label().items():
+                for n in pages:
+                    template, rows = truth.get(n, (None, []))
+                    page_results[label][n] = (truth_headers(module.spec, label, template) if template else [], rows)
+            module.write_outputs(page_results, truth_dir)
+    metrics.reset()
+
+# 🔁 Worker side: templates are loaded once per process
+_templates = None
+
+def init_worker(pdf_path):
+    global _templates
+    _templates = load_templates(pdf_path)
+
+def make_one(args):
+    report_id, out_dir, seed, options = args
+    return make_report(_templates, report_id, out_dir, seed, options)
+
+def generate(count, out_dir, seed=0, workers=1, pdf_path=input_pdf_path, **options):
+    options = {"drop_rows": 0.1, "add_rows": 0.05, "blank_cells": 0.1, "extra_pages": 2, "filler": 0, **options}
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(f"synthetic_{n:05d}", out_dir, seed * 1_000_003 + n, options) for n in range(count)]
+    if workers > 1 and count > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(pdf_path,)) as pool:
+            return list(pool.map(make_one, jobs, chunksize=max(1, count // (workers * 8))))
+    init_worker(pdf_path)
+    return [make_one(job) for job in jobs]
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic cost reports with ground-truth CSVs.")
+    parser.add_argument("out", help="folder for <report>.pdf files and truth/<report>/ CSVs")
+    parser.add_argument("--count", type=int, default=1, help="number of reports, 1 to 10,000 (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed; the same seed gives the same reports")
+    parser.add_argument("--workers", type=int, default=0, help="generator processes, 0 = one per CPU")
+    parser.add_argument("--drop-rows", type=float, default=0.1, help="share of numbered rows left out (default: %(default)s)")
+    parser.add_argument("--add-rows", type=float, default=0.05,
+                        help="share of rows that get a new row below them (default: %(default)s)")
+    parser.add_argument("--blank-cells", type=float, default=0.1,
+                        help="share of value cells left blank on banded pages (default: %(default)s)")
+    parser.add_argument("--extra-pages", type=int, default=2,
+                        help="up to this many extra copies of each III/IIIA/IIIB page (default: %(default)s)")
+    parser.add_argument("--filler", type=int, default=0,
+                        help="extra copies of every page the extractors don't read, for long reports (default: %(default)s)")
+    args = parser.parse_args()
+    if not 1 <= args.count <= 10_000:
+        parser.error("--count must be between 1 and 10,000")
+
+    paths = generate(args.count, args.out, args.seed, args.workers or os.cpu_count() or 1,
+                     drop_rows=args.drop_rows, add_rows=args.add_rows, blank_cells=args.blank_cells, extra_pages=args.extra_pages,
+                     filler=args.filler)
+    print(f"🏭 {len(paths)} synthetic report(s) written to: {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# 🔢 Bulk amount parsing. A column of tokens is laid out as one UTF-32 buffer
+# and classified per character, so every token is parsed, sign-checked and
+# grouping-validated with array operations instead of str.replace/float chains.
+#
+#   "18,63,062" / "1,863,062"  lakh/crore or thousands grouping -> 1863062
+#   "(1,234)" "1,234-" "-1,234"  negatives                       -> -1234
+#   "-" "–" "—"                 placeholders                    -> missing
+#   "2," "1,2345" "12,34,5678"  bad grouping (often two columns run together)
+#                               -> MALFORMED, never a number
+#
+# Values come back as int64 digits plus a decimal scale, so "1,234.50" is
+# (123450, 2) and no float rounding happens before the caller picks a dtype.
+
+# 🏷 Token kinds
+EMPTY, INTEGER, DECIMAL, PLACEHOLDER, MALFORMED, TEXT = range(6)
+
+max_digits = 18  # int64 holds every 18-digit value
+
+# 🔤 Character classes
+DIGIT, COMMA, DOT, MINUS, OPEN, CLOSE, DASH, SPACE, OTHER = 1, 2, 4, 8, 16, 32, 64, 128, 256
+NUMBER_CHARS, PLACEHOLDER_CHARS = DIGIT | COMMA | DOT, MINUS | DASH
+dashes = (0x2013, 0x2014)  # en and em dash, placeholders only
+spaces = (0xa0,)
+
+_ascii_classes = None
+
+def char_classes(codes):
+    global _ascii_classes
+    if _ascii_classes is None:
+        _ascii_classes = np.full(128, OTHER, dtype=np.uint16)
+        _ascii_classes[ord("0"):ord("9") + 1] = DIGIT
+        for char, cls in ((",", COMMA), (".", DOT), ("-", MINUS), ("(", OPEN), (")", CLOSE)):
+            _ascii_classes[ord(char)] = cls
+        for char in " \t\r\n\f\v":
+            _ascii_classes[ord(char)] = SPACE
+    classes = _ascii_classes[np.minimum(codes, 127)]
+    wide = np.flatnonzero(codes > 127)
+    if len(wide):
+        classes[wide] = np.where(np.isin(codes[wide], dashes), DASH, np.where(np.isin(codes[wide], spaces), SPACE, OTHER))
+    return classes
+
+_powers_of_ten = None
+
+def powers_of_ten():
+    global _powers_of_ten
+    if _powers_of_ten is None:
+        _powers_of_ten = 10 ** np.arange(max_digits + 1, dtype=np.int64)
+    return _powers_of_ten
+
+def token_text(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value)
+
+# 🔢 (values int64, scales int64, kinds uint8) for a sequence of tokens.
+# Surrounding whitespace is ignored; None and NaN are empty.
+def parse_amounts(tokens):
+    texts = list(tokens)
+    try:
+        joined = "".join(texts)
+    except TypeError:
+        texts = [token_text(value) for value in texts]
+        joined = "".join(texts)
+    n = len(texts)
+    raw_lengths = np.fromiter(map(len, texts), dtype=np.int64, count=n)
+    codes = np.frombuffer(joined.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    classes = char_classes(codes)
+    token_of = np.repeat(np.arange(n), raw_lengths)
+    position = np.arange(len(codes))
+
+    # ✂️ Trim whitespace: each token spans its first to last non-space character
+    starts = np.cumsum(raw_lengths) - raw_lengths
+    ends = starts + raw_lengths
+    filled = raw_lengths > 0
+    if (classes == SPACE).any():
+        solid = classes != SPACE
+        first_solid = np.minimum.reduceat(np.where(solid, position, len(codes)), starts[filled])
+        last_solid = np.maximum.reduceat(np.where(solid, position, -1), starts[filled])
+        starts[filled] = np.minimum(first_solid, starts[filled] + raw_lengths[filled])
+        ends[filled] = np.maximum(last_solid + 1, starts[filled])
+    lengths = ends - starts
+    nonempty = lengths > 0
+
+    padded = np.append(classes, np.uint16(0))
+
+    def per_token(mask):
+        return np.bincount(token_of[mask], minlength=n)
+
+    def char_at(index, present):
+        return padded[np.where(present, index, len(classes))]
+
+    first, last = char_at(starts, nonempty), char_at(ends - 1, nonempty)
+    minus, opens, closes = per_token(classes == MINUS), per_token(classes == OPEN), per_token(classes == CLOSE)
+
+    # ➖ One sign form at most: (x), x- or -x
+    unsigned = (minus == 0) & (opens == 0) & (closes == 0)
+    single = (opens + closes == 0) & (minus == 1) & (lengths > 1)
+    parens = (first == OPEN) & (last == CLOSE) & (opens == 1) & (closes == 1) & (minus == 0)
+    trailing = single & (last == MINUS)
+    leading = single & (first == MINUS) & ~trailing
+    negative = parens | trailing | leading
+    body_start = starts + (parens | leading)
+    body_end = ends - (parens | trailing)
+    body_length = body_end - body_start
+
+    in_body = (position >= body_start[token_of]) & (position < body_end[token_of])
+    is_digit = in_body & (classes == DIGIT)
+    is_dot = in_body & (classes == DOT)
+    numeric_chars = per_token(in_body & ((classes | NUMBER_CHARS) != NUMBER_CHARS)) == 0
+    dots = per_token(is_dot)
+
+    # 📍 Integer part ends at the (first) dot
+    int_end = body_end.copy()
+    int_end[token_of[is_dot]] = position[is_dot]
+    has_dot = dots > 0
+
+    digits_before = np.concatenate([[0], np.cumsum(is_digit, dtype=np.int32)])
+    is_comma = in_body & (classes == COMMA)
+    int_comma = is_comma & (position < int_end[token_of])
+    commas_before = np.concatenate([[0], np.cumsum(int_comma, dtype=np.int32)])
+    comma_after_dot = per_token(is_comma & ~int_comma) > 0
+
+    int_digits = digits_before[int_end] - digits_before[body_start]
+    scale = np.where(has_dot, digits_before[body_end] - digits_before[int_end + has_dot], 0)
+    n_commas = commas_before[int_end] - commas_before[body_start]
+
+    # 📏 The k-th comma from the right has 3k digits after it (thousands) or 2k + 1 (lakh/crore)
+    comma_token = token_of[int_comma]
+    comma_position = position[int_comma]
+    digits_right = digits_before[int_end[comma_token]] - digits_before[comma_position + 1]
+    rank = commas_before[int_end[comma_token]] - commas_before[comma_position + 1] + 1
+    thousands_bad = np.bincount(comma_token[digits_right != 3 * rank], minlength=n) > 0
+    lakh_bad = np.bincount(comma_token[digits_right != 2 * rank + 1], minlength=n) > 0
+    lead_thousands = int_digits - 3 * n_commas
+    lead_lakh = int_digits - (2 * n_commas + 1)
+    grouped = (n_commas == 0) | \
+              (~thousands_bad & (lead_thousands >= 1) & (lead_thousands <= 3)) | \
+              (~lakh_bad & (lead_lakh >= 1) & (lead_lakh <= 2))
+
+    first_body = char_at(body_start, body_length > 0)
+    looks_numeric = nonempty & (unsigned | negative) & (body_length > 0) & numeric_chars & (int_digits > 0)
+    valid = looks_numeric & (first_body == DIGIT) & (dots <= 1) & ~comma_after_dot & grouped & \
+            (int_digits + scale <= max_digits)
+
+    # 🧮 Digits folded into int64: each digit times 10 ** (digits to its right in the token)
+    digit_token = token_of[is_digit]
+    counts = np.bincount(digit_token, minlength=n)
+    segment_ends = np.cumsum(counts)
+    exponent = segment_ends[digit_token] - np.arange(1, len(digit_token) + 1)
+    terms = (codes[is_digit].astype(np.int64) - ord("0")) * powers_of_ten()[np.minimum(exponent, max_digits)]
+    values = np.zeros(n, dtype=np.int64)
+    has_digits = counts > 0
+    if has_digits.any():
+        values[has_digits] = np.add.reduceat(terms, (segment_ends - counts)[has_digits])
+    values[negative] *= -1
+    values[~valid] = 0
+
+    seen = np.zeros(n, dtype=np.uint16)
+    if filled.any():
+        seen[filled] = np.bitwise_or.reduceat(classes, (np.cumsum(raw_lengths) - raw_lengths)[filled])
+    placeholder = nonempty & ((seen | PLACEHOLDER_CHARS | SPACE) == PLACEHOLDER_CHARS | SPACE)
+    kinds = np.full(n, TEXT, dtype=np.uint8)
+    kinds[looks_numeric] = MALFORMED
+    kinds[valid] = np.where(has_dot[valid], DECIMAL, INTEGER)
+    kinds[placeholder] = PLACEHOLDER
+    kinds[~nonempty] = EMPTY
+    return values, np.where(valid, scale, 0), kinds
+
+# 📊 Nullable Int64 (or Float64 when any value has a decimal point, or decimal=True)
+# from parsed tokens; everything that isn't an amount is missing
+def to_array(values, scales, kinds, decimal=None):
+    missing = (kinds != INTEGER) & (kinds != DECIMAL)
+    if decimal if decimal is not None else (kinds == DECIMAL).any():
+        return pd.arrays.FloatingArray(values / 10.0 ** scales, missing)
+    return pd.arrays.IntegerArray(values, missing)
+
+# 🔎 A column is numeric when it has an amount and nothing but amounts,
+# placeholders, blanks and malformed amounts
+def is_amount_column(kinds):
+    return bool(((kinds == INTEGER) | (kinds == DECIMAL)).any() and not (kinds == TEXT).any())
@@ -0,0 +1,157 @@
+import os
+import re
+import glob
+import json
+import time
+import argparse
+import traceback
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import driver
+import metrics
+import page_guard
+
+# 📁 Default batch output root (relative to project root)
+output_root = os.path.join("data", "reports")
+status_name = "batch_status.json"
+
+# 🔎 Expand a directory or glob pattern into a sorted list of PDFs
+def find_reports(source):
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, "**", "*.pdf"), recursive=True)
+    else:
+        paths = glob.glob(source, recursive=True)
+    return sorted(p for p in paths if p.lower().endswith(".pdf"))
+
+# 🏷 Folder-safe report id derived from the file name
+def report_id(pdf_path):
+    return re.sub(r"[^a-z0-9]+", "_", Path(pdf_path).stem.lower()).strip("_")
+
+# 📄 Extract one report into its own folder. Errors are returned, not raised,
+# so a bad file never takes down the rest of the batch.
+# With record_metrics the report's events are appended to metrics.jsonl in its folder.
+# With store_path its tables also go to the shared SQLite store. budget is
+# page_guard's (page timeout, worker memory budget); page failures are counted in the status.
+def process_report(pdf_path, output_folder, cache_dir=None, output_format="csv", record_metrics=False,
+                   store_path=None, budget=None):
+    started = time.perf_counter()
+    metrics.reset()
+    if budget:
+        page_guard.configure(*budget)
+    try:
+        ran = driver.run(pdf_path, output_folder, cache_dir=cache_dir, incremental=True, output_format=output_format,
+                         store_path=store_path)
+        status = {"status": "ok", "extracted": [module.__name__ for module in ran],
+                  "errors": len(page_guard.errors())}
+        if record_metrics:
+            metrics.write_jsonl(os.path.join(output_folder, "metrics.jsonl"))
+    except Exception as exc:
+        status = {"status": "failed", "error": f"{type(exc).__name__}: {exc}", "traceback": traceback.format_exc()}
+    status.update(pdf=pdf_path, seconds=round(time.perf_counter() - started, 3))
+    return status
+
+# 💥 One report in a process of its own: a crash in native code (or an os._exit)
+# fails only this report instead of the pool it ran in
+def process_isolated(pdf_path, *args):
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        try:
+            return pool.submit(process_report, pdf_path, *args).result()
+        except BrokenProcessPool as exc:
+            return {"status": "failed", "error": f"{type(exc).__name__}: the report's worker process died",
+                    "pdf": pdf_path, "seconds": round(time.perf_counter() - started, 3)}
+
+def load_status(output_root):
+    path = os.path.join(output_root, status_name)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_status(statuses, output_root):
+    path = os.path.join(output_root, status_name)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(statuses, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+# 🔁 Run every report through a bounded process pool. Each report's manifest makes
+# reruns resumable: finished reports are a hash check, failed ones are retried.
+def run_batch(source, output_root=output_root, workers=1, cache_dir=None, output_format="csv", record_metrics=False,
+              store_path=None, budget=None):
+    reports = find_reports(source)
+    ids = {}
+    for pdf_path in reports:
+        rid = report_id(pdf_path)
+        if rid in ids:
+            raise ValueError(f"Reports {ids[rid]!r} and {pdf_path!r} share the id {rid!r}")
+        ids[rid] = pdf_path
+
+    os.makedirs(output_root, exist_ok=True)
+    statuses = load_status(output_root)
+    started = time.perf_counter()
+
+    jobs = {rid: (pdf_path, os.path.join(output_root, rid), cache_dir, output_format, record_metrics, store_path,
+                  budget)
+            for rid, pdf_path in ids.items()}
+
+    def finish(rid, status):
+        statuses[rid] = status
+        save_status(statuses, output_root)
+        mark = "❌" if status["status"] != "ok" else "⚠️" if status.get("errors") else "✅"
+        print(f"{mark} {rid} ({status['seconds']}s)")
+
+    broken = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(process_report, *job): rid for rid, job in jobs.items()}
+        for future in as_completed(futures):
+            rid = futures[future]
+            try:
+                finish(rid, future.result())
+            except BrokenProcessPool:
+                broken.append(rid)
+
+    # A worker that died takes every report in flight or queued on the pool with it;
+    # those are re-run one process each, so only the report that kills its process fails
+    if broken:
+        broken.sort()
+        print(f"💥 A worker process died; re-running {len(broken)} report(s) one process each")
+        with ThreadPoolExecutor(max_workers=workers) as threads:
+            for rid, status in zip(broken, threads.map(lambda rid: process_isolated(*jobs[rid]), broken)):
+                finish(rid, status)
+
+    elapsed = time.perf_counter() - started
+    failed = [rid for rid in ids if statuses[rid]["status"] != "ok"]
+    rate = len(ids) / elapsed * 60 if elapsed else 0.0
+    print(f"\n📊 {len(ids)} reports in {elapsed:.1f}s ({rate:.1f} reports/min), {len(failed)} failed")
+    return {rid: statuses[rid] for rid in ids}
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract every schedule from a directory or glob of cost reports.")
+    parser.add_argument("source", help="directory (searched recursively) or glob pattern of PDFs")
+    parser.add_argument("--out", default=output_root, help="root folder, one subfolder per report (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=0, help="reports processed in parallel, 0 = one per CPU")
+    parser.add_argument("--word-cache", default=None, help="folder for the on-disk page word cache")
+    parser.add_argument("--format", default="csv", choices=sorted(driver.outputs.extensions), help="output table format")
+    parser.add_argument("--metrics", action="store_true", help="append metrics events to metrics.jsonl in each report folder")
+    parser.add_argument("--store", default=None, help="SQLite file every report's tables are also written to")
+    parser.add_argument("--page-timeout", type=float, default=page_guard.page_timeout, metavar="SECONDS",
+                        help="time budget per page attempt, 0 = unbounded (default: %(default)s)")
+    parser.add_argument("--page-memory", type=int, default=None, metavar="MB",
+                        help="memory an extraction worker may add while parsing pages (default: unbounded)")
+    args = parser.parse_args()
+
+    # 📁 Set working directory to project root
+    project_root = Path(__file__).resolve().parents[1]
+    os.chdir(project_root)
+    print(f"📁 Working in: {os.getcwd()}")
+
+    statuses = run_batch(args.source, args.out, args.workers or os.cpu_count() or 1, args.word_cache, args.format,
+                         args.metrics, args.store, (args.page_timeout, args.page_memory))
+    if any(status["status"] != "ok" for status in statuses.values()):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
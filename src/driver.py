@@ -0,0 +1,256 @@
+import os
+import argparse
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from collections import defaultdict
+
+import schedule2
+import schedule3
+import schedule4
+import schedule5
+import schedule6
+import schedule7
+import word_cache
+import word_sources
+import regions
+import manifest
+import page_locator
+import outputs
+import schedule_engine
+import metrics
+import pdf_input
+import store
+import page_guard
+from lazy_imports import lazy_import
+
+# streaming imports this module, so it loads on first use
+streaming = lazy_import("streaming")
+
+# 📄 Default paths (relative to project root)
+input_pdf_path = os.path.join("reports", "Hospital Cost Reports.pdf")
+output_folder = os.path.join("data")
+
+# 📊 Every schedule extractor, in the order their CSVs are written
+schedule_modules = [schedule2, schedule3, schedule4, schedule5, schedule6, schedule7]
+
+# 🗂 Map each page index to the (module, label) pairs that read it
+def build_dispatch_table(modules=schedule_modules):
+    return schedule_engine.compile_plan(modules)
+
+# 🛡 Run the extractors for one page under page_guard: a page that fails twice yields no
+# rows (and a "page_error" event per attempt) instead of stopping the caller.
+# Returns [(module, label, (headers, rows))]
+def guarded_page(page, i, targets):
+    def attempt(choice):
+        word_sources.page_backends[i] = choice
+        try:
+            return schedule_engine.run_page(page, targets)
+        except BaseException:
+            # Drop whatever layout the failed attempt built before retrying
+            page.close()
+            raise
+
+    schedules = [f"{module.__name__}:{label}" for module, label in targets]
+    with metrics.page_profile(i):
+        page_results, _ = page_guard.run_page(attempt, outputs.report_id, i, schedules,
+                                              word_sources.backend_for(page))
+    return page_results or [(module, label, ([], [])) for module, label in targets]
+
+# 📄 Run the extractors for a batch of [(page index, [(module name, label), ...])] on one PDF handle
+# Returns (results, drained metrics events); a worker gets the parent's profiling settings
+# and page budgets. Each page runs under guarded_page.
+def extract_pages(pdf_path, tasks, cache_dir=None, backend=None, profiling=None, budget=None):
+    if profiling:
+        metrics.configure(*profiling)
+    if budget:
+        page_guard.configure(*budget)
+        page_guard.limit_memory()
+    word_cache.cache.cache_dir = cache_dir
+    regions.configure(cache_dir)
+    tasks = [(i, [(importlib.import_module(module_name), label) for module_name, label in targets]) for i, targets in tasks]
+    word_sources.assign_backends(tasks, backend)
+    results = []
+    with pdf_input.open_pdf(pdf_path) as pdf:
+        for i, targets in tasks:
+            page = pdf.pages[i]
+            # Each page is parsed once for every schedule label that reads it
+            for module, label, result in guarded_page(page, i, targets):
+                results.append((module.__name__, label, i, result))
+            # Release the page's layout objects; the word cache keeps what we need
+            page.close()
+    return results, metrics.drain()
+
+# 💥 A worker that died (a crash in native code) takes its whole batch down; its pages
+# are re-run one process each so only the page that kills its process is lost
+def extract_isolated(pdf_path, task, cache_dir=None, backend=None, profiling=None, budget=None):
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        try:
+            return pool.submit(extract_pages, pdf_path, [task], cache_dir, backend, profiling, budget).result()
+        except BrokenProcessPool as exc:
+            i, targets = task
+            page_guard.record(outputs.report_id, i, [f"{name}:{label}" for name, label in targets], "crash",
+                              backend, exc, 0.0)
+            return [(name, label, i, ([], [])) for name, label in targets], ([], [])
+
+# 🔁 Open the PDF once and stream each page to the extractors that need it.
+# With workers > 1 (or a memory budget, which only applies inside workers) the pages are
+# dealt round-robin to a process pool; each worker opens its own handle and returns plain
+# row lists, merged here by page index.
+def extract_all(pdf_path, modules=schedule_modules, workers=1, cache_dir=None, backend=None):
+    dispatch = build_dispatch_table(modules)
+    tasks = [(i, [(module.__name__, label) for module, label in targets]) for i, targets in dispatch.items()]
+    page_results = {module.__name__: defaultdict(dict) for module in modules}
+    options = (cache_dir, backend, (metrics.profile_slowest, metrics.profiler_name), page_guard.settings())
+
+    if (workers > 1 and len(tasks) > 1) or page_guard.memory_limit_mb:
+        batches = [tasks[k::workers] for k in range(min(workers, len(tasks)))]
+        batch_results, broken = [], []
+        with ProcessPoolExecutor(max_workers=len(batches)) as pool:
+            futures = [pool.submit(extract_pages, pdf_path, batch, *options) for batch in batches]
+            for batch, future in zip(batches, futures):
+                try:
+                    batch_results.append(future.result())
+                except BrokenProcessPool as exc:
+                    metrics.emit("worker_crash", report=outputs.report_id, pages=[i for i, _ in batch],
+                                 error=type(exc).__name__)
+                    broken.extend(batch)
+        batch_results += [extract_isolated(pdf_path, task, *options) for task in sorted(broken)]
+    else:
+        batch_results = [extract_pages(pdf_path, tasks, cache_dir, backend)]
+
+    for results, drained in batch_results:
+        metrics.record(drained)
+        for module_name, label, i, result in results:
+            page_results[module_name][label][i] = result
+
+    return page_results
+
+# 💾 Hand each module its per-page results to merge and save. A module that fails is
+# reported and skipped so the rest still get written; returns the modules that succeeded.
+def write_all(page_results, output_folder, modules=schedule_modules):
+    os.makedirs(output_folder, exist_ok=True)
+    written = []
+    for module in modules:
+        try:
+            module.write_outputs(page_results[module.__name__], output_folder)
+            written.append(module)
+        except Exception as exc:
+            metrics.emit("output_error", report=outputs.report_id, schedule=module.__name__,
+                         error=type(exc).__name__, message=str(exc)[:500])
+            print(f"❌ {module.__name__} failed: {type(exc).__name__}: {exc}")
+    return written
+
+# 🚫 Modules that read a page no attempt could extract; they lose their manifest entry
+def modules_with_lost_pages(modules, errors):
+    lost = {event["page"] for event in errors if event["event"] == "page_error" and event["attempt"] != "primary"}
+    return {module for module in modules if lost & set(manifest.module_pages(module))}
+
+# 🔁 Extract and save; with incremental=True only modules whose manifest entry is stale run.
+# With locate=True schedule pages come from the report's page index instead of fixed lists.
+# With store_path every table is also written to that cross-report SQLite store.
+# With stream=True modules whose outputs only concatenate pages are written page by page
+# in this process (streaming.stream_modules) instead of being held in memory.
+def run(pdf_path=input_pdf_path, output_folder=output_folder, modules=schedule_modules, workers=1,
+        cache_dir=None, incremental=False, output_format="csv", backend=None, locate=True, store_path=None,
+        stream=False):
+    stopwatch = metrics.Stopwatch()
+    outputs.configure(output_format, report=os.path.basename(pdf_path))
+    store.configure(store_path)
+    records = manifest.load_manifest(output_folder)
+    pdf_hash = manifest.file_hash(pdf_path)
+    page_locator.use_index(page_locator.load_or_build(pdf_path, pdf_hash, output_folder) if locate else None)
+
+    if incremental:
+        modules = manifest.stale_modules(records, modules, pdf_path, pdf_hash, output_folder, backend)
+        if not modules:
+            print("✅ Manifest up to date, nothing to extract.")
+            return []
+
+    first_event = len(metrics.events)
+    streamed = [module for module in modules if stream and streaming.streamable(module)]
+    held = [module for module in modules if module not in streamed]
+    with stopwatch("extract"):
+        page_results = extract_all(pdf_path, held, workers, cache_dir, backend)
+    with stopwatch("write"):
+        written = write_all(page_results, output_folder, held)
+    if streamed:
+        with stopwatch("stream"):
+            written += streaming.stream_modules(pdf_path, streamed, output_folder, cache_dir, backend)
+
+    errors = page_guard.errors(metrics.events[first_event:])
+    report_path = page_guard.write_report(output_folder, errors)
+    if report_path:
+        print(f"⚠️ {len(errors)} page/output error(s), see: {report_path}")
+    complete = [module for module in written if module not in modules_with_lost_pages(modules, errors)]
+    incomplete = [module for module in modules if module not in complete]
+    manifest.save_manifest(manifest.update_manifest(records, complete, pdf_path, pdf_hash, output_folder, backend,
+                                                    incomplete), output_folder)
+    metrics.emit("run", report=outputs.report_id, pages=len(build_dispatch_table(modules)),
+                 schedules=[module.__name__ for module in modules], workers=workers, errors=len(errors),
+                 seconds=stopwatch.rounded())
+    return modules
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract every schedule from a hospital cost report in one pass.")
+    parser.add_argument("--pdf", default=input_pdf_path, help="input PDF (default: %(default)s)")
+    parser.add_argument("--out", default=output_folder, help="output folder for CSVs (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for page extraction, 0 = one per CPU (default: %(default)s)")
+    parser.add_argument("--word-cache", default=None,
+                        help="folder for the on-disk page word cache, reused across runs (default: memory only)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only re-extract schedules whose pages or config changed since the last run")
+    parser.add_argument("--format", default="csv", choices=sorted(outputs.extensions),
+                        help="csv keeps raw strings; parquet/arrow write typed columns (default: %(default)s)")
+    parser.add_argument("--fixed-pages", action="store_true",
+                        help="use each schedule's built-in page numbers instead of locating schedules by title")
+    parser.add_argument("--backend", default=None, choices=sorted(word_sources.backends),
+                        help="word source for every page (default: each schedule's word_backend)")
+    parser.add_argument("--page-timeout", type=float, default=page_guard.page_timeout, metavar="SECONDS",
+                        help="time budget per page attempt, 0 = unbounded (default: %(default)s)")
+    parser.add_argument("--page-memory", type=int, default=None, metavar="MB",
+                        help="memory an extraction worker may add while parsing pages (default: unbounded)")
+    parser.add_argument("--store", default=None,
+                        help="also write every table to this SQLite file, shared across reports (default: off)")
+    parser.add_argument("--stream", action="store_true",
+                        help="write schedules that only concatenate pages page by page, with bounded memory")
+    parser.add_argument("--metrics", default=None,
+                        help="append per-page, per-table and per-run metrics events to this JSON-lines file")
+    parser.add_argument("--profile-slowest", type=int, default=0, metavar="N",
+                        help="profile every page and keep captures for the N slowest (default: off)")
+    parser.add_argument("--profiler", default="cprofile", choices=["cprofile", "pyinstrument"],
+                        help="profiler for --profile-slowest (default: %(default)s)")
+    parser.add_argument("--profile-dir", default=None,
+                        help="folder for page profiles (default: <out>/profiles)")
+    args = parser.parse_args()
+    workers = args.workers or os.cpu_count() or 1
+
+    # 📁 Set working directory to project root
+    project_root = Path(__file__).resolve().parents[1]
+    os.chdir(project_root)
+    print(f"📁 Working in: {os.getcwd()}")
+
+    metrics.configure(args.profile_slowest, args.profiler)
+    page_guard.configure(args.page_timeout, args.page_memory)
+    run(args.pdf, args.out, workers=workers, cache_dir=args.word_cache, incremental=args.incremental,
+        output_format=args.format, backend=args.backend,
+        locate=not args.fixed_pages, store_path=args.store, stream=args.stream)
+    report_metrics(args.metrics, args.profile_dir or os.path.join(args.out, "profiles"))
+
+# 📈 Slowest pages of the run, plus the metrics file and page profiles when asked for
+def report_metrics(metrics_path=None, profile_dir=None, top=5):
+    for event in metrics.slowest_pages(top):
+        stages = ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in event["seconds"].items() if stage != "total")
+        print(f"🐢 Page {event['page'] + 1} ({', '.join(event['schedules'])}): "
+              f"{event['seconds']['total']:.3f}s, {event['words']} words, {event['rows']} rows [{stages}]")
+    if metrics_path:
+        metrics.write_jsonl(metrics_path)
+        print(f"📈 Metrics appended to: {metrics_path}")
+    if metrics.profile_slowest and profile_dir:
+        for path in metrics.write_profiles(profile_dir):
+            print(f"🔬 Page profile saved to: {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# 🔗 Join stage for schedules split across page groups.
+# Every part's keys are factorized together once, so each part is placed into the
+# result with one fancy-indexed assignment instead of pairwise index alignment;
+# cost stays linear in rows however many parts or reports are joined.
+# Repeated keys inside a part and disagreeing values across parts are returned
+# as issues instead of being dropped silently.
+
+# 🧮 Integer key codes for every part, shared across parts, in first-seen order.
+# Each key column is factorized on its own (values stripped) and the per-column
+# codes are folded into one integer per row before the final factorize.
+def factorize_keys(parts, keys):
+    sizes = [len(df) for _, df in parts]
+    combined = np.zeros(sum(sizes), dtype=np.int64)
+    stripped = {}
+    for key in keys:
+        values = np.concatenate([df[key].to_numpy(dtype=object) for _, df in parts]) if parts else []
+        stripped[key] = pd.Series(values, dtype=object).astype(str).str.strip().to_numpy(dtype=object)
+        codes, uniques = pd.factorize(stripped[key])
+        combined = combined * max(len(uniques), 1) + codes
+
+    codes, _ = pd.factorize(combined)
+    _, first_rows = np.unique(codes, return_index=True)
+    uniques = pd.DataFrame({key: stripped[key][first_rows] for key in keys})
+    bounds = np.cumsum([0] + sizes)
+    return [codes[start:end] for start, end in zip(bounds[:-1], bounds[1:])], uniques
+
+# 🧹 Row positions to keep per key ("first" or "last"), plus the repeats they win over
+def dedupe(codes, keep):
+    order = np.arange(len(codes)) if keep == "first" else np.arange(len(codes))[::-1]
+    _, winners = np.unique(codes[order], return_index=True)
+    kept = np.sort(order[winners])
+    dropped = np.setdiff1d(np.arange(len(codes)), kept, assume_unique=True)
+    return kept, dropped
+
+# ⚠️ A repeated key is a "duplicate" when its row matches the kept one, else a "conflict"
+def repeat_issues(label, values, codes, kept, dropped, uniques):
+    winner_of = dict(zip(codes[kept].tolist(), kept.tolist()))
+    issues = []
+    for i in dropped.tolist():
+        code = int(codes[i])
+        same = list(values[i]) == list(values[winner_of[code]])
+        issues.append({"part": label, "key": tuple(uniques.iloc[code]), "kind": "duplicate" if same else "conflict"})
+    return issues
+
+# 🔗 Side-by-side join: key columns, then every part's value columns in part order.
+# Keys come out in first-seen order; missing cells are NaN, as pd.concat(axis=1) left them.
+def join_side_by_side(parts, keys, keep="first"):
+    part_codes, uniques = factorize_keys(parts, keys)
+    blocks, issues = [], []
+    for (label, df), codes in zip(parts, part_codes):
+        # By position: inferred headers can repeat a name
+        positions = [j for j, column in enumerate(df.columns) if column not in keys]
+        value_columns = [df.columns[j] for j in positions]
+        values = df.iloc[:, positions].to_numpy(dtype=object)
+        kept, dropped = dedupe(codes, keep)
+        issues += repeat_issues(label, values, codes, kept, dropped, uniques)
+
+        block = np.full((len(uniques), len(value_columns)), np.nan, dtype=object)
+        block[codes[kept]] = values[kept]
+        blocks.append((value_columns, block))
+
+    columns = list(keys) + [column for value_columns, _ in blocks for column in value_columns]
+    data = np.hstack([uniques.to_numpy(dtype=object)] + [block for _, block in blocks]) if blocks else []
+    return pd.DataFrame(data, columns=columns), issues
+
+# 🔗 Fold parts into one row per key under a fixed column list. Within a part the last
+# row for a key wins; a later part overwrites cells it has values for. Rows are
+# ordered by numeric line number (the first key), ties in first-seen order.
+def join_update(parts, keys, columns):
+    part_codes, uniques = factorize_keys(parts, keys)
+    position = {column: k for k, column in enumerate(columns)}
+    result = np.full((len(uniques), len(columns)), None, dtype=object)
+    issues = []
+    for (label, df), codes in zip(parts, part_codes):
+        value_columns = [column for column in df.columns if column not in keys and column in position]
+        values = df[value_columns].to_numpy(dtype=object)
+        kept, dropped = dedupe(codes, "last")
+        issues += repeat_issues(label, values, codes, kept, dropped, uniques)
+
+        targets = [position[column] for column in value_columns]
+        rows = codes[kept]
+        for k, target in enumerate(targets):
+            incoming = values[kept, k]
+            present = np.array([value is not None for value in incoming], dtype=bool)
+            current = result[rows[present], target]
+            clash = np.array([old is not None and old != new for old, new in zip(current, incoming[present])], dtype=bool)
+            for code in rows[present][clash].tolist():
+                issues.append({"part": label, "key": tuple(uniques.iloc[code]), "kind": "conflict",
+                               "column": columns[target]})
+            result[rows[present], target] = incoming[present]
+
+    for key in keys:
+        if key in position:
+            result[:, position[key]] = uniques[key].to_numpy(dtype=object)
+    line_numbers = pd.to_numeric(uniques[keys[0]], errors="coerce").to_numpy() if len(uniques) else np.array([])
+    order = np.argsort(line_numbers, kind="stable")
+    result = result[order]
+    result[pd.isna(result)] = ""
+    return pd.DataFrame(result, columns=columns), issues
+
+# 📣 One warning line per part and kind, with a few example keys
+def report_issues(table, issues, examples=3):
+    grouped = {}
+    for issue in issues:
+        grouped.setdefault((issue["part"], issue["kind"]), []).append(issue["key"])
+    for (part, kind), found in grouped.items():
+        sample = ", ".join(map(repr, found[:examples]))
+        more = f" (+{len(found) - examples} more)" if len(found) > examples else ""
+        print(f"⚠️ {table}: {len(found)} {kind} key(s) in {part}: {sample}{more}")
@@ -0,0 +1,20 @@
+import sys
+import importlib.util
+
+# 💤 Heavy dependencies (pandas, numpy, pdfplumber, pypdfium2) load on first
+# attribute access instead of at import time, so `--help`, an up-to-date
+# incremental run, the service's event loop and freshly spawned pool workers
+# only pay for the libraries they actually touch.
+
+def lazy_import(name):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
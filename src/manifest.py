@@ -0,0 +1,112 @@
+import os
+import json
+import hashlib
+import inspect
+import outputs
+import schedule_engine
+import row_builder
+import regions
+import joins
+import amounts
+import word_sources
+import word_cache
+import page_locator
+import pdf_input
+
+# 🧾 Manifest kept next to the CSVs so reruns only redo what changed.
+# It records the source PDF hash, a content hash per page, and for every schedule
+# module the config fingerprint, output format, pages read and files written.
+
+manifest_name = "manifest.json"
+
+def load_manifest(output_folder):
+    path = os.path.join(output_folder, manifest_name)
+    if not os.path.exists(path):
+        return {"pdf": {}, "pages": {}, "schedules": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_manifest(manifest, output_folder):
+    path = os.path.join(output_folder, manifest_name)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+# 📄 Hash each page's content streams and geometry (no layout analysis)
+def page_hashes(pdf_path, page_indices):
+    hashes = {}
+    with pdf_input.open_pdf(pdf_path) as pdf:
+        for i in page_indices:
+            page = pdf.pages[i]
+            digest = hashlib.sha256(repr((page.mediabox, page.rotation)).encode())
+            for stream in page.page_obj.contents:
+                digest.update(stream.get_data())
+            hashes[str(i)] = digest.hexdigest()
+    return hashes
+
+# 🧩 Every module whose code shapes a schedule's output, besides the schedule itself
+extraction_modules = [schedule_engine, row_builder, regions, joins, amounts, word_sources, word_cache, outputs,
+                      page_locator]
+
+# ⚙️ Fingerprint of the page map, spec, extraction code and settings a module's
+# outputs came from; backend is the run's word source override (None = each
+# schedule's own word_backend, which is in its source)
+def config_hash(module, backend=None):
+    pages = {str(label): pages for label, pages in module.pages_by_label().items()}
+    settings = {"pages": pages, "backend": backend, "format": outputs.output_format}
+    digest = hashlib.sha256(json.dumps(settings, sort_keys=True).encode())
+    for source in [module] + extraction_modules:
+        digest.update(inspect.getsource(source).encode())
+    return digest.hexdigest()
+
+def module_pages(module):
+    return sorted({i for pages in module.pages_by_label().values() for i in pages})
+
+# 🔍 Modules whose config, pages or outputs differ from the manifest
+def stale_modules(manifest, modules, pdf_path, pdf_hash, output_folder, backend=None):
+    stale = []
+    unchanged_pdf = manifest["pdf"].get("sha256") == pdf_hash
+    current_pages = None
+
+    for module in modules:
+        entry = manifest["schedules"].get(module.__name__)
+        if (entry is None or entry["config"] != config_hash(module, backend)
+                or not all(os.path.exists(os.path.join(output_folder, name)) for name in entry["outputs"])
+                or entry.get("format", "csv") != outputs.output_format):
+            stale.append(module)
+            continue
+        if unchanged_pdf:
+            continue
+
+        if current_pages is None:
+            all_pages = sorted({i for m in modules for i in module_pages(m)})
+            current_pages = page_hashes(pdf_path, all_pages)
+        if any(manifest["pages"].get(str(i)) != current_pages[str(i)] for i in module_pages(module)):
+            stale.append(module)
+
+    return stale
+
+# 💾 Record the modules just extracted. Modules that ran but lost a page or failed to
+# write (incomplete) drop their entry: the PDF hash advances regardless, so a kept
+# entry would look current to stale_modules and never be retried.
+def update_manifest(manifest, modules, pdf_path, pdf_hash, output_folder, backend=None, incomplete=()):
+    pages = sorted({i for module in modules for i in module_pages(module)})
+    manifest["pdf"] = {"path": pdf_path, "sha256": pdf_hash}
+    manifest["pages"].update(page_hashes(pdf_path, pages))
+    for module in incomplete:
+        manifest["schedules"].pop(module.__name__, None)
+
+    for module in modules:
+        names = [outputs.output_path(name) for name in module.output_names()]
+        manifest["schedules"][module.__name__] = {
+            "config": config_hash(module, backend),
+            "format": outputs.output_format,
+            "pages": module_pages(module),
+            "outputs": [name for name in names if os.path.exists(os.path.join(output_folder, name))],
+        }
+    return manifest
@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import heapq
+import pstats
+import cProfile
+from contextlib import contextmanager
+
+# 📈 Structured run metrics.
+# emit() appends plain-dict events to an in-process registry: one "page" event per
+# parsed page (schedules, word count, rows, seconds per stage), one "merge" event
+# per output table, one "run" event per report. Worker processes hand their events
+# back with drain() and the driver writes the whole run as JSON lines.
+# With profile_slowest=N every page runs under a profiler and only the N slowest
+# captures are kept and written out, so pathological pages can be inspected.
+
+events = []
+profile_slowest = 0
+profiler_name = "cprofile"
+
+# 🏆 Min-heap of (seconds, page index, capture) for the slowest pages seen so far
+slowest = []
+
+def configure(slowest_pages=0, profiler="cprofile"):
+    global profile_slowest, profiler_name
+    if profiler not in ("cprofile", "pyinstrument"):
+        raise ValueError(f"Unknown profiler {profiler!r}, expected 'cprofile' or 'pyinstrument'")
+    profile_slowest = slowest_pages
+    profiler_name = profiler
+    reset()
+
+def reset():
+    events.clear()
+    slowest.clear()
+
+def emit(event, **fields):
+    events.append({"event": event, **fields})
+
+# ⏱ Seconds per named stage, accumulated across `with stopwatch("stage"):` blocks
+class Stopwatch:
+    def __init__(self):
+        self.seconds = {}
+
+    @contextmanager
+    def __call__(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + time.perf_counter() - started
+
+    def rounded(self, digits=6):
+        return {stage: round(seconds, digits) for stage, seconds in self.seconds.items()}
+
+# 🔬 Profile one page when profiling is on; keep the capture only if it's among the slowest
+@contextmanager
+def page_profile(page_index):
+    if not profile_slowest:
+        yield
+        return
+
+    if profiler_name == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError as exc:
+            raise ImportError("Profiling with pyinstrument needs pyinstrument (pip install pyinstrument)") from exc
+        profiler = Profiler()
+    else:
+        profiler = cProfile.Profile()
+
+    started = time.perf_counter()
+    profiler.start() if profiler_name == "pyinstrument" else profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler_name == "pyinstrument":
+            profiler.stop()
+        else:
+            profiler.disable()
+        keep(time.perf_counter() - started, page_index, profiler)
+
+def keep(seconds, page_index, profiler):
+    if len(slowest) >= profile_slowest and seconds <= slowest[0][0]:
+        return
+    if isinstance(profiler, cProfile.Profile):
+        profiler.create_stats()
+        capture = profiler.stats
+    else:
+        capture = profiler.output_text(unicode=True)
+    entry = (seconds, page_index, capture)
+    if len(slowest) < profile_slowest:
+        heapq.heappush(slowest, entry)
+    else:
+        heapq.heapreplace(slowest, entry)
+
+# 📦 Hand this process's events and captures to the parent, emptying the registry
+def drain():
+    drained = (list(events), list(slowest))
+    reset()
+    return drained
+
+def record(drained):
+    worker_events, captures = drained
+    events.extend(worker_events)
+    for entry in captures:
+        if len(slowest) < profile_slowest:
+            heapq.heappush(slowest, entry)
+        elif entry[0] > slowest[0][0]:
+            heapq.heapreplace(slowest, entry)
+
+# 💾 Append the registry to a JSON-lines file
+def write_jsonl(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+# 💾 Write the kept captures as page_<n>.prof (cProfile, for pstats/snakeviz) or .txt
+def write_profiles(profile_dir):
+    os.makedirs(profile_dir, exist_ok=True)
+    paths = []
+    for seconds, page_index, capture in sorted(slowest, reverse=True):
+        if isinstance(capture, dict):
+            path = os.path.join(profile_dir, f"page_{page_index + 1}.prof")
+            stats = pstats.Stats()
+            stats.stats = capture
+            stats.dump_stats(path)
+        else:
+            path = os.path.join(profile_dir, f"page_{page_index + 1}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(capture)
+        paths.append(path)
+    return paths
+
+# 📊 Slowest pages of the run, from the page events
+def slowest_pages(n=5):
+    pages = [event for event in events if event["event"] == "page"]
+    return sorted(pages, key=lambda event: event["seconds"]["total"], reverse=True)[:n]
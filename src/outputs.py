@@ -0,0 +1,104 @@
+import os
+import json
+import importlib.util
+import amounts
+from lazy_imports import lazy_import
+
+pd = lazy_import("pandas")
+
+# 💾 Shared table writer for the schedule extractors.
+# "csv" keeps the raw extracted strings; "parquet" and "arrow" convert amount
+# columns to nullable Int64/Float64 and attach schedule/page/report metadata.
+# pyarrow is optional: only "parquet" and "arrow" need it, and configure() checks
+# for it up front so a missing install fails before any page is extracted.
+
+output_format = "csv"
+report_id = None
+
+extensions = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+# Identifier columns stay as text even when they look numeric (e.g. "98.01")
+key_columns = {"Line No.", "Cost Center Description", "Description"}
+
+def configure(fmt="csv", report=None):
+    global output_format, report_id
+    if fmt not in extensions:
+        raise ValueError(f"Unknown output format {fmt!r}, expected one of {sorted(extensions)}")
+    if fmt != "csv" and importlib.util.find_spec("pyarrow") is None:
+        raise ImportError(f"Writing {fmt} output needs pyarrow (pip install pyarrow)")
+    output_format = fmt
+    report_id = report
+
+# 📄 Path a CSV-named output is actually written to in the current format
+def output_path(csv_path):
+    return os.path.splitext(csv_path)[0] + extensions[output_format]
+
+# 🔢 Convert a column of lakh/crore-grouped strings to a nullable numeric dtype, or
+# return None when it holds text. Placeholders and malformed amounts become missing.
+def numeric_column(series):
+    values, scales, kinds = amounts.parse_amounts(series.tolist())
+    if not amounts.is_amount_column(kinds):
+        return None
+    return pd.Series(amounts.to_array(values, scales, kinds), index=series.index, name=series.name)
+
+# ⚠️ (column, row, text) for every malformed amount in the value columns, e.g. "2,"
+# or two columns run together, which typed output would otherwise drop silently
+def malformed_amounts(df):
+    found = []
+    for i, column in enumerate(df.columns):
+        if column in key_columns:
+            continue
+        tokens = df.iloc[:, i].tolist()
+        _, _, kinds = amounts.parse_amounts(tokens)
+        if amounts.is_amount_column(kinds):
+            found += [(column, row, tokens[row]) for row in (kinds == amounts.MALFORMED).nonzero()[0].tolist()]
+    return found
+
+# 🏷 Arrow needs unique column names; suffix repeats the way pd.read_csv does ("TO", "TO.1")
+def unique_columns(columns):
+    seen = {}
+    names = []
+    for column in map(str, columns):
+        count = seen.get(column, 0)
+        seen[column] = count + 1
+        names.append(column if count == 0 else f"{column}.{count}")
+    return names
+
+def typed_frame(df):
+    typed = df.copy()
+    typed.columns = unique_columns(df.columns)
+    for i, column in enumerate(df.columns):
+        if column in key_columns:
+            continue
+        converted = numeric_column(df.iloc[:, i])
+        if converted is not None:
+            typed.isetitem(i, converted)
+    return typed
+
+def write_arrow(df, path, metadata):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        import pyarrow.feather as feather
+    except ImportError as exc:
+        raise ImportError(f"Writing {output_format} output needs pyarrow (pip install pyarrow)") from exc
+
+    table = pa.Table.from_pandas(typed_frame(df), preserve_index=False)
+    schema_metadata = dict(table.schema.metadata or {})
+    schema_metadata.update({key.encode(): json.dumps(value).encode() for key, value in metadata.items()})
+    table = table.replace_schema_metadata(schema_metadata)
+
+    if output_format == "parquet":
+        pq.write_table(table, path)
+    else:
+        feather.write_feather(table, path)
+
+# 💾 Save one schedule table; pages are 0-based indices, stored 1-based in metadata
+def save_table(df, csv_path, schedule, pages=()):
+    path = output_path(csv_path)
+    if output_format == "csv":
+        df.to_csv(path, index=False)
+    else:
+        metadata = {"schedule": schedule, "pages": [i + 1 for i in pages], "report": report_id}
+        write_arrow(df, path, metadata)
+    return path
@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import ctypes
+import signal
+import threading
+from contextlib import contextmanager
+
+import metrics
+
+# resource (address-space caps) is Unix-only; elsewhere the memory budget is off
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# 🛡 Page budgets and fault isolation.
+# Every page attempt runs under a wall-clock budget, and extraction workers can run
+# under an address-space cap (Unix only), so one pathological page costs at most its budget
+# instead of stalling or aborting the report. A page that fails is retried once with
+# the other word backend (PDFium skips pdfminer's layout analysis; a page PDFium
+# chokes on gets the reference backend). The retry is only cheaper from pdfplumber:
+# there is no word source below PDFium, so a PDFium page that spent its whole
+# budget isn't handed to pdfplumber to spend another one. Every failed attempt is a "page_error"
+# metrics event, so worker failures reach the driver with the rest of the events
+# and end up in the report's errors.json.
+
+page_timeout = 60.0      # seconds per page attempt; None or 0 = unbounded
+memory_limit_mb = None   # address space an extraction worker may add; None = unbounded
+
+error_report_name = "errors.json"
+
+class PageTimeout(Exception):
+    def __init__(self, message="page exceeded its time budget"):
+        super().__init__(message)
+
+def configure(timeout=60.0, memory_mb=None):
+    global page_timeout, memory_limit_mb
+    page_timeout = timeout or None
+    memory_limit_mb = memory_mb or None
+
+def settings():
+    return page_timeout, memory_limit_mb
+
+# 🧠 Cap this process's address space at its current size plus the budget (a forked
+# worker starts with the parent's mappings). Only for worker processes: past the cap,
+# allocations raise MemoryError inside the page that made them.
+def limit_memory(memory_mb=None):
+    memory_mb = memory_mb or memory_limit_mb
+    if not memory_mb:
+        return
+    if resource is None:
+        print(f"⚠️ No memory budget on this platform; pages run without the {memory_mb} MB cap")
+        return
+    try:
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[0]) * resource.getpagesize()
+    except OSError:
+        current = 0
+    limit = current + int(memory_mb) * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    resource.setrlimit(resource.RLIMIT_AS, (limit if hard == resource.RLIM_INFINITY else min(limit, hard), hard))
+
+def _expired(signum, frame):
+    raise PageTimeout(f"page exceeded its {page_timeout:g}s budget")
+
+# ⏰ The alarm on Unix's main thread: SIGALRM interrupts the page at its next bytecode
+@contextmanager
+def alarm_budget(seconds):
+    previous = signal.signal(signal.SIGALRM, _expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def _raise_in(thread_id, exc_type):
+    return ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), exc_type and ctypes.py_object(exc_type))
+
+# ⏲ Elsewhere (Windows, worker threads) a timer thread raises PageTimeout in the
+# page's thread, also at its next bytecode. The lock keeps a late timer from
+# firing into code after the page; one that fired as the page ended is withdrawn.
+@contextmanager
+def timer_budget(seconds):
+    thread_id, lock, state = threading.get_ident(), threading.Lock(), {"done": False, "fired": False}
+
+    def expire():
+        with lock:
+            if not state["done"]:
+                state["fired"] = _raise_in(thread_id, PageTimeout) == 1
+
+    timer = threading.Timer(seconds, expire)
+    timer.daemon = True
+    timer.start()
+    try:
+        yield
+    finally:
+        timer.cancel()
+        with lock:
+            state["done"] = True
+            if state["fired"]:
+                _raise_in(thread_id, None)
+
+# ⏱ Raise PageTimeout in the running page once the budget is spent (no budget: the
+# page runs unbounded)
+@contextmanager
+def time_budget(seconds=None):
+    seconds = seconds or page_timeout
+    if not seconds:
+        yield
+    elif hasattr(signal, "SIGALRM") and threading.current_thread() is threading.main_thread():
+        with alarm_budget(seconds):
+            yield
+    else:
+        with timer_budget(seconds):
+            yield
+
+def fallback_backend(backend):
+    return "pdfplumber" if backend == "pdfium" else "pdfium"
+
+def record(report, page_index, schedules, attempt, backend, error, seconds):
+    metrics.emit("page_error", report=report, page=page_index, schedules=schedules, attempt=attempt,
+                 backend=backend, error=type(error).__name__, message=str(error)[:500], seconds=round(seconds, 6))
+
+# 🔁 Run extract(backend) for one page: the page's own backend first, then the
+# fallback, except after a PDFium timeout. Returns (result, backend that worked),
+# or (None, None) when no attempt worked.
+def run_page(extract, report, page_index, schedules, backend):
+    for attempt, choice in (("primary", backend), ("fallback", fallback_backend(backend))):
+        started = time.perf_counter()
+        try:
+            with time_budget():
+                return extract(choice), choice
+        except Exception as exc:
+            record(report, page_index, schedules, attempt, choice, exc, time.perf_counter() - started)
+            if isinstance(exc, PageTimeout) and choice == "pdfium":
+                break
+    return None, None
+
+# 📋 page_error and output_error events of this run, in the order they happened
+def errors(events=None):
+    return [event for event in (metrics.events if events is None else events)
+            if event["event"] in ("page_error", "output_error")]
+
+# 💾 errors.json next to the outputs; a clean run removes the previous report
+def write_report(output_folder, found):
+    path = os.path.join(output_folder, error_report_name)
+    if not found:
+        if os.path.exists(path):
+            os.remove(path)
+        return None
+    os.makedirs(output_folder, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(found, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,111 @@
+import os
+import re
+import json
+
+import word_sources
+import pdf_input
+
+# 🧭 Schedule locator: one pass over each page's top band (the same top < 150 strip
+# detect_column_headers reads) finds the "SCHEDULE <numeral> - ..." title, so
+# page numbers come from the report itself instead of fixed 0-based lists.
+# The index {schedule: [page indices]} is persisted per report next to the
+# manifest and handed to every extractor through pages().
+# Page groups inside a schedule (Schedule II's column groups, Schedule VI's parts)
+# are located the same way: the line of column numbers printed under the title,
+# e.g. "(8) (9) (10) ...", files each page under "<numeral>:<first column>" too.
+
+index_name = "page_index.json"
+index_version = 2
+top_band = 150
+
+title_pattern = re.compile(r"^\s*SCHEDULE\s+([IVXL]+[A-Z]*)\s+-", re.MULTILINE)
+column_line_pattern = re.compile(r"^\s*\(?(\d+)\)?(?:\s+\(?\d+\)?)*\s*$")
+
+# 🗂 Index in use for the current report; None keeps each module's default pages
+current_index = None
+page_schedules = {}
+
+# 🔎 Schedule numeral on a page, e.g. "VIIA", or None for untitled pages
+def page_title(page):
+    return page_heading(page)[0]
+
+# 🔢 Schedule numeral and the first column number of the line right under the
+# title, e.g. ("II", 8); (None, None) for untitled pages
+def page_heading(page):
+    text = word_sources.top_band_text(page, top_band)
+    match = title_pattern.search(text)
+    if not match:
+        return None, None
+    lines = text[match.end():].splitlines()
+    column_line = column_line_pattern.match(lines[1]) if len(lines) > 1 else None
+    return match.group(1), int(column_line.group(1)) if column_line else None
+
+# 🏷 Index key of a page group, e.g. group_key("II", 8) -> "II:8"
+def group_key(numeral, first_column):
+    return f"{numeral}:{first_column}"
+
+# 📄 Scan every page once. Untitled pages (e.g. Schedule IV's "E. MassHealth
+# Providers") continue the schedule and group before them.
+def build_index(pdf):
+    schedules = {}
+    current, group = None, None
+    for page in pdf.pages:
+        numeral, first_column = page_heading(page)
+        if numeral:
+            current = numeral
+            group = group_key(numeral, first_column) if first_column is not None else None
+        if current:
+            schedules.setdefault(current, []).append(page.page_number - 1)
+        if group:
+            schedules.setdefault(group, []).append(page.page_number - 1)
+    return schedules
+
+def load_index(output_folder, pdf_hash):
+    path = os.path.join(output_folder, index_name)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        saved = json.load(f)
+    current = saved.get("sha256") == pdf_hash and saved.get("version") == index_version
+    return saved["schedules"] if current else None
+
+def save_index(schedules, output_folder, pdf_path, pdf_hash):
+    os.makedirs(output_folder, exist_ok=True)
+    path = os.path.join(output_folder, index_name)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"pdf": pdf_path, "sha256": pdf_hash, "version": index_version, "schedules": schedules}, f, indent=2)
+    os.replace(tmp_path, path)
+
+# 💾 Reuse the saved index for this PDF hash, or scan the report and save it
+def load_or_build(pdf_path, pdf_hash, output_folder):
+    schedules = load_index(output_folder, pdf_hash)
+    if schedules is None:
+        with pdf_input.open_pdf(pdf_path) as pdf:
+            schedules = build_index(pdf)
+        save_index(schedules, output_folder, pdf_path, pdf_hash)
+    return schedules
+
+def use_index(schedules):
+    global current_index, page_schedules
+    current_index = schedules
+    page_schedules = {i: numeral for numeral, pages in (schedules or {}).items() if ":" not in numeral for i in pages}
+
+# 🏷 Schedule a page belongs to, from the index when there is one
+def schedule_of(page):
+    if current_index is not None:
+        return page_schedules.get(page.page_number - 1)
+    return page_title(page)
+
+# 🗺 Resolve a module's layout {label: (schedule numerals, page offsets)} against the
+# current index. Numerals (or group keys) are tried in order; offsets None means every page.
+# Without an index the module's default pages are returned unchanged.
+def pages(layout, default_pages):
+    if current_index is None:
+        return default_pages
+
+    located = {}
+    for label, (numerals, offsets) in layout.items():
+        found = next((current_index[n] for n in numerals if n in current_index), [])
+        located[label] = list(found) if offsets is None else [found[k] for k in offsets if k < len(found)]
+    return located
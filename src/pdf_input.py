@@ -0,0 +1,121 @@
+import io
+import os
+import mmap
+
+from lazy_imports import lazy_import
+
+pdfplumber = lazy_import("pdfplumber")
+
+# 🗺 Memory-mapped PDF input.
+# A report is mapped read-only once per process while it's open, and every reader
+# (pdfminer via pdfplumber, PDFium, hashing) gets its own cursor over the same
+# mapping, so no process holds a private copy of the file. Pool workers that map the
+# same path share the OS page cache pages, so per-worker RSS follows the parsed
+# structures instead of the document size. The mapping (and the file descriptor
+# mmap holds) is closed with the last cursor, so a long-running worker doesn't
+# keep one per report it has seen.
+
+# 📂 Mappings in use in this process: absolute path -> Mapping
+_mappings = {}
+
+class Mapping:
+    def __init__(self, path, version):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+        self.version = version
+        self.users = 0
+
+    def release(self):
+        self.users -= 1
+        if self.users:
+            return
+        if _mappings.get(self.path) is self:
+            del _mappings[self.path]
+        try:
+            self.data.close()
+        except BufferError:
+            # A view outlived its cursor; the mapping closes when that view goes
+            pass
+
+# (size, mtime, inode): a replaced file gets a new mapping; cursors on the old one keep it
+def mapping(pdf_path):
+    path = os.path.abspath(pdf_path)
+    stat = os.stat(path)
+    version = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    entry = _mappings.get(path)
+    if entry is None or entry.version != version:
+        entry = _mappings[path] = Mapping(path, version)
+    return entry
+
+# 📄 Read-only file object over a mapping, with its own position. Closing it closes
+# the cursors reopened from it too (PDFium's), then releases the mapping.
+class MappedFile(io.RawIOBase):
+    def __init__(self, source, name=None):
+        super().__init__()
+        self.source = source
+        source.users += 1
+        self.view = memoryview(source.data)
+        self.position = 0
+        self.name = name
+        self.cursors = []
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: len(self.view)}[whence]
+        self.position = max(0, base + offset)
+        return self.position
+
+    def read(self, size=-1):
+        end = len(self.view) if size is None or size < 0 else min(len(self.view), self.position + size)
+        data = self.view[self.position:end].tobytes()
+        self.position = max(self.position, end)
+        return data
+
+    def readinto(self, buffer):
+        target = memoryview(buffer).cast("B")
+        chunk = self.view[self.position:self.position + len(target)]
+        target[:len(chunk)] = chunk
+        self.position += len(chunk)
+        return len(chunk)
+
+    # hashlib.file_digest hashes this directly instead of reading in chunks
+    def getbuffer(self):
+        return self.view
+
+    # 🔁 Another cursor over the same mapping
+    def reopen(self):
+        cursor = MappedFile(self.source, self.name)
+        self.cursors.append(cursor)
+        return cursor
+
+    def close(self):
+        if not self.closed:
+            for cursor in self.cursors:
+                cursor.close()
+            self.view.release()
+            self.source.release()
+        super().close()
+
+def open_mapped(pdf_path):
+    return MappedFile(mapping(pdf_path), name=os.path.abspath(pdf_path))
+
+# 📄 Drop-in for pdfplumber.open(pdf_path) that reads through the mapping; closing
+# the PDF closes its cursor
+def open_pdf(pdf_path, **options):
+    stream = open_mapped(pdf_path)
+    try:
+        pdf = pdfplumber.open(stream, **options)
+    except BaseException:
+        stream.close()
+        raise
+    pdf.stream_is_external = False
+    return pdf
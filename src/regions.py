@@ -0,0 +1,123 @@
+import os
+import re
+import json
+import statistics
+from collections import defaultdict
+
+import page_locator
+import word_sources
+from word_cache import page_words
+
+# ✂️ Page regions: the header band the heading is read from, and the body rows are
+# built from. Both come from one text-flow extraction of the whole page. (Learned
+# body crops were dropped: on the cost reports every word lies inside the table
+# areas, and pdfminer lays out the whole page whatever the crop, so they saved no
+# layout work.)
+
+# 🗃 JSON-backed store of column labels by heading fingerprint (schedule_engine)
+class HeadingStore:
+    def __init__(self, path=None):
+        self.path = path
+        self.labels = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.labels = json.load(f)
+
+    def get(self, key):
+        return self.labels.get(key)
+
+    def put(self, key, labels):
+        self.labels[key] = labels
+        if self.path:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.labels, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+# 🌐 Process-wide labels; with a cache folder they persist across runs and reports
+headings = HeadingStore()
+
+def configure(cache_dir=None):
+    global headings
+    # Column bands are learned from one report's pages; each report starts afresh
+    bands.clear()
+    headings_path = os.path.join(cache_dir, "headings.json") if cache_dir else None
+    if headings_path != headings.path:
+        headings = HeadingStore(headings_path)
+    return headings
+
+def template_key(page):
+    return f"{page_locator.schedule_of(page) or '-'}@{round(page.width)}x{round(page.height)}"
+
+def header_bbox(page):
+    return (0, 0, page.width, min(page_locator.top_band, page.height))
+
+# 🔝 Words in the header band, the only ones detect_column_headers looks at
+def header_of(page, words):
+    bbox = header_bbox(page)
+    return [word for word in words if word_sources.in_region(word, bbox)]
+
+# 📄 (header words, body words) of a page from its one text-flow word list
+def page_regions(page):
+    words = page_words(page, use_text_flow=True)
+    return header_of(page, words), words
+
+# 📊 Column bands per template. Most schedules print a line of column numbers,
+# "(1) (2) (3) ...", at the foot of the header band; each number sits over its
+# column, so band edges go halfway between neighbouring markers and half a
+# spacing before the first one. A marker over the description (the "(1)" of
+# Schedule V-B) isn't a value column. Templates without a marker line get None
+# and keep token-order columns.
+marker_re = re.compile(r"^\(\d+\)$")
+
+# 🗂 (template, markers) -> band edges; a schedule's continuation pages print
+# their own column numbers, so the marker line is part of the key
+bands = {}
+
+def column_markers(header):
+    lines = defaultdict(list)
+    for word in header:
+        lines[round(word["top"], 1)].append(word)
+    for y in sorted(lines, reverse=True):
+        if len(lines[y]) >= 2 and all(marker_re.match(word["text"]) for word in lines[y]):
+            return sorted(lines[y], key=lambda w: w["x0"])
+    return []
+
+# 📍 Typical x0 of the first word after a row's line number, where descriptions
+# start; rows with only numbers (blank lines that repeat the line number) don't count
+def description_start(words):
+    lines = defaultdict(list)
+    for word in words:
+        lines[round(word["top"], 1)].append(word)
+    starts = []
+    for line in lines.values():
+        line.sort(key=lambda w: (w["x0"], w["text"]))
+        if line[0]["text"].replace(".", "", 1).isdigit():
+            first_word = next((w for w in line[1:] if not w["text"][:1].isdigit()), None)
+            if first_word is not None:
+                starts.append(first_word["x0"])
+    return statistics.median(starts) if starts else None
+
+# 📐 Edges from marker words. The last band stops one marker width past its marker:
+# amounts are right-aligned just past their column number, while the line number
+# repeated in the right margin sits further out
+def band_edges(markers, description_x=None):
+    centers = [(w["x0"] + w["x1"]) / 2 for w in markers]
+    last = markers[-1]
+    edges = [centers[0] - (centers[1] - centers[0]) / 2]
+    edges += [(a + b) / 2 for a, b in zip(centers, centers[1:])]
+    edges.append(min(centers[-1] + (centers[-1] - centers[-2]) / 2, last["x1"] + (last["x1"] - last["x0"])))
+    if description_x is not None:
+        while len(edges) > 2 and edges[0] <= description_x:
+            edges.pop(0)
+    return edges
+
+def column_bands(page, header, words):
+    markers = column_markers(header)
+    if not markers:
+        return None
+    key = (template_key(page), tuple((w["text"], round(w["x0"])) for w in markers))
+    if key not in bands:
+        bands[key] = band_edges(markers, description_start(words))
+    return bands[key]
@@ -0,0 +1,277 @@
+import re
+from functools import cache
+from operator import itemgetter
+from collections import namedtuple
+from lazy_imports import lazy_import
+
+from amounts import parse_amounts, INTEGER, DECIMAL, MALFORMED
+
+np = lazy_import("numpy")
+
+# 🧾 Vectorized row assembly shared by every schedule's extract_rows.
+# A page's words are loaded into arrays once: lines are clustered with a sort
+# on (rounded top, x0) plus a diff, every token is classified in one pass over
+# a flat UTF-32 buffer of the page text, and the description/value split falls
+# out of cumulative sums. Numbered lines match the original per-word loop row for
+# row; lines without a line number only ever extend the row they continue.
+# The arrays have a fixed cost per page: on this report's ~190-word pages it runs
+# level with the per-word loop (~0.2 ms, next to ~27 ms for extract_words), and
+# pulls ahead as pages get denser (see benchmarks/bench_row_builder.py).
+
+amount_re = re.compile(r"^\d[\d,]*\.?\d*$")
+
+# 🔤 Character classes for the ASCII fast path, built on first use so importing
+# this module doesn't load numpy
+DIGIT, COMMA, DOT, OTHER, WIDE = 1, 2, 4, 8, 16
+
+@cache
+def char_classes():
+    classes = np.full(129, OTHER, dtype=np.uint8)
+    classes[ord("0"):ord("9") + 1] = DIGIT
+    classes[ord(",")] = COMMA
+    classes[ord(".")] = DOT
+    classes[128] = WIDE
+    return classes
+
+# 🔢 Classify tokens as amounts (re.match(r"^\d[\d,]*\.?\d*$")) and as line numbers
+# (token.replace(".", "", 1).isdigit()). Tokens with non-ASCII characters take
+# the Python path so Unicode digits behave exactly as before.
+def classify_tokens(texts):
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    codes = np.frombuffer("".join(texts).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    classes = char_classes()[np.minimum(codes, 128)]
+    starts = np.cumsum(lengths) - lengths
+    regular = lengths > 0
+    offsets = starts[regular]
+
+    seen = np.zeros(len(texts), dtype=np.uint8)
+    first = np.zeros(len(texts), dtype=np.uint8)
+    dots = np.zeros(len(texts), dtype=np.int64)
+    comma_after_dot = np.zeros(len(texts), dtype=bool)
+    if len(offsets):
+        is_dot = classes == DOT
+        dots_so_far = np.cumsum(is_dot)
+        dots_so_far -= np.repeat(dots_so_far[offsets] - is_dot[offsets], lengths[regular])
+        seen[regular] = np.bitwise_or.reduceat(classes, offsets)
+        first[regular] = classes[offsets]
+        dots[regular] = np.add.reduceat(is_dot, offsets, dtype=np.int64)
+        comma_after_dot[regular] = np.logical_or.reduceat((classes == COMMA) & (dots_so_far > 0), offsets)
+
+    plain = (seen & (OTHER | WIDE)) == 0
+    amounts = plain & (first == DIGIT) & (dots <= 1) & ~comma_after_dot
+    line_numbers = plain & ((seen & COMMA) == 0) & ((seen & DIGIT) != 0) & (dots <= 1)
+
+    for i in np.flatnonzero(((seen & WIDE) != 0) | ~regular).tolist():
+        amounts[i] = amount_re.match(texts[i]) is not None
+        line_numbers[i] = texts[i].replace(".", "", 1).isdigit()
+    return amounts, line_numbers
+
+# 📏 round(top, 1) for a whole array. np.round can land on the other side of a
+# .x5 tie from Python's exact decimal rounding, so near-ties fall back to round()
+def round_tops(tops):
+    scaled = tops * 10
+    keys = np.round(scaled) / 10
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        keys[i] = round(float(tops[i]), 1)
+    return keys
+
+# 📊 Column bands: edges [e0, e1, ..., en] split the value side of a line into n
+# cells, one per column of the page template (see regions.column_bands). A value
+# lands in the cell its center falls in (a center on an edge goes left), so a blank
+# cell stays blank instead of pulling later values left. A line's values start at its
+# first amount in a band (or its first word in a text band); description words that
+# run into an amount band before that stay in the description. Amounts right of the
+# last band follow the cells in token order; text there is one text column.
+def build_rows(words, bands=None):
+    if not words:
+        return []
+
+    y_keys = round_tops(np.fromiter(map(itemgetter("top"), words), dtype=float, count=len(words)))
+    x0 = np.fromiter(map(itemgetter("x0"), words), dtype=float, count=len(words))
+    texts = list(map(itemgetter("text"), words))
+
+    # 📐 Sort by line, then x0; exact (y, x0) ties are broken by text as sorted() did
+    order = np.lexsort((x0, y_keys))
+    if ((np.diff(y_keys[order]) == 0) & (np.diff(x0[order]) == 0)).any():
+        order = np.array(sorted(range(len(texts)), key=lambda i: (y_keys[i], x0[i], texts[i])))
+    y_keys = y_keys[order]
+    texts = list(map(texts.__getitem__, order.tolist()))
+    cells, n = None, 0
+    if bands is not None:
+        x1 = np.fromiter(map(itemgetter("x1"), words), dtype=float, count=len(words))
+        cells = (np.searchsorted(bands, (x0[order] + x1[order]) / 2, side="left") - 1).tolist()
+        n = len(bands) - 1
+
+    # 📏 Line boundaries wherever the rounded top changes
+    line_starts = np.flatnonzero(np.diff(y_keys, prepend=np.nan) != 0)
+    line_ends = np.append(line_starts[1:], len(texts))
+
+    # ✅ Keep lines whose first token is a line number like "98" or "98.01"
+    amounts, line_numbers = classify_tokens(texts)
+    keep = line_numbers[line_starts]
+    if not keep.any():
+        return []
+
+    # 🔢 Everything from a line's first amount (after the line number) on is a value
+    is_start = np.zeros(len(texts), dtype=bool)
+    is_start[line_starts] = True
+    numbers_seen = np.cumsum(amounts & ~is_start)
+    in_values = numbers_seen - np.repeat(numbers_seen[line_starts], line_ends - line_starts) > 0
+    value_starts = line_ends - np.add.reduceat(in_values, line_starts, dtype=np.int64)
+
+    starts, splits, ends = line_starts.tolist(), value_starts.tolist(), line_ends.tolist()
+    columns = None
+    if cells is not None:
+        numeric = numeric_tokens(texts)
+        columns = Columns(cells, numeric, text_bands(cells, numeric, n, starts, ends, keep.tolist()), n)
+        splits = [banded_split(columns, start + 1, end) for start, end in zip(starts, ends)]
+    if keep.all():
+        return [line_row(texts, columns, start, split, end) for start, split, end in zip(starts, splits, ends)]
+    # 🧵 Lines without a line number may continue a row
+    return stitched_rows(texts, x0[order].tolist(), columns, y_keys[line_starts].tolist(), keep.tolist(),
+                         starts, splits, ends)
+
+# 📊 A page's banding: each token's cell (-1 left of the bands, n right of them), which
+# tokens are amounts, and which bands are text columns (an "Explanation") not amounts
+Columns = namedtuple("Columns", "cells numeric text n")
+
+# 🔢 Amounts as a column holds them: signed ("-1,009,905", "(1,234)") or badly grouped
+def numeric_tokens(texts):
+    _, _, kinds = parse_amounts(texts)
+    return ((kinds == INTEGER) | (kinds == DECIMAL) | (kinds == MALFORMED)).tolist()
+
+# 🏷 A band is a text column when, on numbered lines, it holds more words that follow an
+# amount than amounts. Words before a line's first amount are description running long
+def text_bands(cells, numeric, n, starts, ends, keep):
+    counts = [[0, 0] for _ in range(n)]
+    for start, end, kept in zip(starts, ends, keep):
+        after_amount = False
+        for k in range(start + 1, end if kept else start):
+            if 0 <= cells[k] < n and (numeric[k] or after_amount):
+                counts[cells[k]][numeric[k]] += 1
+            after_amount = after_amount or (numeric[k] and cells[k] >= 0)
+    return [text > amounts for text, amounts in counts]
+
+# ✂️ Where a banded line's values start: its first amount in a band, or its first word
+# in a text band or right of the bands
+def banded_split(columns, start, end):
+    for k in range(start, end):
+        cell = columns.cells[k]
+        if cell >= columns.n or (cell >= 0 and (columns.numeric[k] or columns.text[cell])):
+            return k
+    return end
+
+def line_row(texts, columns, start, split, end):
+    if columns is None:
+        return [texts[start], " ".join(texts[start + 1:split])] + texts[split:end]
+    return banded_row(texts, columns, start, split, end)
+
+def banded_row(texts, columns, start, split, end):
+    description, values, trailing = banded_cells(texts, columns, split, end)
+    return [texts[start], " ".join(texts[start + 1:split] + description)] + values + trailing
+
+# (description words left of the bands, values per band, words right of the bands).
+# Text right of the bands is one column: the last band's when that band is text
+def banded_cells(texts, columns, split, end):
+    cells, n = columns.cells, columns.n
+    description, values, trailing, text = [], [None] * n, [], []
+    for k in range(split, end):
+        cell = cells[k]
+        if cell < 0:
+            description.append(texts[k])
+        elif cell >= n:
+            (trailing if columns.numeric[k] else text).append(texts[k])
+        else:
+            values[cell] = texts[k] if values[cell] is None else f"{values[cell]} {texts[k]}"
+    if text and columns.text[-1]:
+        values[-1] = " ".join(([values[-1]] if values[-1] is not None else []) + text)
+    elif text:
+        trailing.append(" ".join(text))
+    return description, values, trailing
+
+# 🧵 Wrapped descriptions and rows that continue across a page break. A line without
+# a line number continues the row above it when it sits one line pitch below (no
+# blank line between) and starts right of that row's description. Section headings
+# ("Deductions", "Routine Ambulatory Care Services") start at the description column
+# after a blank line, so they stay out. Such lines opening the page, right above its
+# first numbered row, continue the previous page's last row: they come back as a
+# leading Continuation, for label_table to fold in with continue_row.
+def stitched_rows(texts, xs, columns, tops, keep, starts, splits, ends):
+    # Line pitch: the closest spacing of two lines (a blank line is twice that)
+    pitch = min((b - a for a, b in zip(tops, tops[1:]) if b - a > 1), default=0.0)
+    description_xs = sorted(xs[start + 1] for start, split, kept in zip(starts, splits, keep)
+                            if kept and start + 1 < split)
+    page_x = description_xs[len(description_xs) // 2] if description_xs else None
+
+    def adjacent(k):
+        return k > 0 and tops[k] - tops[k - 1] <= 1.5 * pitch
+
+    def indented(k, description_x):
+        return description_x is not None and xs[starts[k]] > description_x + 1
+
+    # Unbanded values have no columns; text at or right of the row's first value is a value
+    def fragment(k, value_x=None):
+        start, end = starts[k], ends[k]
+        if columns is not None:
+            split = banded_split(columns, start, end)
+            description, values, trailing = banded_cells(texts, columns, split, end)
+            return ["", " ".join(texts[start:split] + description)] + values + trailing
+        split = next((j for j in range(start, end) if amount_re.match(texts[j]) or
+                      (value_x is not None and xs[j] >= value_x - 1)), end)
+        return ["", " ".join(texts[start:split])] + texts[split:end]
+
+    rows = []
+    description_x = value_x = None
+    first = keep.index(True)
+    for k in range(first, len(starts)):
+        if keep[k]:
+            rows.append(line_row(texts, columns, starts[k], splits[k], ends[k]))
+            # A row without a description (a line of column numbers, a blank line) doesn't wrap
+            description_x = xs[starts[k] + 1] if starts[k] + 1 < splits[k] else None
+            value_x = xs[splits[k]] if splits[k] < ends[k] else None
+        elif description_x is not None and adjacent(k) and indented(k, description_x):
+            rows[-1] = continue_row(rows[-1], fragment(k, value_x), columns is not None)
+        else:
+            description_x = None
+
+    # ⬆️ Lines opening the page: walking up from the first row past its section
+    # headings, indented lines continue the previous page's last row when a blank line
+    # or the page top is above them (column headings, "Line / No.", stop the walk)
+    k = first - 1
+    while k >= 0 and adjacent(k + 1) and page_x is not None and abs(xs[starts[k]] - page_x) <= 1:
+        k -= 1
+    leading = []
+    while k >= 0 and adjacent(k + 1) and indented(k, page_x):
+        leading.insert(0, k)
+        k -= 1
+    if leading and (k < 0 or not adjacent(k + 1)):
+        carried = fragment(leading[0])
+        for k in leading[1:]:
+            carried = continue_row(carried, fragment(k), columns is not None)
+        rows.insert(0, Continuation(carried, columns is not None))
+    return rows
+
+# ↪️ The rows opening a page that continue the previous page's last row: a row with an
+# empty line number that records whether its values sit in column bands
+class Continuation(list):
+    def __init__(self, row, banded):
+        super().__init__(row)
+        self.banded = banded
+
+# 🔗 Fold a continuation into the row it continues: description text is appended;
+# banded values fill their cells (joining text already there), token-order values
+# follow the row's last token
+def continue_row(row, fragment, banded):
+    values = fragment[2:]
+    merged = [row[0], " ".join(part for part in (row[1], fragment[1]) if part)] + list(row[2:])
+    if not banded:
+        return merged + [value for value in values if value]
+    for k, value in enumerate(values, 2):
+        if value is None:
+            continue
+        if k >= len(merged):
+            merged.append(value)
+        else:
+            merged[k] = value if merged[k] is None else f"{merged[k]} {value}"
+    return merged
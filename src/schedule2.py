@@ -1,19 +1,13 @@
-import pdfplumber
-import pandas as pd
 import os
-import re
-from pathlib import Path
-from collections import defaultdict
-
-# Set working directory
-project_root = Path.cwd()
-os.chdir(project_root)
-print(f"📁 Working in: {os.getcwd()}")
+import sys
+import schedule_engine
 
 # File paths
 input_pdf_path = os.path.join("reports", "Hospital Cost Reports.pdf")
 output_csv_path = os.path.join("data", "schedule_ii_merged.csv")
-os.makedirs(os.path.dirname(output_csv_path), exist_ok=True)
+
+# Word source for every page of this schedule (see word_sources.py)
+word_backend = "pdfium"
 
 # Define column groups by page ranges
 column_groups = {
@@ -35,58 +29,8 @@ column_groups = {
     ]
 }
 
-# Master dict to collect all merged values by (line no, cost center)
-merged_data = defaultdict(dict)
-
-def extract_rows_from_page(page, headers, page_num):
-    words = page.extract_words(use_text_flow=True)
-    lines_by_y = defaultdict(list)
-    for word in words:
-        y_key = round(word["top"], 1)
-        lines_by_y[y_key].append((word["x0"], word["text"]))
-
-    rows = []
-    for y, line_words in sorted(lines_by_y.items()):
-        sorted_line = [text for x, text in sorted(line_words)]
-        if not sorted_line:
-            continue
-
-        # Must start with a line number
-        if sorted_line[0].replace(".", "", 1).isdigit():
-            line_no = sorted_line[0]
-
-            # Parse description and values
-            description_words = []
-            rest_values = []
-            for token in sorted_line[1:]:
-                if re.match(r"^\d[\d,]*\.?\d*$", token):  # looks like a number
-                    rest_values.append(token)
-                elif not rest_values:
-                    description_words.append(token)
-                else:
-                    rest_values.append(token)
-
-            cost_center = " ".join(description_words)
-            row = [page_num, line_no, cost_center] + rest_values
-            rows.append(row)
-    return rows
-
-# Process each page group
-for (start_page, end_page), headers in column_groups.items():
-    for i in range(start_page, end_page + 1):
-        with pdfplumber.open(input_pdf_path) as pdf:
-            page = pdf.pages[i]
-            page_num = i + 1
-            rows = extract_rows_from_page(page, headers, page_num)
-
-            for row in rows:
-                line_no = row[1].strip()
-                cost_center = row[2].strip()
-                values = row[3:]
-
-                key = (line_no, cost_center)
-                data_dict = dict(zip(headers[2:], values))  # skip line no + description
-                merged_data[key].update(data_dict)
+# 🧭 First column number printed under each group's title, e.g. "(8) (9) ... (13)"
+column_group_starts = {(3, 6): 2, (7, 10): 8, (11, 14): 14}
 
 # Define full final column structure
 full_columns = [
@@ -100,17 +44,42 @@ full_columns = [
     "Number of Units", "Unit of measure"
 ]
 
-# Assemble final data
-all_keys = sorted(merged_data.keys(), key=lambda x: float(x[0]) if x[0].replace(".", "", 1).isdigit() else x[0])
-final_data = []
-for key in all_keys:
-    line_no, cost_center = key
-    row_dict = {"Line No.": line_no, "Cost Center Description": cost_center}
-    row_dict.update(merged_data[key])
-    final_data.append([row_dict.get(col, "") for col in full_columns])
+# Each column group is located by its column numbers in Schedule II; all groups fold into one row per line
+spec = {
+    "key_columns": ["Line No.", "Cost Center Description"],
+    "header": "fixed",
+    "tables": {
+        group: {
+            "pages": list(range(group[0], group[1] + 1)),
+            "locate": ([f"II:{column_group_starts[group]}"], None),
+            "columns": headers,
+        }
+        for group, headers in column_groups.items()
+    },
+    "outputs": [
+        {"file": os.path.basename(output_csv_path), "table": "Schedule II", "labels": list(column_groups),
+         "join": ["Line No.", "Cost Center Description"], "merge": "update", "columns": full_columns},
+    ],
+}
+
+# Pages handled by each column group, keyed like column_groups
+def pages_by_label():
+    return schedule_engine.pages_by_label(spec)
+
+# CSV files written by write_outputs
+def output_names():
+    return schedule_engine.output_names(spec)
+
+# Extract the rows of one page belonging to a column group
+def extract_page(page, group):
+    return schedule_engine.extract_page(spec, page, group)
+
+# Merge per-page results {group: {page index: (headers, rows)}} and write the CSV
+def write_outputs(page_results, output_folder):
+    schedule_engine.write_outputs(spec, page_results, output_folder)
 
-# Export to CSV
-df = pd.DataFrame(final_data, columns=full_columns)
-df.to_csv(output_csv_path, index=False)
+def main():
+    schedule_engine.main(sys.modules[__name__], input_pdf_path, os.path.dirname(output_csv_path))
 
-print(f"\n✅ Schedule II fully extracted and aligned. Saved to: {output_csv_path}")
+if __name__ == "__main__":
+    main()
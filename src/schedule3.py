@@ -1,19 +1,13 @@
-import pdfplumber
-import pandas as pd
 import os
-import re
-from pathlib import Path
-from collections import defaultdict
-
-# 📁 Set project root and change working directory
-project_root = Path.cwd()  # or use Path("D:/RA_tamanna/scrapping") if needed
-os.chdir(project_root)
-print(f"📁 Working in: {os.getcwd()}")
+import sys
+import schedule_engine
 
 # 📄 PDF and output paths
 input_pdf_path = os.path.join("reports", "Hospital Cost Reports.pdf")
 output_folder = os.path.join("data")
-os.makedirs(output_folder, exist_ok=True)
+
+# Word source for every page of this schedule (see word_sources.py)
+word_backend = "pdfium"
 
 # 📊 Define schedules and their page ranges (0-based index)
 schedule_pages = {
@@ -22,85 +16,39 @@ schedule_pages = {
     "Schedule IIIB": [19]                  # page 20
 }
 
-# 🔍 Try to detect column headers at top of page
-def detect_column_headers(page):
-    words = page.extract_words()
-    header_lines = defaultdict(list)
-
-    for word in words:
-        if word["top"] < 150:  # top section of page
-            y = round(word["top"], 1)
-            header_lines[y].append((word["x0"], word["text"]))
-
-    sorted_lines = []
-    for y in sorted(header_lines.keys()):
-        line = " ".join(text for _, text in sorted(header_lines[y]))
-        sorted_lines.append(line)
-
-    return sorted_lines
-
-# 🧾 Extract data rows using position and numeric heuristics
-def extract_rows(page, headers):
-    words = page.extract_words(use_text_flow=True)
-    lines_by_y = defaultdict(list)
-
-    for word in words:
-        y_key = round(word["top"], 1)
-        lines_by_y[y_key].append((word["x0"], word["text"]))
-
-    rows = []
-    for y, line_words in sorted(lines_by_y.items()):
-        sorted_line = [text for x, text in sorted(line_words)]
-        if not sorted_line:
-            continue
-
-        # Row starts with numeric line number
-        if sorted_line[0].replace(".", "", 1).isdigit():
-            line_no = sorted_line[0]
-            description_words = []
-            rest_values = []
-
-            for token in sorted_line[1:]:
-                if re.match(r"^\d[\d,]*\.?\d*$", token):
-                    rest_values.append(token)
-                elif not rest_values:
-                    description_words.append(token)
-                else:
-                    rest_values.append(token)
-
-            description = " ".join(description_words)
-            row = [line_no, description] + rest_values
-            rows.append(row)
-    return rows
+# 🧭 Each schedule is located by its own title; one CSV per schedule
+spec = {
+    "key_columns": ["Line No.", "Cost Center Description"],
+    "header": "longest_line",
+    "tables": {
+        name: {"pages": pages, "locate": ([name.split()[-1]], None)}
+        for name, pages in schedule_pages.items()
+    },
+    "outputs": [
+        {"file": f"{name.lower().replace(' ', '_')}.csv", "table": name, "labels": [name], "join": None,
+         "pad": "Column_{n}"}
+        for name in schedule_pages
+    ],
+}
 
-# 🔁 Process each schedule
-for schedule_name, page_indices in schedule_pages.items():
-    extracted_rows = []
-    headers = []
+# 🗂 Pages handled by each schedule
+def pages_by_label():
+    return schedule_engine.pages_by_label(spec)
 
-    with pdfplumber.open(input_pdf_path) as pdf:
-        for i in page_indices:
-            page = pdf.pages[i]
-            page_num = i + 1
-            header_lines = detect_column_headers(page)
+# 💾 CSV files written by write_outputs
+def output_names():
+    return schedule_engine.output_names(spec)
 
-            # Use the longest line near top as header
-            if header_lines:
-                headers = max(header_lines, key=lambda l: len(l.split()))
-                headers = ["Line No.", "Cost Center Description"] + headers.split()[2:]
+# 📄 Detect headers and extract rows from a single page
+def extract_page(page, schedule_name):
+    return schedule_engine.extract_page(spec, page, schedule_name)
 
-            rows = extract_rows(page, headers)
-            extracted_rows.extend(rows)
+# 💾 Save each schedule from per-page results {schedule: {page index: (headers, rows)}}
+def write_outputs(page_results, output_folder):
+    schedule_engine.write_outputs(spec, page_results, output_folder)
 
-    # Save to CSV
-    if extracted_rows and headers:
-        max_len = max(len(row) for row in extracted_rows)
-        while len(headers) < max_len:
-            headers.append(f"Column_{len(headers)+1}")
+def main():
+    schedule_engine.main(sys.modules[__name__], input_pdf_path, output_folder)
 
-        df = pd.DataFrame(extracted_rows, columns=headers[:max_len])
-        csv_path = os.path.join(output_folder, f"{schedule_name.lower().replace(' ', '_')}.csv")
-        df.to_csv(csv_path, index=False)
-        print(f"✅ {schedule_name} extracted and saved to: {csv_path}")
-    else:
-        print(f"⚠️ No data extracted for {schedule_name}.")
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,13 @@
-import pdfplumber
-import pandas as pd
 import os
-import re
-from pathlib import Path
-from collections import defaultdict
-
-# Setup
-project_root =  Path(__file__).resolve().parents[1]
-os.chdir(project_root)
-print(f"Working in: {os.getcwd()}")
+import sys
+import schedule_engine
 
 # Paths
 input_pdf_path = os.path.join("reports", "Hospital Cost Reports.pdf")
 output_folder = os.path.join("data")
-os.makedirs(output_folder, exist_ok=True)
+
+# Word source for every page of this schedule (see word_sources.py)
+word_backend = "pdfium"
 
 # 🗂 Define page ranges per division (0-based page index)
 schedule_iv_pages = {
@@ -24,84 +18,48 @@ schedule_iv_pages = {
     "IV-E": [24],         # page 25
 }
 
-# Detect headers at top of page
-def detect_column_headers(page):
-    words = page.extract_words()
-    header_lines = defaultdict(list)
-
-    for word in words:
-        if word["top"] < 150:  # near top of page
-            y = round(word["top"], 1)
-            header_lines[y].append((word["x0"], word["text"]))
-
-    sorted_lines = []
-    for y in sorted(header_lines.keys()):
-        line = " ".join(text for _, text in sorted(header_lines[y]))
-        sorted_lines.append(line)
-
-    return sorted_lines
-
-# Extract rows from body
-def extract_rows(page, headers):
-    words = page.extract_words(use_text_flow=True)
-    lines_by_y = defaultdict(list)
-
-    for word in words:
-        y_key = round(word["top"], 1)
-        lines_by_y[y_key].append((word["x0"], word["text"]))
-
-    rows = []
-    for y, line_words in sorted(lines_by_y.items()):
-        sorted_line = [text for x, text in sorted(line_words)]
-        if not sorted_line:
-            continue
-
-        # Detect data row (starts with line number or number)
-        if sorted_line[0].replace(".", "", 1).isdigit():
-            line_no = sorted_line[0]
-            description_words = []
-            rest_values = []
-
-            for token in sorted_line[1:]:
-                if re.match(r"^\d[\d,]*\.?\d*$", token):
-                    rest_values.append(token)
-                elif not rest_values:
-                    description_words.append(token)
-                else:
-                    rest_values.append(token)
+# 🧭 Page offsets of each division within the located Schedule IV
+schedule_iv_offsets = {
+    "IV-A": [0, 1],
+    "IV-B": [2],
+    "IV-C": [3],
+    "IV-D": [3],
+    "IV-E": [4],
+}
 
-            description = " ".join(description_words)
-            row = [line_no, description] + rest_values
-            rows.append(row)
-    return rows
+# One CSV per division
+spec = {
+    "key_columns": ["Line No.", "Cost Center Description"],
+    "header": "longest_line",
+    "tables": {
+        division: {"pages": pages, "locate": (["IV"], schedule_iv_offsets[division])}
+        for division, pages in schedule_iv_pages.items()
+    },
+    "outputs": [
+        {"file": f"schedule_iv_{division.lower()}.csv", "table": f"Schedule IV - {division}", "labels": [division],
+         "join": None, "pad": "Column_{n}"}
+        for division in schedule_iv_pages
+    ],
+}
 
-# Process each division
-with pdfplumber.open(input_pdf_path) as pdf:
-    for division, page_indices in schedule_iv_pages.items():
-        extracted_rows = []
-        headers = []
+# Pages handled by each division
+def pages_by_label():
+    return schedule_engine.pages_by_label(spec)
 
-        for i in page_indices:
-            page = pdf.pages[i]
-            header_lines = detect_column_headers(page)
+# CSV files written by write_outputs
+def output_names():
+    return schedule_engine.output_names(spec)
 
-            # Pick the longest top line as headers
-            if header_lines:
-                headers = max(header_lines, key=lambda l: len(l.split()))
-                headers = ["Line No.", "Cost Center Description"] + headers.split()[2:]
+# Detect headers and extract rows from a single page
+def extract_page(page, division):
+    return schedule_engine.extract_page(spec, page, division)
 
-            rows = extract_rows(page, headers)
-            extracted_rows.extend(rows)
+# Save each division from per-page results {division: {page index: (headers, rows)}}
+def write_outputs(page_results, output_folder):
+    schedule_engine.write_outputs(spec, page_results, output_folder)
 
-        # Save to CSV
-        if extracted_rows and headers:
-            max_len = max(len(row) for row in extracted_rows)
-            while len(headers) < max_len:
-                headers.append(f"Column_{len(headers)+1}")
+def main():
+    schedule_engine.main(sys.modules[__name__], input_pdf_path, output_folder)
 
-            df = pd.DataFrame(extracted_rows, columns=headers[:max_len])
-            csv_path = os.path.join(output_folder, f"schedule_iv_{division.lower()}.csv")
-            df.to_csv(csv_path, index=False)
-            print(f"✅ Schedule IV - {division} extracted and saved to: {csv_path}")
-        else:
-            print(f"⚠️ No data extracted for Schedule IV - {division}")
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,13 @@
-import pdfplumber
-import pandas as pd
 import os
-import re
-from pathlib import Path
-from collections import defaultdict
+import sys
+import schedule_engine
 
-# Set working directory
-project_root = Path(__file__).resolve().parents[1]
-os.chdir(project_root)
-print(f"📁 Working in: {os.getcwd()}")
-
-# File paths
+# 📄 Paths
 input_pdf_path = os.path.join("reports", "Hospital Cost Reports.pdf")
 output_folder = os.path.join("data")
-os.makedirs(output_folder, exist_ok=True)
+
+# Word source for every page of this schedule (see word_sources.py)
+word_backend = "pdfium"
 
 # Page mapping (0-indexed)
 schedule_vii_map = {
@@ -28,102 +22,54 @@ schedule_viia_pages = {
     "viia_part3": 54   # Page 55
 }
 
-# Detect header lines
-def detect_column_headers(page):
-    words = page.extract_words()
-    header_lines = defaultdict(list)
-    for word in words:
-        if word["top"] < 150:
-            y = round(word["top"], 1)
-            header_lines[y].append((word["x0"], word["text"]))
-    sorted_lines = []
-    for y in sorted(header_lines.keys()):
-        line = " ".join(text for _, text in sorted(header_lines[y]))
-        sorted_lines.append(line)
-    return sorted_lines
+# 🧭 Located schedule and page offsets for each label; the VII-A parts are located
+# by the first column number under their title. This filing has no VII-D
+# title; the page read as schedule_viid is Schedule VIII, used when VIID is absent.
+schedule_vii_layout = {
+    "schedule_vii": (["VII"], None),
+    "schedule_viib": (["VIIB"], None),
+    "schedule_viic": (["VIIC"], None),
+    "schedule_viid": (["VIID", "VIII"], [0]),
+    "viia_part1": (["VIIA:2"], None),
+    "viia_part2": (["VIIA:8"], None),
+    "viia_part3": (["VIIA:14"], None),
+}
 
-# Extract rows
-def extract_rows(page, key_column="Description"):
-    words = page.extract_words(use_text_flow=True)
-    lines_by_y = defaultdict(list)
-    for word in words:
-        y_key = round(word["top"], 1)
-        lines_by_y[y_key].append((word["x0"], word["text"]))
+# VII, VII-B/C/D get one CSV each; the VII-A parts merge side by side on Description
+spec = {
+    "key_columns": ["Line No.", "Description"],
+    "header": "longest_line",
+    "tables": {
+        **{label: {"pages": pages, "locate": schedule_vii_layout[label]} for label, pages in schedule_vii_map.items()},
+        **{part: {"pages": [i], "locate": schedule_vii_layout[part]} for part, i in schedule_viia_pages.items()},
+    },
+    "outputs": [
+        *({"file": f"{label}.csv", "table": label, "labels": [label], "join": None, "pad": "{label}_col{n}"}
+          for label in schedule_vii_map),
+        {"file": "schedule_viia_merged.csv", "table": "schedule_viia", "labels": list(schedule_viia_pages),
+         "join": ["Description"], "drop": ["Line No."], "default_headers": ["Line No.", "Description"],
+         "pad": "{label}_col{n}"},
+    ],
+}
 
-    rows = []
-    for y, line_words in sorted(lines_by_y.items()):
-        sorted_line = [text for x, text in sorted(line_words)]
-        if not sorted_line:
-            continue
-        if sorted_line[0].replace(".", "", 1).isdigit():
-            line_no = sorted_line[0]
-            desc_words = []
-            rest = []
-            for token in sorted_line[1:]:
-                if re.match(r"^\d[\d,]*\.?\d*$", token):
-                    rest.append(token)
-                elif not rest:
-                    desc_words.append(token)
-                else:
-                    rest.append(token)
-            description = " ".join(desc_words)
-            row = [line_no, description] + rest
-            rows.append(row)
-    return rows
+# Pages handled by each label, including the VII-A parts
+def pages_by_label():
+    return schedule_engine.pages_by_label(spec)
 
-# 📥 Process Schedule VII + VII-B, VII-C, VII-D
-with pdfplumber.open(input_pdf_path) as pdf:
-    for label, pages in schedule_vii_map.items():
-        rows = []
-        headers = []
-        for page_num in pages:
-            page = pdf.pages[page_num]
-            header_lines = detect_column_headers(page)
-            if header_lines:
-                col_line = max(header_lines, key=lambda l: len(l.split()))
-                headers = ["Line No.", "Description"] + col_line.split()[2:]
-            rows.extend(extract_rows(page))
+# CSV files written by write_outputs
+def output_names():
+    return schedule_engine.output_names(spec)
 
-        if rows:
-            max_len = max(len(row) for row in rows)
-            while len(headers) < max_len:
-                headers.append(f"{label}_col{len(headers)+1}")
-            df = pd.DataFrame(rows, columns=headers[:max_len])
-            df.to_csv(os.path.join(output_folder, f"{label}.csv"), index=False)
-            print(f"✅ Saved {label}.csv")
-        else:
-            print(f"⚠️ No data extracted for {label}")
+# Detect headers and extract rows from a single page
+def extract_page(page, label):
+    return schedule_engine.extract_page(spec, page, label)
 
-    # 📦 Process Schedule VII-A (pages 53–55) — merge by Description
-    vii_a_parts = []
-    for part_name, page_index in schedule_viia_pages.items():
-        page = pdf.pages[page_index]
-        header_lines = detect_column_headers(page)
-        if header_lines:
-            col_line = max(header_lines, key=lambda l: len(l.split()))
-            headers = ["Line No.", "Description"] + col_line.split()[2:]
-        else:
-            headers = ["Line No.", "Description"]
+# Save VII/VII-B/C/D and merge VII-A from per-page results {label: {page index: (headers, rows)}}
+def write_outputs(page_results, output_folder):
+    schedule_engine.write_outputs(spec, page_results, output_folder)
 
-        rows = extract_rows(page)
-        if rows:
-            max_len = max(len(row) for row in rows)
-            while len(headers) < max_len:
-                headers.append(f"{part_name}_col{len(headers)+1}")
-            df = pd.DataFrame(rows, columns=headers[:max_len])
-            df = df.drop(columns=["Line No."], errors='ignore')
-            df = df.drop_duplicates(subset=["Description"])
-            df.set_index("Description", inplace=True)
-            vii_a_parts.append(df)
-            print(f"✅ Extracted {part_name} with {df.shape[1]} columns")
-        else:
-            print(f"⚠️ No data in {part_name}")
+def main():
+    schedule_engine.main(sys.modules[__name__], input_pdf_path, output_folder)
 
-    # 🔗 Merge VII-A parts side by side on Description
-    if vii_a_parts:
-        merged_viia = pd.concat(vii_a_parts, axis=1)
-        merged_viia.reset_index(inplace=True)
-        merged_viia.to_csv(os.path.join(output_folder, "schedule_viia_merged.csv"), index=False)
-        print("✅ Merged and saved: schedule_viia_merged.csv")
-    else:
-        print("❌ No VII-A data to merge")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+import os
+import re
+import bisect
+import hashlib
+from pathlib import Path
+from collections import defaultdict
+from lazy_imports import lazy_import
+
+import page_locator
+import joins
+import metrics
+import word_sources
+import regions
+from regions import page_regions, column_bands
+from row_builder import build_rows, continue_row, Continuation
+import outputs
+from outputs import save_table
+import pdf_input
+import store
+
+pd = lazy_import("pandas")
+
+# ⚙️ Schedule spec engine. Each scheduleN.py declares one spec dict:
+#
+#   key_columns  identifier columns leading every row, e.g. ["Line No.", "Description"]
+#   header       "longest_line": the form's heading words over each value column
+#                (the longest heading line, after the key columns, on forms
+#                without a column-number line)
+#                "fixed": each table's own "columns" list
+#   tables       label -> {"pages": default 0-based pages,
+#                          "locate": (schedule numerals, page offsets or None),
+#                          "columns": fixed header (header "fixed" only)}
+#   outputs      list of {"file", "table", "labels", "join", ...}:
+#                join None        one label's pages concatenated, short headers padded
+#                                 with "pad" ("Column_{n}", "{label}_col{n}")
+#                join [columns]   labels side by side on those columns, after dropping
+#                                 "drop" columns (labels without headers get
+#                                 "default_headers"); "merge": "update" instead folds every
+#                                 label's values into one row per key under "columns"
+#
+# compile_plan() turns every spec into one page -> [(module, label)] plan, and
+# run_page() parses each page once for all of the labels that read it.
+
+# 🔍 Header-band lines, words grouped by rounded top and ordered by x0
+def header_lines_of(words):
+    header_lines = defaultdict(list)
+    for word in words:
+        if word["top"] < page_locator.top_band:
+            y = round(word["top"], 1)
+            header_lines[y].append((word["x0"], word["text"]))
+    return [" ".join(text for _, text in sorted(header_lines[y])) for y in sorted(header_lines)]
+
+# 🧾 The form's heading block: header-band lines below the "SCHEDULE ..." title (on
+# untitled continuation pages, below the "PERIOD FROM ..." stamp) and above the first
+# numbered row with a description (a line of bare column numbers, "2 3 4 5", is
+# heading). The provider/period stamp changes with every page and report, so it
+# never names columns.
+heading_starts = {"PERIOD", "SCHEDULE"}
+
+def heading_block(words):
+    lines = defaultdict(list)
+    for word in words:
+        if word["top"] < page_locator.top_band:
+            lines[round(word["top"], 1)].append(word)
+    block, title_top = [], None
+    for y in sorted(lines):
+        line = sorted(lines[y], key=lambda w: (w["x0"], w["text"]))
+        if line[0]["text"] in heading_starts:
+            block, title_top = [], y
+        elif title_top is not None:
+            if line[0]["text"].replace(".", "", 1).isdigit() and \
+                    any(not w["text"][:1].isdigit() for w in line[1:]):
+                break
+            block.append(line)
+    return title_top, block
+
+# 🔑 Same form heading -> same fingerprint, on any page of any report: word text
+# plus position relative to the line the block starts under
+def heading_fingerprint(title_top, block):
+    layout = [(w["text"], round(w["x0"]), round(w["top"] - title_top)) for line in block for w in line]
+    return hashlib.sha1(repr(layout).encode()).hexdigest()[:16]
+
+# 🔢 The heading's column-number line, "(2) (3) (4)" or "2 3 4": each number sits
+# over its column. Lines above it (form questions, section titles) aren't labels.
+column_number_re = re.compile(r"^\(?\d+\)?$")
+
+def column_numbers(block):
+    for k, line in enumerate(block):
+        if len(line) >= 2 and all(column_number_re.match(w["text"]) for w in line):
+            return line, block[k + 1:]
+    return None, block
+
+# 🏷 One label per value column: the heading words whose centres fall in the column's
+# band, read top to bottom. Bands are the page's column bands when it has a marker
+# line (so labels line up with banded cells, minus a marker over the description),
+# else edges around the column numbers. A column with no words keeps its number;
+# rules ("-------") aren't words. Without a column-number line, the longest heading
+# line after the key columns stands in.
+def column_labels(block, edges, key_count):
+    numbers, lines = column_numbers(block)
+    if numbers is None:
+        line = max(block, key=len)
+        return [w["text"] for w in line[key_count:]]
+    edges = edges or regions.band_edges(numbers)
+    numbers = numbers[len(numbers) - (len(edges) - 1):]
+    labels = [[] for _ in numbers]
+    for line in lines:
+        for word in line:
+            if not word["text"].strip("-"):
+                continue
+            k = bisect.bisect_right(edges, (word["x0"] + word["x1"]) / 2) - 1
+            if 0 <= k < len(labels):
+                labels[k].append(word["text"])
+    return [" ".join(words) or number["text"] for words, number in zip(labels, numbers)]
+
+# 🗂 Column labels of a page's heading block, memoized in regions.headings (persisted
+# with the word cache) by heading fingerprint and bands, so repeat pages and repeat
+# reports of a form skip the word-to-column alignment
+def heading_labels(words, edges=None, key_count=0):
+    title_top, block = heading_block(words)
+    if not block:
+        return []
+    key = f"{heading_fingerprint(title_top, block)}:{key_count}:{edges and [round(x, 1) for x in edges]}"
+    labels = regions.headings.get(key)
+    if labels is None:
+        labels = column_labels(block, edges, key_count)
+        regions.headings.put(key, labels)
+    return list(labels)
+
+def detect_column_headers(page, key_count=0):
+    header, words = page_regions(page)
+    return heading_labels(header, column_bands(page, header, words), key_count)
+
+def extract_rows(page):
+    header, words = page_regions(page)
+    return build_rows(words, column_bands(page, header, words))
+
+# 📄 Heading (header words and column bands, when any reader wants them) and rows of
+# one page, with a "page" metrics event splitting word extraction from row parsing
+def parse_page(page, schedules, with_headers=True):
+    stopwatch = metrics.Stopwatch()
+    with stopwatch("extract_words"):
+        # Header words are read even for fixed headers: they carry the column markers.
+        # Both come from one text-flow extraction of the page
+        header, words = page_regions(page)
+    with stopwatch("parse_rows"):
+        edges = column_bands(page, header, words)
+        rows = build_rows(words, edges)
+
+    seconds = stopwatch.rounded()
+    metrics.emit("page", report=outputs.report_id, page=page.page_number - 1, schedules=schedules,
+                 backend=word_sources.backend_for(page), words=len(words), header_words=len(header),
+                 rows=len(rows), seconds={**seconds, "total": round(sum(stopwatch.seconds.values()), 6)})
+    return ((header, edges) if with_headers else None), rows
+
+# 🏷 Key columns, then one label per value column from the page's heading
+def table_headers(spec, label, heading):
+    if spec["header"] == "fixed":
+        return list(spec["tables"][label]["columns"])
+    if not heading:
+        return []
+    labels = heading_labels(*heading, len(spec["key_columns"]))
+    return list(spec["key_columns"]) + labels if labels else []
+
+# 🗂 Pages read by each label, from the locator index when one is in use
+def pages_by_label(spec):
+    layout = {label: table["locate"] for label, table in spec["tables"].items()}
+    default_pages = {label: table["pages"] for label, table in spec["tables"].items()}
+    return page_locator.pages(layout, default_pages)
+
+def output_names(spec):
+    return [output["file"] for output in spec["outputs"]]
+
+# 🧭 One execution plan for every schedule: page index -> [(module, label)]
+def compile_plan(modules):
+    plan = defaultdict(list)
+    for module in modules:
+        for label, pages in module.pages_by_label().items():
+            for i in pages:
+                plan[i].append((module, label))
+    return dict(sorted(plan.items()))
+
+# 📄 Parse one page once and shape (headers, rows) for each (module, label) reading it
+def run_page(page, targets):
+    with_headers = any(module.spec["header"] != "fixed" for module, _ in targets)
+    schedules = [f"{module.__name__}:{label}" for module, label in targets]
+    heading, rows = parse_page(page, schedules, with_headers)
+    return [(module, label, (table_headers(module.spec, label, heading), rows)) for module, label in targets]
+
+def extract_page(spec, page, label):
+    heading, rows = parse_page(page, [str(label)], spec["header"] != "fixed")
+    return table_headers(spec, label, heading), rows
+
+# 🧱 Rows of a label across its pages; headers carry over from the last page that had
+# them. Carried pages go to a "header" metrics event; a header that changes
+# mid-label is a warning, since its rows no longer line up with the first page's.
+# A page that opens mid-row (a leading row_builder.Continuation) continues the
+# previous page's last row; those pages go to a "stitch" metrics event.
+def label_table(page_results, label, pages):
+    headers, rows = [], []
+    carried, changed, stitched = [], [], []
+    for i in pages:
+        page_headers, page_rows = page_results[label][i]
+        if page_headers:
+            if headers and list(page_headers) != headers:
+                changed.append(i)
+                print(f"⚠️ {label}: header changes on page {i + 1}: {' | '.join(page_headers)}")
+            headers = list(page_headers)
+        elif page_rows:
+            carried.append(i)
+        if page_rows and isinstance(page_rows[0], Continuation):
+            if rows:
+                rows[-1] = continue_row(rows[-1], page_rows[0], page_rows[0].banded)
+                stitched.append(i)
+            page_rows = page_rows[1:]
+        rows.extend(page_rows)
+    if carried or changed:
+        metrics.emit("header", report=outputs.report_id, label=str(label), carried=carried, changed=changed)
+    if stitched:
+        metrics.emit("stitch", report=outputs.report_id, label=str(label), pages=stitched)
+    return headers, rows
+
+def padded_frame(headers, rows, pad, label):
+    max_len = max(len(row) for row in rows)
+    while len(headers) < max_len:
+        headers.append(pad.format(label=label, n=len(headers) + 1))
+    return pd.DataFrame(rows, columns=headers[:max_len])
+
+# 🔗 Join labels side by side on the output's key columns (first row per key wins)
+def joined_frame(output, page_results, label_pages):
+    parts = []
+    for label in output["labels"]:
+        headers, rows = label_table(page_results, label, label_pages[label])
+        headers = headers or list(output.get("default_headers", []))
+        if not (rows and headers):
+            print(f"⚠️ No data extracted for {label}")
+            continue
+        df = padded_frame(headers, rows, output["pad"], label)
+        df = df.drop(columns=output.get("drop", []), errors="ignore")
+        parts.append((label, df))
+        print(f"✅ Extracted {label} with {df.shape[1] - len(output['join'])} columns")
+    if not parts:
+        return None
+    df, issues = joins.join_side_by_side(parts, output["join"])
+    joins.report_issues(output["table"], issues)
+    return df
+
+# 🔗 Fold every label's values into one row per key under the fixed columns, ordered by line number
+def updated_frame(output, page_results, label_pages, spec):
+    parts = []
+    for label in output["labels"]:
+        headers = spec["tables"][label]["columns"]
+        _, rows = label_table(page_results, label, label_pages[label])
+        rows = [row[:len(headers)] + [None] * (len(headers) - len(row)) for row in rows]
+        parts.append((label, pd.DataFrame(rows, columns=headers)))
+    df, issues = joins.join_update(parts, output["join"], output["columns"])
+    joins.report_issues(output["table"], issues)
+    return df
+
+# 🧱 One output's table from per-page results {label: {page index: (headers, rows)}}, or None
+def output_frame(spec, output, page_results, label_pages):
+    if output["join"] is None:
+        label = output["labels"][0]
+        headers, rows = label_table(page_results, label, label_pages[label])
+        return padded_frame(headers, rows, output["pad"], label) if rows and headers else None
+    if output.get("merge") == "update":
+        return updated_frame(output, page_results, label_pages, spec)
+    return joined_frame(output, page_results, label_pages)
+
+# 💾 Write every output of a spec from per-page results {label: {page index: (headers, rows)}}
+def write_outputs(spec, page_results, output_folder):
+    label_pages = pages_by_label(spec)
+    for output in spec["outputs"]:
+        stopwatch = metrics.Stopwatch()
+        pages = [i for label in output["labels"] for i in label_pages[label]]
+        with stopwatch("merge"):
+            df = output_frame(spec, output, page_results, label_pages)
+
+        if df is None:
+            print(f"⚠️ No data extracted for {output['table']}")
+            metrics.emit("merge", report=outputs.report_id, table=output["table"], file=output["file"], rows=0,
+                         seconds=stopwatch.rounded())
+            continue
+        with stopwatch("validate"):
+            malformed = outputs.malformed_amounts(df)
+        report_malformed(output["table"], malformed)
+        with stopwatch("write"):
+            path = save_table(df, os.path.join(output_folder, output["file"]), output["table"], pages)
+        if store.store_path:
+            with stopwatch("store"):
+                store.save_table(df, output["file"])
+        metrics.emit("merge", report=outputs.report_id, table=output["table"], file=output["file"], rows=len(df),
+                     malformed=len(malformed), seconds=stopwatch.rounded())
+        print(f"✅ {output['table']} extracted and saved to: {path}")
+
+# 📣 One warning line per column holding malformed amounts, with a few examples
+def report_malformed(table, found, examples=3):
+    by_column = {}
+    for column, row, text in found:
+        by_column.setdefault(column, []).append((row, text))
+    for column, cells in by_column.items():
+        sample = ", ".join(f"row {row + 1} {text!r}" for row, text in cells[:examples])
+        more = f" (+{len(cells) - examples} more)" if len(cells) > examples else ""
+        print(f"⚠️ {table}: {len(cells)} malformed amount(s) in {column!r}: {sample}{more}")
+
+# 🌊 The concatenating output that holds a label, or None when the label is joined
+def concat_output(spec, label):
+    for output in spec["outputs"]:
+        if output["join"] is None and output["labels"] == [label]:
+            return output
+    return None
+
+# ▶️ Standalone run of one schedule module over the default report
+def main(module, input_pdf_path, output_folder):
+    project_root = Path(module.__file__).resolve().parents[1]
+    os.chdir(project_root)
+    print(f"📁 Working in: {os.getcwd()}")
+    os.makedirs(output_folder, exist_ok=True)
+
+    page_results = defaultdict(dict)
+    with pdf_input.open_pdf(input_pdf_path) as pdf:
+        for i, targets in compile_plan([module]).items():
+            for _, label, result in run_page(pdf.pages[i], targets):
+                page_results[label][i] = result
+            pdf.pages[i].close()
+
+    module.write_outputs(page_results, output_folder)
@@ -0,0 +1,397 @@
+import os
+import json
+import asyncio
+import hashlib
+import argparse
+import importlib
+import itertools
+import multiprocessing
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import driver
+import metrics
+import regions
+import word_cache
+import word_sources
+import page_locator
+import schedule_engine
+import pdf_input
+import page_guard
+
+# 🛰 Local extraction service over plain HTTP (asyncio, standard library only).
+#
+#   POST /jobs?schedules=schedule2,schedule4   body: the PDF bytes -> {"job": id, ...}
+#   GET  /jobs/<id>                             job status
+#   GET  /jobs/<id>/rows                        NDJSON, one line per table as soon as its
+#                                               schedule finishes, then a final status line
+#   GET  /health
+#
+# Jobs wait in an asyncio queue; the CPU-bound parsing runs in a process pool, one
+# task per schedule. Uploads are stored by content hash, so a repeated upload is
+# the same file, and each worker keeps its recently opened documents and their
+# page words warm for the next request on that report. Pages run under
+# driver.guarded_page, and a worker that dies takes down only the pool, which is
+# replaced.
+
+# 📁 Defaults (relative to project root)
+spool_folder = os.path.join("data", "service")
+upload_name = "report.pdf"
+
+max_upload = 200 * 1024 * 1024
+max_documents = 4   # open PDF handles kept per worker
+max_jobs = 100      # finished jobs kept for status and replay
+
+# ---------------------------------------------------------------------------
+# 🔧 Worker side: runs inside the process pool
+
+# 📂 Recently opened documents in this worker, least recently used first
+documents = OrderedDict()
+
+def warm_document(pdf_path):
+    if pdf_path in documents:
+        documents.move_to_end(pdf_path)
+        return documents[pdf_path]
+    pdf = pdf_input.open_pdf(pdf_path)
+    documents[pdf_path] = pdf
+    while len(documents) > max_documents:
+        _, evicted = documents.popitem(last=False)
+        evicted.close()
+    return pdf
+
+# 🧭 Page index for an upload, saved next to it so later jobs skip the scan
+def locate(pdf_path):
+    pdf = warm_document(pdf_path)
+    folder = os.path.dirname(pdf_path)
+    pdf_hash = word_cache.document_hash(pdf)
+    schedules = page_locator.load_index(folder, pdf_hash)
+    if schedules is None:
+        schedules = page_locator.build_index(pdf)
+        page_locator.save_index(schedules, folder, pdf_path, pdf_hash)
+    return schedules
+
+# 📄 Every output table of one schedule module, as plain JSON-ready dicts. Each table
+# lists the 1-based pages no attempt could extract under "lost_pages".
+def extract_schedule(pdf_path, module_name, index, cache_dir=None, backend=None, page_timeout=None):
+    module = importlib.import_module(module_name)
+    pdf = warm_document(pdf_path)
+    word_cache.cache.cache_dir = cache_dir
+    regions.configure(cache_dir)
+    page_locator.use_index(index)
+    page_guard.configure(page_timeout)
+    # The service only reads this call's page errors; keep the worker's registry from growing
+    metrics.reset()
+
+    plan = schedule_engine.compile_plan([module])
+    word_sources.assign_backends(list(plan.items()), backend)
+    page_results = defaultdict(dict)
+    for i, targets in plan.items():
+        page = pdf.pages[i]
+        for _, label, result in driver.guarded_page(page, i, targets):
+            page_results[label][i] = result
+        # Release the layout; the handle and the word cache stay warm
+        page.close()
+    lost = {event["page"] for event in page_guard.errors() if event["attempt"] != "primary"}
+
+    label_pages = module.pages_by_label()
+    tables = []
+    for output in module.spec["outputs"]:
+        df = schedule_engine.output_frame(module.spec, output, page_results, label_pages)
+        pages = [i + 1 for label in output["labels"] for i in label_pages[label]]
+        table = {"schedule": module_name, "table": output["table"], "file": output["file"], "pages": pages,
+                 "lost_pages": [i for i in pages if i - 1 in lost], "columns": [], "rows": []}
+        if df is not None:
+            table["columns"] = [str(column) for column in df.columns]
+            table["rows"] = df.astype(object).where(df.notna(), None).values.tolist()
+        tables.append(table)
+    return tables
+
+# ---------------------------------------------------------------------------
+# 🗂 Service side: queue, jobs and HTTP, all on the event loop
+
+class Job:
+    def __init__(self, job_id, pdf_path, schedules):
+        self.id = job_id
+        self.pdf_path = pdf_path
+        self.schedules = schedules
+        self.status = "queued"
+        self.tables = []
+        self.error = None
+        self.changed = asyncio.Condition()
+
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def summary(self):
+        return {"job": self.id, "status": self.status, "schedules": self.schedules, "error": self.error,
+                "tables": [{"schedule": t["schedule"], "table": t.get("table"), "rows": len(t.get("rows", [])),
+                            "lost_pages": t.get("lost_pages", []), "error": t.get("error")} for t in self.tables]}
+
+    async def publish(self, status=None, table=None, error=None):
+        async with self.changed:
+            if table is not None:
+                self.tables.append(table)
+            if status:
+                self.status = status
+            if error:
+                self.error = error
+            self.changed.notify_all()
+
+    # 🌊 Tables as they arrive (earlier ones replayed first), until the job finishes
+    async def follow(self):
+        seen = 0
+        while True:
+            async with self.changed:
+                await self.changed.wait_for(lambda: len(self.tables) > seen or self.finished())
+                new, done = self.tables[seen:], self.finished()
+                seen += len(new)
+            for table in new:
+                yield table
+            if done and seen == len(self.tables):
+                return
+
+class BadRequest(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ExtractionService:
+    def __init__(self, spool_dir=spool_folder, workers=1, runners=2, cache_dir=None, backend=None,
+                 page_timeout=page_guard.page_timeout):
+        self.spool_dir = spool_dir
+        self.workers = workers
+        self.runners = runners
+        self.cache_dir = cache_dir
+        self.backend = backend
+        self.page_timeout = page_timeout
+        self.schedule_names = [module.__name__ for module in driver.schedule_modules]
+        self.jobs = OrderedDict()
+        self.ids = itertools.count(1)
+        self.queue = None
+        self.pool = None
+        self.pool_restarts = 0
+        self.tasks = []
+
+    async def start(self):
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self.queue = asyncio.Queue()
+        self.pool = self.new_pool()
+        self.tasks = [asyncio.create_task(self.run_jobs()) for _ in range(self.runners)]
+
+    # Spawned, not forked: the pool starts lazily, and a worker forked while requests
+    # are open would hold their sockets, so closing a connection would never end it
+    def new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    # 💥 fn(*args) in the pool. A worker that dies (a crash in native code) breaks the
+    # whole pool: it is replaced, once for every call that saw it break, and the call
+    # is retried on the new pool. A second break is raised to the caller.
+    async def in_pool(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self.pool
+            try:
+                return await loop.run_in_executor(pool, fn, *args)
+            except BrokenProcessPool:
+                if self.pool is pool:
+                    self.pool = self.new_pool()
+                    self.pool_restarts += 1
+                    pool.shutdown(wait=False, cancel_futures=True)
+                if attempt:
+                    raise
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.pool.shutdown(cancel_futures=True)
+
+    # 📥 Store the upload under its content hash and queue a job for it
+    async def submit(self, pdf_bytes, schedules=None):
+        # A schedule named twice runs once
+        schedules = list(dict.fromkeys(schedules or self.schedule_names))
+        unknown = [name for name in schedules if name not in self.schedule_names]
+        if unknown:
+            raise BadRequest(HTTPStatus.BAD_REQUEST, f"Unknown schedules {unknown}, expected some of {self.schedule_names}")
+        if not pdf_bytes.startswith(b"%PDF"):
+            raise BadRequest(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, "Request body is not a PDF")
+
+        pdf_path = await asyncio.to_thread(self.store_upload, pdf_bytes)
+        job = Job(str(next(self.ids)), pdf_path, schedules)
+        self.jobs[job.id] = job
+        self.prune_jobs()
+        await self.queue.put(job)
+        return job
+
+    def store_upload(self, pdf_bytes):
+        folder = os.path.abspath(os.path.join(self.spool_dir, hashlib.sha256(pdf_bytes).hexdigest()))
+        pdf_path = os.path.join(folder, upload_name)
+        if not os.path.exists(pdf_path):
+            os.makedirs(folder, exist_ok=True)
+            tmp_path = f"{pdf_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(pdf_bytes)
+            os.replace(tmp_path, pdf_path)
+        return pdf_path
+
+    def prune_jobs(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished()]
+        for job_id in finished[:max(0, len(finished) - max_jobs)]:
+            del self.jobs[job_id]
+
+    # 🔁 Queue consumer; a job's schedules run side by side in the pool
+    async def run_jobs(self):
+        while True:
+            job = await self.queue.get()
+            try:
+                await self.run_job(job)
+            except Exception as exc:
+                await job.publish(status="failed", error=f"{type(exc).__name__}: {exc}")
+            finally:
+                self.queue.task_done()
+
+    async def run_job(self, job):
+        await job.publish(status="running")
+        index = await self.in_pool(locate, job.pdf_path)
+
+        # A failing schedule is reported in its own line; the others still stream
+        async def run_schedule(name):
+            try:
+                tables = await self.in_pool(extract_schedule, job.pdf_path, name, index, self.cache_dir,
+                                            self.backend, self.page_timeout)
+            except Exception as exc:
+                tables = [{"schedule": name, "error": f"{type(exc).__name__}: {exc}"}]
+            for table in tables:
+                await job.publish(table=table)
+
+        await asyncio.gather(*(run_schedule(name) for name in job.schedules))
+        await job.publish(status="done")
+
+    # 🌐 One request per connection
+    async def handle(self, reader, writer):
+        try:
+            try:
+                method, path, query, body = await read_request(reader)
+                await self.route(writer, method, path, query, body)
+            except BadRequest as exc:
+                await respond(writer, exc.status, {"error": str(exc)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def route(self, writer, method, path, query, body):
+        parts = [part for part in path.split("/") if part]
+        if method == "GET" and parts == ["health"]:
+            await respond(writer, HTTPStatus.OK, {"status": "ok", "queued": self.queue.qsize(), "jobs": len(self.jobs),
+                                                  "pool_restarts": self.pool_restarts})
+        elif method == "POST" and parts == ["jobs"]:
+            schedules = [name for value in query.get("schedules", []) for name in value.split(",") if name]
+            job = await self.submit(body, schedules)
+            await respond(writer, HTTPStatus.ACCEPTED, job.summary())
+        elif method == "GET" and len(parts) in (2, 3) and parts[0] == "jobs" and parts[2:] in ([], ["rows"]):
+            job = self.jobs.get(parts[1])
+            if job is None:
+                raise BadRequest(HTTPStatus.NOT_FOUND, f"No job {parts[1]!r}")
+            if len(parts) == 2:
+                await respond(writer, HTTPStatus.OK, job.summary())
+            else:
+                await stream_rows(writer, job)
+        else:
+            raise BadRequest(HTTPStatus.NOT_FOUND, f"No route for {method} {path}")
+
+# 📨 Request line, headers and body of one HTTP/1.1 request
+async def read_request(reader):
+    request_line = (await reader.readline()).decode("latin-1").split()
+    if len(request_line) != 3:
+        raise BadRequest(HTTPStatus.BAD_REQUEST, "Malformed request line")
+    method, target, _ = request_line
+
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1")
+        if line in ("\r\n", "\n", ""):
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise BadRequest(HTTPStatus.BAD_REQUEST, "Bad Content-Length") from None
+    if length > max_upload:
+        raise BadRequest(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Uploads are limited to {max_upload} bytes")
+    body = await reader.readexactly(length) if length else b""
+
+    url = urlsplit(target)
+    return method.upper(), url.path, parse_qs(url.query), body
+
+async def respond(writer, status, payload):
+    body = json.dumps(payload).encode()
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n")
+    writer.write(head.encode() + body)
+    await writer.drain()
+
+# 🌊 Chunked NDJSON: one line per finished table, then the job's final status
+async def stream_rows(writer, job):
+    writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                 b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+    async for table in job.follow():
+        await write_chunk(writer, table)
+    await write_chunk(writer, {"job": job.id, "status": job.status, "error": job.error})
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+async def write_chunk(writer, payload):
+    line = json.dumps(payload).encode() + b"\n"
+    writer.write(f"{len(line):X}\r\n".encode() + line + b"\r\n")
+    await writer.drain()
+
+async def serve(host="127.0.0.1", port=8765, **options):
+    service = ExtractionService(**options)
+    await service.start()
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"🛰 Extraction service listening on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve schedule extraction over HTTP on this machine.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=0, help="parsing processes, 0 = one per CPU")
+    parser.add_argument("--runners", type=int, default=2, help="jobs run at the same time (default: %(default)s)")
+    parser.add_argument("--spool", default=spool_folder, help="folder for uploaded reports (default: %(default)s)")
+    parser.add_argument("--word-cache", default=None, help="folder for the on-disk page word cache")
+    parser.add_argument("--backend", default=None, choices=sorted(word_sources.backends),
+                        help="word source for every page (default: each schedule's word_backend)")
+    parser.add_argument("--page-timeout", type=float, default=page_guard.page_timeout, metavar="SECONDS",
+                        help="time budget per page attempt, 0 = unbounded (default: %(default)s)")
+    args = parser.parse_args()
+
+    # 📁 Set working directory to project root
+    project_root = Path(__file__).resolve().parents[1]
+    os.chdir(project_root)
+    print(f"📁 Working in: {os.getcwd()}")
+
+    try:
+        asyncio.run(serve(args.host, args.port, spool_dir=args.spool, workers=args.workers or os.cpu_count() or 1,
+                          runners=args.runners, cache_dir=args.word_cache, backend=args.backend,
+                          page_timeout=args.page_timeout))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import os
+import re
+import sqlite3
+import argparse
+import amounts
+import outputs
+
+# 🗄 Cross-report store: every extracted table also lands in one SQLite file, so a
+# query like "Direct Expense on line 1 across every hospital" is an index lookup
+# instead of globbing and parsing thousands of CSVs.
+#
+# One SQL table per schedule output (named after its file, e.g. schedule_ii_merged),
+# one row per cell:
+#   report_id, row_no, line_no, description, column_no, column_name, text, amount
+# Header text varies between reports (some headers are the report period), so cells
+# are keyed by position and also carry the column name. Line numbers repeat within
+# some tables, so a row is (report_id, row_no) and line_no is indexed alongside.
+# amount is the parsed value of amount cells (INTEGER or REAL), NULL otherwise.
+
+store_path = None
+
+def configure(path=None):
+    global store_path
+    store_path = path
+
+def connect(path=None):
+    path = path or store_path
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Batch workers write the same file; WAL lets readers query while they do
+    connection = sqlite3.connect(path, timeout=60)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+# 🏷 SQL table name for an output file, e.g. "schedule_iv_iv-a.csv" -> schedule_iv_iv_a
+def table_name(file_name):
+    return re.sub(r"[^a-z0-9_]+", "_", os.path.splitext(file_name)[0].lower()).strip("_")
+
+def ensure_table(connection, table):
+    connection.execute(f"""
+        CREATE TABLE IF NOT EXISTS "{table}" (
+            report_id TEXT NOT NULL,
+            row_no INTEGER NOT NULL,
+            line_no TEXT,
+            description TEXT,
+            column_no INTEGER NOT NULL,
+            column_name TEXT,
+            text TEXT,
+            amount NUMERIC,
+            PRIMARY KEY (report_id, row_no, column_no)
+        ) WITHOUT ROWID""")
+    connection.execute(f'CREATE INDEX IF NOT EXISTS "{table}_line" ON "{table}" (line_no, column_name, report_id)')
+    connection.execute(f'CREATE INDEX IF NOT EXISTS "{table}_description" ON "{table}" (description, column_name)')
+
+# 🧾 (row_no, line_no, description, column_no, column_name, text, amount) per value cell.
+# Amounts come from one bulk parse per column.
+def cells(df):
+    columns = [str(column) for column in df.columns]
+    line_at = columns.index("Line No.") if "Line No." in columns else None
+    description_at = next((i for i, column in enumerate(columns) if column in outputs.key_columns - {"Line No."}), None)
+    line_nos = df.iloc[:, line_at].tolist() if line_at is not None else [None] * len(df)
+    descriptions = df.iloc[:, description_at].tolist() if description_at is not None else [None] * len(df)
+
+    for j, column in enumerate(columns):
+        if j in (line_at, description_at):
+            continue
+        texts = [amounts.token_text(value) for value in df.iloc[:, j].tolist()]
+        values, scales, kinds = amounts.parse_amounts(texts)
+        parsed = (kinds == amounts.INTEGER) | (kinds == amounts.DECIMAL)
+        for row, (text, value, scale, is_amount) in enumerate(zip(texts, values.tolist(), scales.tolist(),
+                                                                  parsed.tolist())):
+            if not text:
+                continue
+            amount = (value if scale == 0 else value / 10 ** scale) if is_amount else None
+            yield row, line_nos[row], descriptions[row], j, column, text, amount
+
+# 🧾 cells() over consecutive chunks of one table, rows numbered on across chunks
+def chunk_cells(chunks):
+    first_row = 0
+    for df in chunks:
+        for row, *cell in cells(df):
+            yield (first_row + row, *cell)
+        first_row += len(df)
+
+# 💾 Replace one report's rows of a table in a single transaction. df is a DataFrame
+# or an iterable of DataFrame chunks (the streaming writer's)
+def save_table(df, file_name, report_id=None, path=None):
+    report_id = report_id or outputs.report_id
+    table = table_name(file_name)
+    chunks = [df] if hasattr(df, "iloc") else df
+    connection = connect(path)
+    try:
+        with connection:
+            ensure_table(connection, table)
+            connection.execute(f'DELETE FROM "{table}" WHERE report_id = ?', (report_id,))
+            connection.executemany(f'INSERT INTO "{table}" VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                   ((report_id, *cell) for cell in chunk_cells(chunks)))
+    finally:
+        connection.close()
+    return table
+
+# 🔎 (report_id, description, text, amount) for one line and column across every report
+def lookup(table, line_no, column_name, path=None):
+    connection = connect(path)
+    try:
+        return connection.execute(
+            f'SELECT report_id, description, text, amount FROM "{table}" '
+            f'WHERE line_no = ? AND column_name = ? ORDER BY report_id',
+            (str(line_no), column_name)).fetchall()
+    finally:
+        connection.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Look up one line and column across every report in a store.")
+    parser.add_argument("store", help="SQLite store written with --store")
+    parser.add_argument("table", help="table name, e.g. schedule_ii_merged")
+    parser.add_argument("line", help="line number, e.g. 1 or 98.01")
+    parser.add_argument("column", help="column name, e.g. 'Direct Expense'")
+    args = parser.parse_args()
+    for report_id, description, text, amount in lookup(args.table, args.line, args.column, args.store):
+        print(f"{report_id}\t{description}\t{text}\t{'' if amount is None else amount}")
+
+if __name__ == "__main__":
+    main()
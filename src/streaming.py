@@ -0,0 +1,289 @@
+import os
+import csv
+import json
+from lazy_imports import lazy_import
+
+import driver
+import outputs
+import word_sources
+import word_cache
+import regions
+import schedule_engine
+import amounts
+import metrics
+import pdf_input
+import store
+from row_builder import continue_row, Continuation
+
+pd = lazy_import("pandas")
+
+# 🌊 Streaming extraction with bounded memory.
+# iter_schedule_rows yields one page of rows at a time and releases each
+# pdfplumber page once it's parsed; StreamingTableWriter appends rows to disk
+# as they arrive and only keeps per-column bookkeeping in memory, so peak RSS
+# stays flat whether a schedule spans 6 pages or 600. The driver's --stream option
+# writes every schedule whose outputs only concatenate pages this way.
+
+# 🔎 Module that extracts a label, e.g. "Schedule III", "IV-C", "part3", "schedule_vii"
+def find_schedule(label, modules=driver.schedule_modules):
+    for module in modules:
+        if label in module.pages_by_label():
+            return module
+    raise KeyError(f"No schedule module handles {label!r}")
+
+# 🌊 A module streams when each of its outputs concatenates one label's pages
+def streamable(module):
+    return all(output["join"] is None and len(output["labels"]) == 1 for output in module.spec["outputs"])
+
+# 📄 Yield (page index, headers, rows) for each page of a schedule, releasing pages as we go.
+# Pages run under driver.guarded_page, so a failing page yields no rows.
+def iter_schedule_rows(pdf, label, module=None, backend=None):
+    module = module or find_schedule(label)
+    targets = [(module, label)]
+    pages = module.pages_by_label()[label]
+    word_sources.assign_backends([(i, targets) for i in pages], backend)
+    for i in pages:
+        page = pdf.pages[i]
+        [(_, _, (headers, rows))] = driver.guarded_page(page, i, targets)
+        page.close()
+        yield i, headers, rows
+
+class StreamingTableWriter:
+    # Rows are appended to a side file (JSON lines, so blank cells stay None) as they
+    # arrive; close() writes the final table once the header width is known, copying
+    # the body through in chunks. The last row is held back until the next page, which
+    # may open with a Continuation of it.
+    def __init__(self, path, schedule, pad_name="Column_{n}", label=None, chunk_rows=10000):
+        self.path = outputs.output_path(path)
+        self.body_path = f"{self.path}.rows"
+        self.schedule = schedule
+        self.pad_name = pad_name
+        self.label = label
+        self.chunk_rows = chunk_rows
+        self.headers = []
+        self.pages = []
+        self.carried = []
+        self.changed = []
+        self.stitched = []
+        self.last = None
+        # (column index, row, text) of every malformed amount seen
+        self.malformed = []
+        self.columns = None
+        self.max_len = 0
+        self.row_count = 0
+        # Per column: [some value is an amount, some value is text, some amount has a ".",
+        # some cell isn't None]
+        self.column_stats = []
+        self.body = open(self.body_path, "w", encoding="utf-8")
+
+    # Headers carry over from the previous page when detection finds none, a header
+    # that changes mid-table is a warning, and a page opening mid-row continues the
+    # held-back row, as in schedule_engine.label_table
+    def write_page(self, page_index, headers, rows):
+        if headers:
+            if self.headers and list(headers) != self.headers:
+                self.changed.append(page_index)
+                print(f"⚠️ {self.label or self.schedule}: header changes on page {page_index + 1}: "
+                      f"{' | '.join(headers)}")
+            self.headers = list(headers)
+        elif rows:
+            self.carried.append(page_index)
+        self.pages.append(page_index)
+        if rows and isinstance(rows[0], Continuation):
+            if self.last is not None:
+                self.last = continue_row(self.last, rows[0], rows[0].banded)
+                self.stitched.append(page_index)
+            rows = rows[1:]
+        if rows:
+            self._flush(([] if self.last is None else [self.last]) + list(rows[:-1]))
+            self.last = rows[-1]
+
+    def _flush(self, rows):
+        for row in rows:
+            self.body.write(json.dumps(row) + "\n")
+            self.max_len = max(self.max_len, len(row))
+        self._track_types(rows)
+        self.row_count += len(rows)
+
+    # 🔢 One bulk parse per page column
+    def _track_types(self, rows):
+        width = max(map(len, rows), default=0)
+        while len(self.column_stats) < width:
+            self.column_stats.append([False, False, False, False])
+        for j in range(width):
+            tokens = [row[j] if j < len(row) else None for row in rows]
+            _, _, kinds = amounts.parse_amounts(tokens)
+            stats = self.column_stats[j]
+            stats[0] = stats[0] or bool(((kinds == amounts.INTEGER) | (kinds == amounts.DECIMAL)).any())
+            stats[1] = stats[1] or bool((kinds == amounts.TEXT).any())
+            stats[2] = stats[2] or bool((kinds == amounts.DECIMAL).any())
+            stats[3] = stats[3] or any(token is not None for token in tokens)
+            self.malformed += [(j, self.row_count + row, rows[row][j])
+                               for row in (kinds == amounts.MALFORMED).nonzero()[0].tolist()]
+
+    def _is_numeric(self, i, column):
+        has_amount, has_text, _, _ = self.column_stats[i]
+        return column not in outputs.key_columns and has_amount and not has_text
+
+    # ⚠️ (column, row, text) per malformed amount in a value column, like outputs.malformed_amounts
+    def malformed_amounts(self):
+        if self.columns is None:
+            return []
+        return [(self.columns[j], row, text) for j, row, text in self.malformed
+                if j < len(self.columns) and self._is_numeric(j, self.columns[j])]
+
+    def final_headers(self):
+        headers = list(self.headers)
+        while len(headers) < self.max_len:
+            headers.append(self.pad_name.format(label=self.label, n=len(headers) + 1))
+        return headers[:self.max_len]
+
+    def _rows(self):
+        with open(self.body_path, encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def _chunks(self, columns):
+        chunk = []
+        for row in self._rows():
+            chunk.append(row + [None] * (len(columns) - len(row)))
+            if len(chunk) == self.chunk_rows:
+                yield pd.DataFrame(chunk, columns=columns)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=columns)
+
+    # 🔢 Column dtypes decided from the whole stream, matching outputs.typed_frame
+    def _typed_chunk(self, df):
+        df.columns = outputs.unique_columns(df.columns)
+        for i, column in enumerate(self.final_headers()):
+            if not self._is_numeric(i, column):
+                continue
+            values, scales, kinds = amounts.parse_amounts(df.iloc[:, i].tolist())
+            df.isetitem(i, amounts.to_array(values, scales, kinds, decimal=self.column_stats[i][2]))
+        return df
+
+    # 💾 Write the table (and, with a store configured, its cells) and drop the side file
+    def close(self):
+        if self.last is not None:
+            self._flush([self.last])
+            self.last = None
+        self.body.close()
+        try:
+            if self.carried or self.changed:
+                metrics.emit("header", report=outputs.report_id, label=str(self.label), carried=self.carried,
+                             changed=self.changed)
+            if self.stitched:
+                metrics.emit("stitch", report=outputs.report_id, label=str(self.label), pages=self.stitched)
+            if not self.row_count or not self.headers:
+                return None
+            self.columns = columns = self.final_headers()
+            if outputs.output_format == "csv":
+                self._write_csv(columns)
+            else:
+                self._write_arrow(columns)
+            if store.store_path:
+                store.save_table(self._chunks(columns), os.path.basename(self.path))
+            return self.path
+        finally:
+            os.remove(self.body_path)
+
+    def _write_csv(self, columns):
+        with open(self.path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(columns)
+            for row in self._rows():
+                writer.writerow(row + [""] * (len(columns) - len(row)))
+
+    def _arrow_schema(self, columns, pa):
+        # A one-row template carries the pandas metadata, so nullable dtypes read back as in outputs.py
+        template = pd.DataFrame({column: [""] for column in outputs.unique_columns(columns)})
+        fields = []
+        for i, (column, (_, _, has_dot, present)) in enumerate(zip(template.columns, self.column_stats)):
+            if not present:
+                # A column of blank cells only is an all-None object column in outputs.typed_frame
+                template.isetitem(i, pd.Series([None], dtype=object))
+                fields.append(pa.field(column, pa.null()))
+            elif not self._is_numeric(i, column):
+                fields.append(pa.field(column, pa.string()))
+            else:
+                template.isetitem(i, pd.array([None], dtype="Float64" if has_dot else "Int64"))
+                fields.append(pa.field(column, pa.float64() if has_dot else pa.int64()))
+
+        metadata = dict(pa.Schema.from_pandas(template, preserve_index=False).metadata)
+        extra = {"schedule": self.schedule, "pages": [i + 1 for i in self.pages], "report": outputs.report_id}
+        metadata.update({key.encode(): json.dumps(value).encode() for key, value in extra.items()})
+        return pa.schema(fields, metadata=metadata)
+
+    def _write_arrow(self, columns):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError(f"Writing {outputs.output_format} output needs pyarrow (pip install pyarrow)") from exc
+
+        schema = self._arrow_schema(columns, pa)
+        if outputs.output_format == "parquet":
+            writer = pq.ParquetWriter(self.path, schema)
+        else:
+            writer = pa.ipc.new_file(self.path, schema)
+        with writer:
+            for df in self._chunks(columns):
+                writer.write_table(pa.Table.from_pandas(self._typed_chunk(df), schema=schema, preserve_index=False))
+
+    # Drop the partial body without writing a table
+    def abort(self):
+        self.body.close()
+        os.remove(self.body_path)
+
+# 💾 Extract one concatenating schedule straight to disk, page by page
+def stream_schedule(pdf, label, output_folder, module=None, backend=None):
+    module = module or find_schedule(label)
+    # Only outputs that plainly concatenate one label's pages can be streamed
+    output = schedule_engine.concat_output(module.spec, label)
+    if output is None:
+        raise ValueError(f"{label!r} merges rows across pages and can't be streamed")
+
+    stopwatch = metrics.Stopwatch()
+    writer = StreamingTableWriter(os.path.join(output_folder, output["file"]), output["table"],
+                                  pad_name=output["pad"], label=label)
+    try:
+        for i, headers, rows in iter_schedule_rows(pdf, label, module, backend):
+            writer.write_page(i, headers, rows)
+    except BaseException:
+        writer.abort()
+        raise
+    with stopwatch("write"):
+        path = writer.close()
+
+    if path is None:
+        print(f"⚠️ No data extracted for {output['table']}")
+        metrics.emit("merge", report=outputs.report_id, table=output["table"], file=output["file"], rows=0,
+                     seconds=stopwatch.rounded())
+        return None
+    malformed = writer.malformed_amounts()
+    schedule_engine.report_malformed(output["table"], malformed)
+    metrics.emit("merge", report=outputs.report_id, table=output["table"], file=output["file"],
+                 rows=writer.row_count, malformed=len(malformed), seconds=stopwatch.rounded())
+    print(f"✅ {output['table']} extracted and saved to: {path}")
+    return path
+
+# 🔁 The driver's --stream path: every streamable module's outputs written from one PDF
+# handle in this process. A module that fails is reported and skipped, as in
+# driver.write_all; returns the modules written.
+def stream_modules(pdf_path, modules, output_folder, cache_dir=None, backend=None):
+    word_cache.cache.cache_dir = cache_dir
+    regions.configure(cache_dir)
+    os.makedirs(output_folder, exist_ok=True)
+    written = []
+    with pdf_input.open_pdf(pdf_path) as pdf:
+        for module in modules:
+            try:
+                for output in module.spec["outputs"]:
+                    stream_schedule(pdf, output["labels"][0], output_folder, module, backend)
+                written.append(module)
+            except Exception as exc:
+                metrics.emit("output_error", report=outputs.report_id, schedule=module.__name__,
+                             error=type(exc).__name__, message=str(exc)[:500])
+                print(f"❌ {module.__name__} failed: {type(exc).__name__}: {exc}")
+    return written
@@ -0,0 +1,95 @@
+import os
+import json
+import hashlib
+import weakref
+from collections import OrderedDict
+
+import word_sources
+
+# 📦 Page-level cache for page.extract_words() results.
+# Keys are (PDF content hash, page index, extraction options), so header detection
+# and row extraction share one layout pass per page, and an optional on-disk tier
+# lets re-runs skip layout analysis entirely.
+
+class WordCache:
+    def __init__(self, max_pages=256, cache_dir=None):
+        self.max_pages = max_pages
+        self.cache_dir = cache_dir
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _disk_path(self, key):
+        doc_hash, page_index, options = key
+        options_id = hashlib.sha1(repr(options).encode()).hexdigest()[:12]
+        return os.path.join(self.cache_dir, doc_hash, f"{page_index}-{options_id}.json")
+
+    def get(self, key):
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return self.memory[key]
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    words = json.load(f)
+                self._remember(key, words)
+                self.hits += 1
+                return words
+
+        self.misses += 1
+        return None
+
+    def put(self, key, words):
+        self._remember(key, words)
+        if self.cache_dir:
+            path = self._disk_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(words, f)
+            os.replace(tmp_path, path)
+
+    def _remember(self, key, words):
+        self.memory[key] = words
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_pages:
+            self.memory.popitem(last=False)
+
+    def clear(self):
+        self.memory.clear()
+        self.hits = 0
+        self.misses = 0
+
+# 🌐 Process-wide cache used by the schedule extractors
+cache = WordCache()
+
+def configure(max_pages=256, cache_dir=None):
+    global cache
+    cache = WordCache(max_pages=max_pages, cache_dir=cache_dir)
+    return cache
+
+# 🔑 SHA-256 of the PDF bytes, computed once per open document
+_document_hashes = weakref.WeakKeyDictionary()
+
+def document_hash(pdf):
+    if pdf not in _document_hashes:
+        stream = pdf.stream
+        position = stream.tell()
+        stream.seek(0)
+        _document_hashes[pdf] = hashlib.file_digest(stream, "sha256").hexdigest()
+        stream.seek(position)
+    return _document_hashes[pdf]
+
+# 📄 Cached drop-in for page.extract_words(**options), read through the page's word source
+def page_words(page, backend=None, **options):
+    backend = backend or word_sources.backend_for(page)
+    key = (document_hash(page.pdf), page.page_number - 1,
+           tuple(sorted(options.items())) + (("backend", backend), ("x_digits", word_sources.x_digits)))
+    words = cache.get(key)
+    if words is None:
+        words = word_sources.extract_words(page, backend, **options)
+        cache.put(key, words)
+    return words
@@ -0,0 +1,142 @@
+import ctypes
+import weakref
+import pdf_input
+from lazy_imports import lazy_import
+
+pypdfium2 = lazy_import("pypdfium2")
+pdfplumber = lazy_import("pdfplumber")
+
+# 🔌 Pluggable word sources behind page_words().
+# "pdfplumber" runs pdfminer layout analysis (the reference); "pdfium" reads char
+# boxes from PDFium's text page and groups them with pdfplumber's own
+# WordExtractor, so words come back in the same shape at a fraction of the cost.
+
+default_backend = "pdfplumber"
+
+# 🗂 Backend per 0-based page index, set by the driver from each schedule's choice
+page_backends = {}
+
+# ✂️ A word belongs to a region (x0, top, x1, bottom) when its top lies in the band
+# and it overlaps the region horizontally, so whole lines stay together
+def in_region(obj, bbox):
+    return bbox[1] <= obj["top"] < bbox[3] and obj["x1"] > bbox[0] and obj["x0"] < bbox[2]
+
+# 📄 Reference backend
+def pdfplumber_words(page, **options):
+    return page.extract_words(**options)
+
+# 📂 One PDFium document per open pdfplumber PDF. A memory-mapped input gets its
+# own cursor over the mapping; any other stream is read into memory once.
+_pdfium_documents = weakref.WeakKeyDictionary()
+
+def pdfium_document(pdf):
+    if pdf not in _pdfium_documents:
+        stream = pdf.stream
+        if isinstance(stream, pdf_input.MappedFile):
+            _pdfium_documents[pdf] = pypdfium2.PdfDocument(stream.reopen())
+        else:
+            position = stream.tell()
+            stream.seek(0)
+            _pdfium_documents[pdf] = pypdfium2.PdfDocument(stream.read())
+            stream.seek(position)
+    return _pdfium_documents[pdf]
+
+# 🔤 PDFium chars as pdfplumber-style dicts. Like pdfminer, a char's bottom is the
+# font descent below the baseline and its top is one font size above that.
+def pdfium_chars(page):
+    pdfium_raw = pypdfium2.raw
+    pdfium_page = pdfium_document(page.pdf)[page.page_number - 1]
+    textpage = pdfium_page.get_textpage()
+    height = pdfium_page.get_height()
+    rect = pdfium_raw.FS_RECTF()
+    chars = []
+    try:
+        for k in range(pdfium_raw.FPDFText_CountChars(textpage.raw)):
+            if pdfium_raw.FPDFText_IsGenerated(textpage.raw, k) or \
+                    not pdfium_raw.FPDFText_GetLooseCharBox(textpage.raw, k, ctypes.byref(rect)):
+                # PDFium's generated line breaks aren't in the content stream; they only end the current word
+                chars.append({"text": " ", "upright": True, "x0": 0.0, "x1": 0.0, "top": 0.0, "bottom": 0.0,
+                              "doctop": 0.0, "generated": True})
+                continue
+            size = pdfium_raw.FPDFText_GetFontSize(textpage.raw, k)
+            bottom = height - rect.bottom
+            top = bottom - size
+            text = chr(pdfium_raw.FPDFText_GetUnicode(textpage.raw, k))
+            if text == "\x02":
+                # PDFium marks a hyphen that ends a line as \x02
+                text = "-"
+            chars.append({
+                "text": text,
+                "upright": pdfium_raw.FPDFText_GetCharAngle(textpage.raw, k) == 0,
+                "x0": rect.left,
+                "x1": rect.right,
+                "top": top,
+                "bottom": bottom,
+                "doctop": page.initial_doctop + top,
+                "size": size,
+            })
+    finally:
+        textpage.close()
+        pdfium_page.close()
+    return chars
+
+# ⚡ Fast backend: same options and word dicts as page.extract_words().
+# Pages PDFium can't open fall back to the reference backend.
+def pdfium_words(page, **options):
+    try:
+        chars = pdfium_chars(page)
+    except pypdfium2.PdfiumError:
+        return pdfplumber_words(page, **options)
+    if not options.get("use_text_flow"):
+        # Without text flow, words come from line clustering, where generated breaks don't belong
+        chars = [char for char in chars if not char.get("generated")]
+    return pdfplumber.utils.text.WordExtractor(**options).extract_words(chars)
+
+backends = {"pdfplumber": pdfplumber_words, "pdfium": pdfium_words}
+
+# 📐 Word x coordinates are snapped to a 1/1000 pt grid. The backends agree on glyph
+# positions far closer than that but not to the last bit, and column bands compare
+# word centers against edges, so unsnapped coordinates could put the same word in
+# different columns depending on the backend (or a page_guard fallback).
+x_digits = 3
+
+# 🏷 Plain text of the strip above `limit` points from the top, read straight from
+# PDFium without building words. Used to find schedule titles on every page.
+def top_band_text(page, limit):
+    try:
+        pdfium_page = pdfium_document(page.pdf)[page.page_number - 1]
+    except pypdfium2.PdfiumError:
+        return page.crop((0, 0, page.width, min(limit, page.height))).extract_text()
+    textpage = pdfium_page.get_textpage()
+    try:
+        height = pdfium_page.get_height()
+        return textpage.get_text_bounded(bottom=height - limit, top=height)
+    finally:
+        textpage.close()
+        pdfium_page.close()
+
+# 🔧 A schedule picks its backend with a module-level word_backend: one name for
+# every label, or {label: name} per page type. Unlisted labels use the default.
+def module_backend(module, label):
+    choice = getattr(module, "word_backend", default_backend)
+    if isinstance(choice, dict):
+        return choice.get(label, default_backend)
+    return choice
+
+# 🗂 Record the backend for each page from [(page index, [(module, label), ...])].
+# Pages read by schedules that disagree get the reference backend.
+def assign_backends(targets_by_page, override=None):
+    page_backends.clear()
+    for i, targets in targets_by_page:
+        choices = {override or module_backend(module, label) for module, label in targets}
+        page_backends[i] = choices.pop() if len(choices) == 1 else "pdfplumber"
+    return page_backends
+
+def backend_for(page):
+    return page_backends.get(page.page_number - 1, default_backend)
+
+def extract_words(page, backend=None, **options):
+    words = backends[backend or backend_for(page)](page, **options)
+    for word in words:
+        word["x0"], word["x1"] = round(word["x0"], x_digits), round(word["x1"], x_digits)
+    return words
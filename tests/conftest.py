@@ -0,0 +1,13 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# 📁 Make the src/ modules importable
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / "src"))
+
+# 📄 The report every end-to-end test extracts
+@pytest.fixture
+def report_pdf():
+    return str(project_root / "reports" / "Hospital Cost Reports.pdf")
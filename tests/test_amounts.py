@@ -0,0 +1,36 @@
+import amounts
+
+def parsed(tokens):
+    values, scales, kinds = amounts.parse_amounts(tokens)
+    return values.tolist(), scales.tolist(), kinds.tolist()
+
+def test_lakh_and_thousands_grouping_parse_alike():
+    assert parsed(["18,63,062", "1,863,062", " 12 "]) == ([1863062, 1863062, 12], [0, 0, 0], [amounts.INTEGER] * 3)
+
+def test_negatives_and_decimals():
+    values, scales, kinds = parsed(["(1,234)", "1,234-", "1,234.50"])
+    assert values == [-1234, -1234, 123450]
+    assert scales == [0, 0, 2]
+    assert kinds == [amounts.INTEGER, amounts.INTEGER, amounts.DECIMAL]
+
+def test_placeholders_blanks_text_and_bad_grouping():
+    _, _, kinds = parsed(["-", "—", "", None, "Total", "2,", "1,2345"])
+    assert kinds == [amounts.PLACEHOLDER, amounts.PLACEHOLDER, amounts.EMPTY, amounts.EMPTY, amounts.TEXT,
+                     amounts.MALFORMED, amounts.MALFORMED]
+
+def test_amount_column_needs_an_amount_and_no_text():
+    _, _, kinds = amounts.parse_amounts(["1,000", "-", "2,", None])
+    assert amounts.is_amount_column(kinds)
+    _, _, kinds = amounts.parse_amounts(["1,000", "Total"])
+    assert not amounts.is_amount_column(kinds)
+    _, _, kinds = amounts.parse_amounts(["-", None])
+    assert not amounts.is_amount_column(kinds)
+
+def test_to_array_keeps_only_amounts():
+    values, scales, kinds = amounts.parse_amounts(["1,000", "-", "2,"])
+    array = amounts.to_array(values, scales, kinds)
+    assert str(array.dtype) == "Int64"
+    assert array.isna().tolist() == [False, True, True] and array[0] == 1000
+    values, scales, kinds = amounts.parse_amounts(["1.5", "2"])
+    array = amounts.to_array(values, scales, kinds)
+    assert str(array.dtype) == "Float64" and list(array) == [1.5, 2.0]
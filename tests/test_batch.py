@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+import batch
+
+def test_report_ids_are_folder_safe():
+    assert batch.report_id("/in/St. Mary's Hospital 2023.PDF") == "st_mary_s_hospital_2023"
+
+def test_reports_are_found_recursively(tmp_path):
+    (tmp_path / "b").mkdir()
+    for name in ("a.pdf", "b/c.pdf", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+    assert batch.find_reports(str(tmp_path)) == [str(tmp_path / "a.pdf"), str(tmp_path / "b" / "c.pdf")]
+
+# 🏷 Two reports that would share a folder are refused before anything runs
+def test_clashing_report_ids_are_refused(tmp_path):
+    for name in ("Report A.pdf", "report-a.pdf"):
+        (tmp_path / name).write_bytes(b"")
+    with pytest.raises(ValueError, match="share the id"):
+        batch.run_batch(str(tmp_path), str(tmp_path / "out"))
+    assert not (tmp_path / "out").exists()
+
+# 📄 A report that fails is recorded in the status file and the rest of the batch still runs;
+# the rerun retries the failure
+def test_a_failed_report_does_not_stop_the_batch(report_pdf, tmp_path):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    (reports / "broken.pdf").write_bytes(b"not a pdf")
+    (reports / "hospital.pdf").symlink_to(report_pdf)
+    out = tmp_path / "out"
+
+    statuses = batch.run_batch(str(reports), str(out), workers=2)
+    assert statuses["broken"]["status"] == "failed"
+    assert statuses["hospital"]["status"] == "ok" and statuses["hospital"]["extracted"]
+    assert (out / "hospital" / "schedule_ii_merged.csv").exists()
+    assert json.loads((out / batch.status_name).read_text()) == statuses
+
+    rerun = batch.run_batch(str(reports), str(out), workers=2)
+    assert rerun["broken"]["status"] == "failed"
+    assert rerun["hospital"]["status"] == "ok" and rerun["hospital"]["extracted"] == []
@@ -0,0 +1,41 @@
+import pandas as pd
+
+import joins
+
+keys = ["Line No.", "Description"]
+
+def frame(rows, columns):
+    return pd.DataFrame(rows, columns=keys + columns)
+
+def test_side_by_side_keeps_first_seen_keys_and_reports_repeats():
+    a = frame([["1", "Rent", "10"], ["2", "Fees", "20"], ["1", "Rent", "10"]], ["A"])
+    b = frame([["2", " Fees ", "x"], ["3", "Food", "y"], ["3", "Food", "z"]], ["B"])
+    df, issues = joins.join_side_by_side([("a", a), ("b", b)], keys)
+
+    assert list(df.columns) == keys + ["A", "B"]
+    assert df[keys].values.tolist() == [["1", "Rent"], ["2", "Fees"], ["3", "Food"]]
+    assert df["B"].tolist()[1:] == ["x", "y"]
+    assert pd.isna(df["B"].iloc[0]) and pd.isna(df["A"].iloc[2])
+    assert issues == [{"part": "a", "key": ("1", "Rent"), "kind": "duplicate"},
+                      {"part": "b", "key": ("3", "Food"), "kind": "conflict"}]
+
+def test_side_by_side_keeps_repeated_header_names():
+    a = pd.DataFrame([["1", "Rent", "10", "11"]], columns=keys + ["Care", "Care"])
+    df, _ = joins.join_side_by_side([("a", a)], keys)
+    assert list(df.columns) == keys + ["Care", "Care"]
+    assert df.values.tolist() == [["1", "Rent", "10", "11"]]
+
+def test_update_orders_by_line_number_and_later_parts_win():
+    c = frame([["10", "Heat", "5", None], ["2", "Fees", "6", None]], ["A", "B"])
+    d = frame([["2", "Fees", "7", "8"]], ["A", "B"])
+    df, issues = joins.join_update([("c", c), ("d", d)], keys, keys + ["A", "B"])
+
+    assert df.values.tolist() == [["2", "Fees", "7", "8"], ["10", "Heat", "5", ""]]
+    assert issues == [{"part": "d", "key": ("2", "Fees"), "kind": "conflict", "column": "A"}]
+
+def test_update_blank_cells_never_overwrite():
+    c = frame([["1", "Rent", "5", "6"]], ["A", "B"])
+    d = frame([["1", "Rent", None, "6"]], ["A", "B"])
+    df, issues = joins.join_update([("c", c), ("d", d)], keys, keys + ["A", "B"])
+    assert df.values.tolist() == [["1", "Rent", "5", "6"]]
+    assert issues == []
@@ -0,0 +1,33 @@
+import json
+
+import driver
+import manifest
+import schedule3
+import schedule_engine
+
+def run(report_pdf, out):
+    return driver.run(report_pdf, str(out), modules=[schedule3], incremental=True, locate=False)
+
+# 🚫 A module that loses a page after the report changed is retried by the next incremental run
+def test_lost_page_keeps_the_module_stale(report_pdf, tmp_path, monkeypatch):
+    assert run(report_pdf, tmp_path) == [schedule3]
+
+    # The report changed since: its hash and one of Schedule III's pages differ from the manifest
+    path = tmp_path / manifest.manifest_name
+    records = json.loads(path.read_text())
+    records["pdf"]["sha256"] = "old"
+    records["pages"]["15"] = "old"
+    path.write_text(json.dumps(records))
+
+    run_page = schedule_engine.run_page
+    def failing(page, targets):
+        if page.page_number == 16:
+            raise RuntimeError("unreadable page")
+        return run_page(page, targets)
+    monkeypatch.setattr(schedule_engine, "run_page", failing)
+    assert run(report_pdf, tmp_path) == [schedule3]
+    assert "schedule3" not in json.loads(path.read_text())["schedules"]
+
+    monkeypatch.setattr(schedule_engine, "run_page", run_page)
+    assert run(report_pdf, tmp_path) == [schedule3]
+    assert run(report_pdf, tmp_path) == []
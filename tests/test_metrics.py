@@ -0,0 +1,58 @@
+import json
+import pstats
+
+import pytest
+
+import driver
+import metrics
+import schedule3
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.configure()
+    yield
+    metrics.configure()
+
+def test_stopwatch_accumulates_per_stage():
+    stopwatch = metrics.Stopwatch()
+    for _ in range(2):
+        with stopwatch("parse"):
+            pass
+    with pytest.raises(RuntimeError):
+        with stopwatch("write"):
+            raise RuntimeError
+    assert sorted(stopwatch.seconds) == ["parse", "write"]
+
+def test_unknown_profiler_is_refused():
+    with pytest.raises(ValueError, match="Unknown profiler"):
+        metrics.configure(1, "perf")
+
+# 🏆 Captures from several workers merge into the N slowest overall
+def test_record_keeps_the_slowest_captures():
+    metrics.configure(slowest_pages=2)
+    metrics.record(([{"event": "page", "page": 0}], [(1.0, 0, {}), (3.0, 1, {})]))
+    metrics.record(([{"event": "page", "page": 2}], [(2.0, 2, {}), (0.5, 3, {})]))
+    assert [event["page"] for event in metrics.events] == [0, 2]
+    assert sorted(page for _, page, _ in metrics.slowest) == [1, 2]
+    assert metrics.drain()[0] == [{"event": "page", "page": 0}, {"event": "page", "page": 2}]
+    assert metrics.events == [] and metrics.slowest == []
+
+# 📈 A run emits page, merge and run events, appends them as JSON lines and keeps
+# loadable cProfile captures of its slowest pages
+def test_run_events_and_page_profiles(report_pdf, tmp_path):
+    metrics.configure(slowest_pages=2)
+    driver.run(report_pdf, str(tmp_path / "out"), modules=[schedule3], locate=False)
+
+    kinds = [event["event"] for event in metrics.events]
+    assert kinds[-1] == "run" and "page" in kinds and "merge" in kinds
+    pages = [event for event in metrics.events if event["event"] == "page"]
+    assert metrics.slowest_pages(1) == [max(pages, key=lambda event: event["seconds"]["total"])]
+
+    path = tmp_path / "metrics.jsonl"
+    metrics.write_jsonl(str(path))
+    metrics.write_jsonl(str(path))
+    assert [json.loads(line) for line in path.read_text().splitlines()] == metrics.events * 2
+
+    profiles = metrics.write_profiles(str(tmp_path / "profiles"))
+    assert len(profiles) == 2 and all(path.endswith(".prof") for path in profiles)
+    assert pstats.Stats(profiles[0]).total_calls > 0
@@ -0,0 +1,57 @@
+import json
+import importlib.util
+
+import pandas as pd
+import pytest
+
+import outputs
+
+@pytest.fixture(autouse=True)
+def csv_output():
+    yield
+    outputs.configure()
+
+def test_arrow_formats_need_pyarrow_up_front(monkeypatch):
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None if name == "pyarrow" else find_spec(name))
+    with pytest.raises(ImportError, match="pip install pyarrow"):
+        outputs.configure("parquet")
+    assert outputs.output_format == "csv"
+    outputs.configure("csv")
+
+def test_output_path_follows_the_format():
+    assert outputs.output_path("out/schedule_iii.csv") == "out/schedule_iii.csv"
+    outputs.configure("parquet")
+    assert outputs.output_path("out/schedule_iii.csv") == "out/schedule_iii.parquet"
+
+# 🔢 Amount columns become numeric, text and key columns stay as extracted
+def test_typed_frame_converts_only_amount_columns():
+    df = pd.DataFrame([["1.00", "Salaries", "18,63,062", "-", "2,345.50"],
+                       ["2.00", "Total", "(1,000)", "12", "-"]],
+                      columns=["Line No.", "Description", "TO", "TO", "Notes"])
+    typed = outputs.typed_frame(df)
+    assert list(typed.columns) == ["Line No.", "Description", "TO", "TO.1", "Notes"]
+    assert typed["Line No."].tolist() == ["1.00", "2.00"]
+    assert typed["TO"].tolist() == [1863062, -1000]
+    assert typed["TO.1"].isna().tolist() == [True, False]
+    assert typed["Notes"].dtype == "Float64"
+    assert list(df.columns) == ["Line No.", "Description", "TO", "TO", "Notes"]
+
+def test_malformed_amounts_are_reported():
+    df = pd.DataFrame({"Description": ["2,", "Total"], "Amount": ["2,", "1,000"], "Other": ["1,000", "1,0002,000"],
+                       "Notes": ["2,", "see note"]})
+    assert outputs.malformed_amounts(df) == [("Amount", 0, "2,"), ("Other", 1, "1,0002,000")]
+
+# 💾 Parquet tables carry their schedule, 1-based pages and report in the schema metadata
+def test_parquet_tables_carry_their_metadata(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    outputs.configure("parquet", report="hospital")
+    df = pd.DataFrame({"Line No.": ["1.00"], "Amount": ["1,000"]})
+    path = outputs.save_table(df, str(tmp_path / "schedule_iii.csv"), "Schedule III", pages=[15, 16])
+    assert path == str(tmp_path / "schedule_iii.parquet")
+
+    table = pq.read_table(path)
+    metadata = {key.decode(): json.loads(value) for key, value in table.schema.metadata.items()
+                if key != b"pandas"}
+    assert metadata == {"schedule": "Schedule III", "pages": [16, 17], "report": "hospital"}
+    assert table.column("Amount").to_pylist() == [1000]
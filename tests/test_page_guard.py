@@ -0,0 +1,63 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import page_guard
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def test_main_thread_budget_interrupts_a_slow_page():
+    with pytest.raises(page_guard.PageTimeout):
+        with page_guard.time_budget(0.2):
+            spin(5)
+
+def test_worker_thread_budget_interrupts_a_slow_page():
+    def page():
+        assert threading.current_thread() is not threading.main_thread()
+        with page_guard.time_budget(0.2):
+            spin(5)
+
+    with ThreadPoolExecutor(1) as pool:
+        with pytest.raises(page_guard.PageTimeout):
+            pool.submit(page).result(timeout=10)
+
+def test_timer_budget_leaves_a_finished_page_alone():
+    with page_guard.timer_budget(0.05):
+        pass
+    spin(0.2)
+
+def test_failed_attempts_fall_back_to_the_other_backend():
+    def extract(backend):
+        if backend == "pdfium":
+            raise ValueError("bad page")
+        return backend
+
+    assert page_guard.run_page(extract, "r", 0, ["s"], "pdfium") == ("pdfplumber", "pdfplumber")
+
+def run_slow_page(slow_backend, backend):
+    tried = []
+
+    def extract(choice):
+        tried.append(choice)
+        if choice == slow_backend:
+            spin(5)
+        return choice
+
+    with ThreadPoolExecutor(1) as pool:
+        page_guard.configure(timeout=0.2)
+        try:
+            result = pool.submit(page_guard.run_page, extract, "r", 0, ["s"], backend).result(timeout=10)
+        finally:
+            page_guard.configure()
+    return result, tried
+
+def test_slow_reference_page_falls_back_to_pdfium():
+    assert run_slow_page("pdfplumber", "pdfplumber") == (("pdfium", "pdfium"), ["pdfplumber", "pdfium"])
+
+def test_slow_pdfium_page_is_not_retried_on_the_slower_backend():
+    assert run_slow_page("pdfium", "pdfium") == ((None, None), ["pdfium"])
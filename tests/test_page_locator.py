@@ -0,0 +1,65 @@
+import pytest
+
+import page_locator
+
+class Page:
+    def __init__(self, page_number, title, first_column=None):
+        self.page_number = page_number
+        self.title = title
+        self.first_column = first_column
+
+class Pdf:
+    def __init__(self, headings):
+        self.pages = [Page(k + 1, *(heading if isinstance(heading, tuple) else (heading,)))
+                      for k, heading in enumerate(headings)]
+
+@pytest.fixture(autouse=True)
+def no_index(monkeypatch):
+    monkeypatch.setattr(page_locator, "page_heading", lambda page: (page.title, page.first_column))
+    yield
+    page_locator.use_index(None)
+
+def test_untitled_pages_continue_the_schedule_before_them():
+    pdf = Pdf([None, "II", None, "III", "IIIA", None, None])
+    assert page_locator.build_index(pdf) == {"II": [1, 2], "III": [3], "IIIA": [4, 5, 6]}
+
+def test_page_groups_follow_their_column_numbers():
+    # 🧩 An extra page in the first group must not shift the later groups
+    pdf = Pdf([("II", 2), ("II", 2), ("II", 2), ("II", 8), None, ("II", 14), ("III", None), None])
+    assert page_locator.build_index(pdf) == {
+        "II": [0, 1, 2, 3, 4, 5], "II:2": [0, 1, 2], "II:8": [3, 4], "II:14": [5], "III": [6, 7]}
+
+def test_column_line_is_read_right_under_the_title(monkeypatch):
+    monkeypatch.undo()
+    texts = {1: "SCHEDULE II - SUMMARY SCHEDULE (Continued)\r\n (8) (9) (10) \r\n Gross Revenue\r\n",
+             2: "SCHEDULE VI - GROSS PATIENT SERVICE REVENUE\r\n 38 \r\n Other\r\n",
+             3: "SCHEDULE VIIA - AMORTIZATION\r\nLine Year\r\n 2 2\r\n",
+             4: "Hospital Name: Anna Jaques Hospital\r\n"}
+    monkeypatch.setattr(page_locator.word_sources, "top_band_text", lambda page, top_band: texts[page.page_number])
+    headings = [page_locator.page_heading(Page(k, None)) for k in texts]
+    assert headings == [("II", 8), ("VI", 38), ("VIIA", None), (None, None)]
+
+def test_pages_without_an_index_are_the_defaults():
+    layout = {"A": (["III"], None)}
+    assert page_locator.pages(layout, {"A": [15, 16]}) == {"A": [15, 16]}
+
+def test_pages_from_the_index():
+    page_locator.use_index({"IV": [20, 21, 22], "VIIA": [40]})
+    layout = {"all": (["IV"], None), "second": (["IV"], [1]), "past_end": (["IV"], [1, 5]),
+              "fallback": (["VIIB", "VIIA"], None), "missing": (["IX"], None)}
+    assert page_locator.pages(layout, {}) == {"all": [20, 21, 22], "second": [21], "past_end": [21],
+                                              "fallback": [40], "missing": []}
+    assert page_locator.schedule_of(Page(22, None)) == "IV"
+    assert page_locator.schedule_of(Page(1, "II")) is None
+
+def test_group_keys_do_not_name_a_page_schedule():
+    page_locator.use_index({"VI": [35, 36, 37, 38], "VI:2": [35, 36], "VI:8": [37, 38]})
+    assert page_locator.pages({"part2": (["VI:8"], None)}, {}) == {"part2": [37, 38]}
+    assert page_locator.schedule_of(Page(38, None)) == "VI"
+
+def test_saved_index_of_an_older_version_is_rebuilt(tmp_path):
+    page_locator.save_index({"II": [3]}, str(tmp_path), "report.pdf", "abc")
+    assert page_locator.load_index(str(tmp_path), "abc") == {"II": [3]}
+    path = tmp_path / page_locator.index_name
+    path.write_text(path.read_text().replace(f'"version": {page_locator.index_version}', '"version": 1'))
+    assert page_locator.load_index(str(tmp_path), "abc") is None
@@ -0,0 +1,21 @@
+import hashlib
+
+import pdf_input
+import word_sources
+
+# 🗺 Open handles on one report share a mapping, and the last one to close unmaps it
+def test_mapping_is_shared_and_released(report_pdf):
+    first, second = pdf_input.open_pdf(report_pdf), pdf_input.open_pdf(report_pdf)
+    source = first.stream.source
+    assert second.stream.source is source and source.users == 2
+
+    word_sources.pdfium_document(first)
+    assert source.users == 3
+    first.close()
+    assert source.users == 1 and not source.data.closed
+
+    with open(report_pdf, "rb") as f:
+        assert hashlib.file_digest(second.stream, "sha256").hexdigest() == hashlib.file_digest(f, "sha256").hexdigest()
+    second.close()
+    assert source.data.closed
+    assert pdf_input._mappings == {}
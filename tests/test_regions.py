@@ -0,0 +1,53 @@
+import pytest
+
+import pdf_input
+import regions
+
+@pytest.fixture(autouse=True)
+def fresh_regions():
+    regions.configure()
+    yield
+    regions.configure()
+
+def word(text, x0, top, width=10):
+    return {"text": text, "x0": x0, "x1": x0 + width, "top": top}
+
+# 🗃 Heading labels saved under a cache folder are there for the next run
+def test_heading_labels_persist_in_the_cache(tmp_path):
+    regions.configure(str(tmp_path)).put("III@612x792", ["Admissions"])
+    regions.configure()
+    assert regions.headings.get("III@612x792") is None
+    assert regions.configure(str(tmp_path)).get("III@612x792") == ["Admissions"]
+
+# 📊 The lowest all-marker line of the header is the column number line
+def test_column_markers_are_the_lowest_marker_line():
+    header = [word("(1)", 100, 10), word("(2)", 200, 10), word("Expense", 100, 40), word("Revenue", 200, 40),
+              word("(1)", 300, 60), word("(2)", 400, 60), word("(3)", 500, 60)]
+    assert [w["x0"] for w in regions.column_markers(header)] == [300, 400, 500]
+    assert regions.column_markers(header[2:4]) == []
+
+def test_band_edges_halve_marker_spacing():
+    markers = [word("(1)", 95, 0), word("(2)", 195, 0), word("(3)", 295, 0)]
+    # The last band stops one marker width past its marker
+    assert regions.band_edges(markers) == [50, 150, 250, 315]
+    # A marker over the descriptions is not a value column
+    assert regions.band_edges(markers, description_x=60) == [150, 250, 315]
+
+def test_description_start_skips_number_only_rows():
+    words = [word("1", 10, 100), word("Salaries", 40, 100), word("500", 300, 100),
+             word("2", 10, 110), word("Wages", 42, 110),
+             word("3", 10, 120), word("3", 300, 120)]
+    assert regions.description_start(words) == 41
+
+# 📄 Schedule III prints its column numbers, and its bands are learned once per template
+def test_fixture_page_bands(report_pdf):
+    with pdf_input.open_pdf(report_pdf) as pdf:
+        page = pdf.pages[15]
+        header, words = regions.page_regions(page)
+        markers = regions.column_markers(header)
+        edges = regions.column_bands(page, header, words)
+    assert [w["text"] for w in markers] == ["(2)", "(3)", "(4)", "(5)", "(6)", "(7)"]
+    # One band per marker, each around its column number
+    assert len(edges) == len(markers) + 1
+    assert all(a < w["x0"] < w["x1"] < b for a, b, w in zip(edges, edges[1:], markers))
+    assert list(regions.bands.values()) == [edges]
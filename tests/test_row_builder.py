@@ -0,0 +1,120 @@
+import metrics
+import outputs
+import pdf_input
+import schedule5
+import schedule7
+import schedule_engine
+from row_builder import build_rows, continue_row, Continuation
+
+# Courier at 6.72pt on a 7.2pt line pitch, as in the cost reports: line numbers at
+# x 27, descriptions at x 56, amounts from x 300
+def word(text, x0, top):
+    return {"text": text, "x0": x0, "x1": x0 + 4 * len(text), "top": top, "bottom": top + 6.72}
+
+def line(top, *placed):
+    return [word(text, x0, top) for x0, text in placed]
+
+def test_numbered_lines_become_rows():
+    words = line(100, (27, "1"), (56, "Rent"), (300, "1,000")) + line(107.2, (27, "2"), (56, "Fees"), (300, "20"))
+    assert build_rows(words) == [["1", "Rent", "1,000"], ["2", "Fees", "20"]]
+
+# Words arrive in any order; a line's description runs up to its first amount
+def test_unsorted_words_split_at_the_first_amount():
+    words = line(100.04, (400, "7.5"), (56, "Interns"), (27, "98.01"), (300, "1,000"))
+    words += line(99.96, (85, "Residents"))
+    assert build_rows(words) == [["98.01", "Interns Residents", "1,000", "7.5"]]
+
+def test_wrapped_description_joins_its_row():
+    words = (line(100, (27, "1"), (56, "Rent"), (300, "1,000")) + line(107.2, (70, "and"), (90, "rates")) +
+             line(114.4, (27, "2"), (56, "Fees"), (300, "20")))
+    assert build_rows(words) == [["1", "Rent and rates", "1,000"], ["2", "Fees", "20"]]
+
+def test_heading_after_a_blank_line_stays_out():
+    words = (line(100, (27, "1"), (56, "Rent"), (300, "1,000")) + line(114.4, (56, "Deductions")) +
+             line(121.6, (27, "2"), (56, "Fees"), (300, "20")))
+    rows = build_rows(words)
+    assert rows == [["1", "Rent", "1,000"], ["2", "Fees", "20"]]
+    assert not any(isinstance(row, Continuation) for row in rows)
+
+def test_page_opening_lines_continue_the_previous_page():
+    words = line(64.8, (70, "of"), (85, "buildings")) + line(72, (27, "3"), (56, "Food"), (300, "5"))
+    rows = build_rows(words)
+    assert isinstance(rows[0], Continuation) and not rows[0].banded
+    assert rows == [["", "of buildings"], ["3", "Food", "5"]]
+
+def test_column_headings_are_not_continuations():
+    words = (line(57.6, (27, "Line"), (56, "Cost"), (80, "Center")) + line(64.8, (200, "(Excl"), (300, "Cap)")) +
+             line(72, (27, "3"), (56, "Food"), (300, "5")))
+    assert build_rows(words) == [["3", "Food", "5"]]
+
+def test_banded_continuation_keeps_its_cells():
+    bands = [250, 350, 450]
+    words = line(64.8, (70, "cont."), (400, "9")) + line(72, (27, "3"), (56, "Food"), (300, "5"))
+    rows = build_rows(words, bands)
+    assert isinstance(rows[0], Continuation) and rows[0].banded
+    assert rows == [["", "cont.", None, "9"], ["3", "Food", "5", None]]
+
+def test_continue_row_banded_fills_cells_even_when_all_are_filled():
+    row = ["7", "Equity Share", "384", "251"]
+    assert continue_row(row, ["", "expense", "a", "b"], True) == ["7", "Equity Share expense", "384 a", "251 b"]
+    assert continue_row(row, ["", "expense", None, "b"], True) == ["7", "Equity Share expense", "384", "251 b"]
+
+def test_continue_row_token_order_appends_values():
+    row = ["7", "Equity Share", "384"]
+    assert continue_row(row, ["", "expense", "a", None], False) == ["7", "Equity Share expense", "384", "a"]
+
+def test_label_table_folds_continuations_into_the_previous_page():
+    metrics.reset()
+    outputs.configure("csv", report="r")
+    headers = ["Line No.", "Description", "A", "B"]
+    page_results = {"T": {
+        0: (headers, [Continuation(["", "orphan"], False), ["1", "Rent", "10", None]]),
+        1: ([], [Continuation(["", "cont.", None, "9"], True), ["2", "Fees", "1", "2"]]),
+    }}
+    assert schedule_engine.label_table(page_results, "T", [0, 1]) == (
+        headers, [["1", "Rent cont.", "10", "9"], ["2", "Fees", "1", "2"]])
+    assert {"event": "stitch", "report": "r", "label": "T", "pages": [1]} in metrics.events
+
+def test_a_word_centered_on_a_band_edge_goes_left():
+    # "6" is 4pt wide at x 248, so its center sits on the first edge
+    words = line(100, (27, "8"), (56, "from"), (80, "Line"), (248, "6"), (300, "28,223"))
+    assert build_rows(words, [250, 350, 450]) == [["8", "from Line 6", "28,223", None]]
+
+# A description running into the first band stays in the description, and a signed
+# amount is a value
+def test_description_words_in_an_amount_band_stay_in_the_description():
+    words = (line(100, (27, "13"), (56, "Adjustment"), (190, "line"), (211, "12)"), (280, "12,818,539")) +
+             line(107.2, (27, "10"), (56, "Receipts"), (280, "-1,009,905"), (345, "-439,612")))
+    assert build_rows(words, [196, 331, 388]) == [["13", "Adjustment line 12)", "12,818,539", None],
+                                                 ["10", "Receipts", "-1,009,905", "-439,612"]]
+
+# Words after a row's amounts make the last band a text column, and text past it stays there
+def test_text_past_the_last_band_joins_the_text_column():
+    words = (line(100, (27, "5"), (43, "Classes"), (243, "2,590"), (394, "Non-Patient"), (443, "Education")) +
+             line(107.2, (27, "7"), (43, "Venture"), (235, "384,026"), (394, "Equity"), (423, "Share"),
+                  (447, "of"), (459, "Joint")) +
+             line(114.4, (27, "8"), (43, "Trust"), (239, "79,295"), (394, "Restricted"), (545, "8")))
+    assert build_rows(words, [217, 274, 390, 439]) == [["5", "Classes", "2,590", None, "Non-Patient Education"],
+                                                       ["7", "Venture", "384,026", None, "Equity Share of Joint"],
+                                                       ["8", "Trust", "79,295", None, "Restricted", "8"]]
+
+def table_rows(report_pdf, module, label):
+    pages = module.pages_by_label()[label]
+    with pdf_input.open_pdf(report_pdf) as pdf:
+        page_results = {label: {i: module.extract_page(pdf.pages[i], label) for i in pages}}
+    return schedule_engine.label_table(page_results, label, pages)
+
+# 📄 Regressions on the fixture report's Schedule V-B and VII-B
+def test_schedule_vb_keeps_descriptions_and_signed_amounts(report_pdf):
+    _, rows = table_rows(report_pdf, schedule5, "schedule_vb")
+    by_line = {row[0]: row for row in rows[:13]}
+    assert by_line["10"][1:3] == ["Other (Specify) HSN Receipts", "-1,009,905"]
+    assert by_line["13"][1:7] == ["Contractual Adjustment (line 1 - line 12)", "12,818,539", "2,055,589", "4,699,226",
+                                  "721,002", "5,267,408"]
+
+def test_schedule_viib_explanation_is_one_column(report_pdf):
+    headers, rows = table_rows(report_pdf, schedule7, "schedule_viib")
+    assert headers[-1] == "Explanation" and max(map(len, rows)) == len(headers)
+    by_line = {row[0]: row for row in rows}
+    assert by_line["5"][2:] == ["2,590", None, None, "Non-Patient Education Class Revenue"]
+    assert by_line["7"][5] == "Equity Share of Joint Venture, offset of expense"
@@ -0,0 +1,71 @@
+import metrics
+import outputs
+import regions
+import schedule_engine
+
+def word(text, x0, top):
+    return {"text": text, "x0": x0, "x1": x0 + 4 * len(text), "top": top, "bottom": top + 6.72}
+
+def line(top, *placed):
+    return [word(text, x0, top) for x0, text in placed]
+
+# Schedule III's second page: the key columns' heading shares lines with the value
+# columns' and runs two words longer than the key columns
+heading = (line(20, (27, "SCHEDULE"), (80, "III"), (100, "-"), (110, "STATISTICS")) +
+           line(30, (215, "(8)"), (272, "(9)"), (325, "(10)")) +
+           line(40, (207, "Average"), (370, "Transfers")) +
+           line(47.2, (27, "Line"), (194, "Daily"), (219, "Census"), (260, "Admissions"), (313, "Transfers")) +
+           line(54.4, (31, "No."), (64, "Cost"), (84, "Center"), (113, "Description"), (198, "(C6"),
+                (215, "/"), (223, "365)"), (329, "In")) +
+           line(61.6, (27, "1"), (56, "Medical"), (215, "68"), (272, "68")))
+
+spec = {"key_columns": ["Line No.", "Cost Center Description"], "header": "longest_line", "tables": {}}
+
+def test_labels_stack_the_heading_words_over_each_column():
+    labels = schedule_engine.heading_labels(heading, None, 2)
+    assert labels == ["Average Daily Census (C6 / 365)", "Admissions", "Transfers In"]
+
+def test_table_headers_follow_the_key_columns():
+    headers = schedule_engine.table_headers(spec, "Schedule III", (heading, None))
+    assert headers == ["Line No.", "Cost Center Description", "Average Daily Census (C6 / 365)",
+                       "Admissions", "Transfers In"]
+
+def test_banded_labels_skip_a_marker_over_the_description():
+    words = (line(20, (27, "SCHEDULE"), (80, "V-B")) + line(30, (84, "(1)"), (296, "(2)"), (353, "(3)")) +
+             line(40, (80, "Source"), (292, "Total"), (341, "Medicaid")))
+    edges = regions.band_edges([w for w in words if w["top"] == 30], description_x=80)
+    assert schedule_engine.heading_labels(words, edges, 2) == ["Total", "Medicaid"]
+
+def test_labels_are_cached_by_heading_fingerprint():
+    schedule_engine.heading_labels(heading, None, 2)
+    title_top, block = schedule_engine.heading_block(heading)
+    key = f"{schedule_engine.heading_fingerprint(title_top, block)}:2:None"
+    regions.headings.put(key, ["cached"])
+    try:
+        assert schedule_engine.heading_labels(heading, None, 2) == ["cached"]
+    finally:
+        regions.headings.labels.pop(key)
+
+# 🧭 One plan entry per page, listing every (module, label) that reads it
+def test_compile_plan_shares_pages_between_modules():
+    class Module:
+        def __init__(self, pages):
+            self.pages = pages
+
+        def pages_by_label(self):
+            return self.pages
+
+    a, b = Module({"A": [3, 4]}), Module({"B1": [4], "B2": [1]})
+    assert schedule_engine.compile_plan([a, b]) == {1: [(b, "B2")], 3: [(a, "A")], 4: [(a, "A"), (b, "B1")]}
+
+# 🧱 A concatenated output carries headers over headerless pages and pads extra cells
+def test_output_frame_concatenates_pages_under_carried_headers():
+    metrics.reset()
+    outputs.configure("csv", report="r")
+    output = {"labels": ["T"], "join": None, "pad": "{label}_col{n}"}
+    page_results = {"T": {0: (["Line No.", "Description", "A"], [["1", "Rent", "10"]]),
+                          1: ([], [["2", "Fees", "1", "2"]])}}
+    df = schedule_engine.output_frame(spec, output, page_results, {"T": [0, 1]})
+    assert list(df.columns) == ["Line No.", "Description", "A", "T_col4"]
+    assert df.fillna("").values.tolist() == [["1", "Rent", "10", ""], ["2", "Fees", "1", "2"]]
+    assert {"event": "header", "report": "r", "label": "T", "carried": [1], "changed": []} in metrics.events
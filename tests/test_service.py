@@ -0,0 +1,93 @@
+import os
+import json
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import service
+
+# 📨 One request on its own connection; the service closes it after the response,
+# so reading to EOF only returns once the connection really ends
+async def request(port, method, path, body=b""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), timeout=30)
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+# 🛰 POST a report, then poll its job until the schedule's tables are in
+def test_post_a_report_and_poll_the_job(report_pdf, tmp_path):
+    async def scenario():
+        extraction = service.ExtractionService(spool_dir=str(tmp_path / "spool"), workers=1, runners=1)
+        await extraction.start()
+        server = await asyncio.start_server(extraction.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            with open(report_pdf, "rb") as f:
+                status, job = await request(port, "POST", "/jobs?schedules=schedule3", f.read())
+            assert status == 202 and job["status"] in ("queued", "running")
+
+            for _ in range(600):
+                status, job = await request(port, "GET", f"/jobs/{job['job']}")
+                assert status == 200
+                if job["status"] in ("done", "failed"):
+                    break
+                await asyncio.sleep(0.1)
+            return job
+        finally:
+            server.close()
+            await server.wait_closed()
+            await extraction.close()
+
+    job = asyncio.run(scenario())
+    assert job["status"] == "done", job
+    assert [table["table"] for table in job["tables"]] == ["Schedule III", "Schedule IIIA", "Schedule IIIB"]
+    assert all(table["rows"] and not table["error"] and not table["lost_pages"] for table in job["tables"])
+
+def test_unknown_routes_and_bodies_are_rejected(tmp_path):
+    async def scenario():
+        extraction = service.ExtractionService(spool_dir=str(tmp_path / "spool"), workers=1, runners=1)
+        await extraction.start()
+        server = await asyncio.start_server(extraction.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return [await request(port, "POST", "/jobs", b"not a pdf"),
+                    await request(port, "GET", "/jobs/404"),
+                    await request(port, "GET", "/health")]
+        finally:
+            server.close()
+            await server.wait_closed()
+            await extraction.close()
+
+    (upload, _), (missing, _), (health, body) = asyncio.run(scenario())
+    assert (upload, missing, health) == (415, 404, 200)
+    assert body["status"] == "ok"
+
+# 💥 A worker that dies breaks the pool; it is replaced and later calls still run
+def test_a_dead_worker_is_replaced(tmp_path):
+    async def scenario():
+        extraction = service.ExtractionService(spool_dir=str(tmp_path / "spool"), workers=1, runners=1)
+        await extraction.start()
+        try:
+            with pytest.raises(BrokenProcessPool):
+                await extraction.in_pool(os._exit, 1)
+            return await extraction.in_pool(pow, 2, 10), extraction.pool_restarts
+        finally:
+            await extraction.close()
+
+    assert asyncio.run(scenario()) == (1024, 2)
+
+def test_repeated_schedules_run_once(report_pdf, tmp_path):
+    async def scenario():
+        extraction = service.ExtractionService(spool_dir=str(tmp_path / "spool"), workers=1, runners=1)
+        await extraction.start()
+        try:
+            with open(report_pdf, "rb") as f:
+                return (await extraction.submit(f.read(), ["schedule3", "schedule3"])).schedules
+        finally:
+            await extraction.close()
+
+    assert asyncio.run(scenario()) == ["schedule3"]
@@ -0,0 +1,42 @@
+import sqlite3
+
+import pandas as pd
+
+import store
+
+def frame():
+    return pd.DataFrame([["1", "Salaries", "18,63,062", "-"],
+                         ["1", "Wages", "2,345.50", ""],
+                         ["98.01", "Total", "see note", "12"]],
+                        columns=["Line No.", "Cost Center Description", "Direct Expense", "Reclass"])
+
+def test_table_names_are_sql_safe():
+    assert store.table_name("schedule_iv_iv-a.csv") == "schedule_iv_iv_a"
+
+# 🧾 One cell per non-blank value, keyed by position; only amounts get a value
+def test_cells_carry_line_description_and_amount():
+    assert list(store.cells(frame())) == [
+        (0, "1", "Salaries", 2, "Direct Expense", "18,63,062", 1863062),
+        (1, "1", "Wages", 2, "Direct Expense", "2,345.50", 2345.5),
+        (2, "98.01", "Total", 2, "Direct Expense", "see note", None),
+        (0, "1", "Salaries", 3, "Reclass", "-", None),
+        (2, "98.01", "Total", 3, "Reclass", "12", 12),
+    ]
+
+# 🔁 Saving a report again replaces its rows and leaves other reports alone; chunked
+# tables number their rows on across chunks
+def test_save_replaces_one_reports_rows(tmp_path):
+    path = str(tmp_path / "store.sqlite")
+    df = frame()
+    store.save_table(df, "schedule_ii_merged.csv", "a", path)
+    store.save_table(df, "schedule_ii_merged.csv", "b", path)
+    assert store.lookup("schedule_ii_merged", 1, "Direct Expense", path) == [
+        ("a", "Salaries", "18,63,062", 1863062), ("a", "Wages", "2,345.50", 2345.5),
+        ("b", "Salaries", "18,63,062", 1863062), ("b", "Wages", "2,345.50", 2345.5)]
+
+    store.save_table([df.iloc[:2], df.iloc[2:].assign(Reclass="13")], "schedule_ii_merged.csv", "a", path)
+    assert store.lookup("schedule_ii_merged", 98.01, "Reclass", path) == [("a", "Total", "13", 13),
+                                                                         ("b", "Total", "12", 12)]
+    with sqlite3.connect(path) as connection:
+        rows = connection.execute("SELECT DISTINCT row_no FROM schedule_ii_merged WHERE report_id = 'a'").fetchall()
+    assert sorted(rows) == [(0,), (1,), (2,)]
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+import driver
+import metrics
+import outputs
+import streaming
+from row_builder import Continuation
+
+# 🌊 --stream writes the same tables as the in-memory writer, in every format
+@pytest.mark.parametrize("output_format", ["csv", "parquet"])
+def test_stream_matches_write_outputs(report_pdf, tmp_path, output_format):
+    pd = pytest.importorskip("pandas")
+    if output_format != "csv":
+        pytest.importorskip("pyarrow")
+    held, streamed = tmp_path / "held", tmp_path / "streamed"
+    driver.run(report_pdf, str(held), output_format=output_format)
+    ran = driver.run(report_pdf, str(streamed), output_format=output_format, stream=True)
+    assert any(streaming.streamable(module) for module in ran)
+
+    names = sorted(name for name in os.listdir(held) if name.endswith(f".{output_format}"))
+    assert names == sorted(name for name in os.listdir(streamed) if name.endswith(f".{output_format}"))
+    for name in names:
+        if output_format == "csv":
+            assert (held / name).read_bytes() == (streamed / name).read_bytes(), name
+        else:
+            expected, found = pd.read_parquet(held / name), pd.read_parquet(streamed / name)
+            assert list(expected.dtypes) == list(found.dtypes), name
+            pd.testing.assert_frame_equal(expected, found, obj=name)
+
+# ⚠️ Header changes and malformed amounts are reported as write_outputs reports them
+def test_writer_reports_header_changes_and_malformed_amounts(tmp_path, capsys):
+    metrics.reset()
+    outputs.configure("csv", report="r")
+    writer = streaming.StreamingTableWriter(str(tmp_path / "table.csv"), "Table", label="T")
+    writer.write_page(0, ["Line No.", "Description", "Amount"], [["1", "Rent", "1,000"], ["2", "Fees", "2,"]])
+    writer.write_page(1, [], [["3", "Food", "3,000"]])
+    writer.write_page(2, ["Line No.", "Description", "Total"], [["4", "Heat", "4,000"]])
+    assert writer.close() == str(tmp_path / "table.csv")
+
+    assert "T: header changes on page 3" in capsys.readouterr().out
+    assert [event for event in metrics.events if event["event"] == "header"] == [
+        {"event": "header", "report": "r", "label": "T", "carried": [1], "changed": [2]}]
+    assert writer.malformed_amounts() == [("Total", 1, "2,")]
+
+# ↪️ A page opening mid-row continues the previous page's last row, as in label_table
+def test_writer_folds_continuation_into_previous_row(tmp_path):
+    metrics.reset()
+    outputs.configure("csv", report="r")
+    writer = streaming.StreamingTableWriter(str(tmp_path / "table.csv"), "Table", label="T")
+    writer.write_page(0, ["Line No.", "Description", "Amount"], [["1", "Rent", "1,000"], ["2", "Fees for", None]])
+    writer.write_page(1, [], [Continuation(["", "services", "2,000"], True), ["3", "Food", "3,000"]])
+    writer.write_page(2, [], [])
+    writer.write_page(3, [], [Continuation(["", "and drink", None], True)])
+    assert writer.close() == str(tmp_path / "table.csv")
+
+    assert (tmp_path / "table.csv").read_text().splitlines() == [
+        "Line No.,Description,Amount", "1,Rent,\"1,000\"", "2,Fees for services,\"2,000\"",
+        "3,Food and drink,\"3,000\""]
+    assert writer.row_count == 3
+    assert [event for event in metrics.events if event["event"] == "stitch"] == [
+        {"event": "stitch", "report": "r", "label": "T", "pages": [1, 3]}]
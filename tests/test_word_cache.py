@@ -0,0 +1,25 @@
+import pdf_input
+import regions
+import schedule_engine
+import word_cache
+import word_sources
+
+# 📦 Header detection and row parsing share one extraction per page, and a rerun reuses it
+def test_one_extraction_per_page(report_pdf, monkeypatch):
+    calls = []
+    extract_words = word_sources.extract_words
+    def counted(page, *args, **options):
+        calls.append(page.page_number)
+        return extract_words(page, *args, **options)
+    monkeypatch.setattr(word_sources, "extract_words", counted)
+    word_cache.configure()
+    regions.configure()
+
+    with pdf_input.open_pdf(report_pdf) as pdf:
+        for i in (15, 16, 17):
+            schedule_engine.parse_page(pdf.pages[i], ["Schedule III"])
+            schedule_engine.detect_column_headers(pdf.pages[i])
+        assert calls == [16, 17, 18]
+        schedule_engine.extract_rows(pdf.pages[15])
+    assert calls == [16, 17, 18]
+    assert word_cache.cache.hits == 4
@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+
+import pytest
+
+import pdf_input
+import word_sources
+
+@pytest.fixture(autouse=True)
+def clear_backends():
+    yield
+    word_sources.page_backends.clear()
+
+# ⚡ PDFium words match the reference backend word for word, to well under a point
+@pytest.mark.parametrize("i", [0, 15, 20])
+def test_pdfium_words_match_pdfplumber(report_pdf, i):
+    with pdf_input.open_pdf(report_pdf) as pdf:
+        reference = word_sources.extract_words(pdf.pages[i], "pdfplumber")
+        fast = word_sources.extract_words(pdf.pages[i], "pdfium")
+    assert [word["text"] for word in fast] == [word["text"] for word in reference]
+    for a, b in zip(fast, reference):
+        assert all(abs(a[key] - b[key]) < 0.5 for key in ("x0", "x1", "top", "bottom"))
+        assert a["x0"] == round(a["x0"], word_sources.x_digits)
+
+def test_top_band_text_reads_the_title(report_pdf):
+    with pdf_input.open_pdf(report_pdf) as pdf:
+        assert "SCHEDULE III" in word_sources.top_band_text(pdf.pages[15], 80)
+
+def test_schedules_pick_a_backend_per_label():
+    per_label = SimpleNamespace(word_backend={"a": "pdfium"})
+    assert word_sources.module_backend(per_label, "a") == "pdfium"
+    assert word_sources.module_backend(per_label, "b") == word_sources.default_backend
+    assert word_sources.module_backend(SimpleNamespace(), "a") == word_sources.default_backend
+
+# 🗂 A page read by schedules that disagree gets the reference backend; an override wins
+def test_disagreeing_schedules_share_the_reference_backend():
+    fast, reference = SimpleNamespace(word_backend="pdfium"), SimpleNamespace(word_backend="pdfplumber")
+    targets = [(0, [(fast, "a")]), (1, [(fast, "a"), (reference, "b")])]
+    assert word_sources.assign_backends(targets) == {0: "pdfium", 1: "pdfplumber"}
+    assert word_sources.backend_for(SimpleNamespace(page_number=1)) == "pdfium"
+    assert word_sources.backend_for(SimpleNamespace(page_number=3)) == word_sources.default_backend
+    assert word_sources.assign_backends(targets, override="pdfium") == {0: "pdfium", 1: "pdfium"}